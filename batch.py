@@ -0,0 +1,180 @@
+"""
+batch.py
+
+Batch mode for the Multi-Agent Debate Decision Advisor.
+
+Reads claims from a JSONL or CSV file, runs many debates concurrently on a
+single compiled graph, and appends each verdict to a JSONL file as soon as
+it finishes. Re-running with the same output file skips claims that
+already have a result, so an interrupted run can simply be restarted.
+
+Each claim's id is its debate id, so a failed debate is retried from its
+checkpoints (see checkpoints.py): within the run (--retries) and on the
+next run, only the nodes that had not finished are executed again.
+
+Input formats:
+    JSONL: one object per line, {"claim": "...", "context": "...", "id": "..."}
+    CSV:   header row with a "claim" column and optional "context" / "id" columns
+"""
+
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Set
+
+from graph import get_graph, run_debate
+
+
+def claim_id(claim: str, context: Optional[str] = None) -> str:
+    """Stable id for a claim/context pair, used when the input has no id."""
+    raw = json.dumps([claim, context or ""], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _make_record(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    claim = (row.get("claim") or "").strip()
+    if not claim:
+        return None
+
+    context = row.get("context") or None
+    return {
+        "id": str(row.get("id") or claim_id(claim, context)),
+        "claim": claim,
+        "context": context,
+    }
+
+
+def load_claims(path: str) -> List[Dict[str, Any]]:
+    """
+    Load claims from a .jsonl or .csv file.
+
+    Returns:
+        list of dicts with keys: id, claim, context
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Claims file not found: {path}")
+
+    rows = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    print(f"[BATCH WARNING] skipping line {line_no}: {e}")
+
+    records = []
+    seen = set()
+    for row in rows:
+        record = _make_record(row)
+        if record is None or record["id"] in seen:
+            continue
+        seen.add(record["id"])
+        records.append(record)
+
+    return records
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """Ids that already have a successful verdict in the output file."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by an interrupted run
+            if "error" not in result and "id" in result:
+                done.add(result["id"])
+    return done
+
+
+def run_batch(claims_path: str, output_path: str, concurrency: int = 4, retries: int = 1) -> Dict[str, Any]:
+    """
+    Run a debate for every claim that has no result yet.
+
+    Args:
+        claims_path: input JSONL or CSV file
+        output_path: JSONL file that verdicts are appended to
+        concurrency: number of debates running at the same time
+        retries: extra attempts for a failed debate; each resumes from its checkpoints
+
+    Returns:
+        dict: summary with counts, elapsed seconds and throughput
+    """
+    claims = load_claims(claims_path)
+    completed = load_completed_ids(output_path)
+    pending = [c for c in claims if c["id"] not in completed]
+
+    print(f"Loaded {len(claims)} claims, {len(claims) - len(pending)} already done, {len(pending)} to run")
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    graph = get_graph()
+    write_lock = threading.Lock()
+    succeeded = failed = 0
+    start = time.perf_counter()
+
+    def debate(record):
+        t0 = time.perf_counter()
+        for attempt in range(max(0, retries) + 1):
+            try:
+                verdict = run_debate(record["claim"], record["context"], graph=graph, debate_id=record["id"])
+                return {**record, "verdict": verdict, "seconds": round(time.perf_counter() - t0, 3)}
+            except Exception as e:
+                error = str(e)
+                if attempt < retries:
+                    print(f"[BATCH RETRY] {record['id']}: {error}")
+        return {**record, "error": error, "seconds": round(time.perf_counter() - t0, 3)}
+
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+
+        futures = [pool.submit(debate, record) for record in pending]
+
+        for n, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+
+            with write_lock:
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+
+            if "error" in result:
+                failed += 1
+                print(f"[BATCH ERROR] {result['id']}: {result['error']}")
+            else:
+                succeeded += 1
+
+            elapsed = time.perf_counter() - start
+            print(
+                f"[{n}/{len(pending)}] {result['id']} in {result['seconds']:.1f}s "
+                f"| {n / elapsed:.2f} claims/s"
+            )
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "total": len(claims),
+        "skipped": len(claims) - len(pending),
+        "succeeded": succeeded,
+        "failed": failed,
+        "elapsed_seconds": round(elapsed, 2),
+        "claims_per_second": round(len(pending) / elapsed, 3) if pending and elapsed else 0.0,
+    }
+
+    print("\nBATCH SUMMARY")
+    print(json.dumps(summary, indent=2))
+    return summary
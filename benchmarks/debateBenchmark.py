@@ -0,0 +1,368 @@
+"""
+Offline end-to-end benchmark.
+
+Runs the real graph, batch runner, vector store and ingestion pipeline
+against local stand-ins for OpenAI, Tavily and Wikipedia
+(benchmarks/fakeServices.py), so it needs no API keys and no network.
+Latency, error rate and token counts of the fakes are configurable.
+
+Suites:
+    debate     sequential run_debate calls: latency and per-stage breakdown
+    batch      run_batch throughput and per-claim latency at each --concurrency
+    retrieval  DebateVectorStore.query latency, cold and warm, per retrieval mode
+    ingest     PDF -> chunks -> embeddings -> store, cold and unchanged re-run
+
+Every latency is reported as p50/p95/p99. Everything runs in a temporary
+workspace (the project's data/ directory is not touched), and --output
+writes the results as JSON. With --baseline, p95 latencies and throughputs
+are compared with an earlier results file and the run exits non-zero on a
+regression larger than --max-regression.
+
+Usage:
+    python -m benchmarks.debateBenchmark
+    python -m benchmarks.debateBenchmark --suites debate batch --llm-latency-ms 800 --llm-error-rate 0.05
+    python -m benchmarks.debateBenchmark --output data/results/bench.json --baseline data/results/bench_base.json
+    python -m benchmarks.debateBenchmark --fake-embeddings   # without sentence-transformers installed
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.fakeServices import FakeServices, ServiceProfile, install_fake_embedder  # noqa: E402
+
+SUITES = ["debate", "batch", "retrieval", "ingest"]
+
+SOURCE_PDF = os.path.join(ROOT, "data", "raw", "debate_rules.pdf")
+
+CLAIMS = [
+    "Remote work increases productivity for software teams",
+    "Nuclear power is necessary to reach net-zero emissions",
+    "Homework should be banned in primary schools",
+    "A four-day work week improves employee wellbeing",
+    "Social media does more harm than good to teenagers",
+    "Universal basic income reduces poverty",
+    "Electric cars are better for the environment than petrol cars",
+    "Standardized tests measure student ability fairly",
+]
+
+KEYWORD_QUERIES = ["ad hominem", "strawman", "burden of proof", "slippery slope", "false dilemma",
+                   "appeal to authority", "red herring", "circular reasoning"]
+
+
+def claim_at(i: int) -> str:
+    """Distinct claims, so identical requests are never merged by single-flight or caches."""
+    return f"{CLAIMS[i % len(CLAIMS)]} (case {i})"
+
+
+def summarize(seconds: List[float]) -> Dict[str, float]:
+    """Count, mean and p50/p95/p99/max of latencies, in milliseconds."""
+    if not seconds:
+        return {"count": 0}
+    ms = np.asarray(seconds, dtype=np.float64) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "count": int(len(ms)),
+        "mean_ms": round(float(ms.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(ms.max()), 2),
+    }
+
+
+def stage_breakdown(spans: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Latency summary per traced stage (kind:name)."""
+    stages: Dict[str, List[float]] = {}
+    for s in spans:
+        stages.setdefault(f"{s['kind']}:{s['name']}", []).append(s["duration_ms"] / 1000)
+    return {stage: summarize(values) for stage, values in sorted(stages.items())}
+
+
+def line(label: str, stats: Dict[str, float], extra: str = "") -> str:
+    if not stats.get("count"):
+        return f"  {label:<28} (no samples)"
+    return (f"  {label:<28} n={stats['count']:<5} p50 {stats['p50_ms']:9.1f}  p95 {stats['p95_ms']:9.1f}  "
+            f"p99 {stats['p99_ms']:9.1f} ms{extra}")
+
+
+# ----------------------------------------------------------------------
+# Suites
+
+def bench_debate(args) -> Dict[str, Any]:
+    import tracing
+    from graph import get_graph, run_debate
+
+    graph = get_graph()
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_debate(claim_at(-1), graph=graph)  # warm-up: store sync, prompts, client
+
+    latencies = []
+    with tracing.collect() as spans, contextlib.redirect_stdout(io.StringIO()):
+        for i in range(args.debates):
+            start = time.perf_counter()
+            run_debate(claim_at(i), graph=graph)
+            latencies.append(time.perf_counter() - start)
+
+    llm = [s for s in spans if s["kind"] == "llm"]
+    tools = [s for s in spans if s["kind"] == "tool"]
+    result = {
+        "latency": summarize(latencies),
+        "stages": stage_breakdown(spans),
+        "llm_calls_per_debate": round(len(llm) / max(args.debates, 1), 2),
+        "tool_calls_per_debate": round(len(tools) / max(args.debates, 1), 2),
+        "tokens_per_debate": round(sum((s.get("prompt_tokens") or 0) + (s.get("completion_tokens") or 0)
+                                       for s in llm) / max(args.debates, 1), 1),
+    }
+
+    print("debate")
+    print(line("run_debate", result["latency"],
+               f"  {result['llm_calls_per_debate']} LLM / {result['tool_calls_per_debate']} tool calls"))
+    for stage, stats in result["stages"].items():
+        if stage.startswith(("node:", "llm:")):
+            print(line(stage, stats))
+    return result
+
+
+def bench_batch(args) -> Dict[str, Any]:
+    from batch import run_batch
+
+    result = {}
+    print("batch")
+    for concurrency in args.concurrency:
+        claims_path = os.path.join("bench", f"claims_c{concurrency}.jsonl")
+        output_path = os.path.join("bench", f"verdicts_c{concurrency}.jsonl")
+        os.makedirs("bench", exist_ok=True)
+        with open(claims_path, "w", encoding="utf-8") as f:
+            for i in range(args.batch_claims):
+                f.write(json.dumps({"id": f"c{concurrency}-{i}", "claim": claim_at(1000 * concurrency + i)}) + "\n")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = run_batch(claims_path, output_path, concurrency=concurrency)
+
+        with open(output_path, "r", encoding="utf-8") as f:
+            seconds = [json.loads(row)["seconds"] for row in f if row.strip()]
+
+        result[f"concurrency_{concurrency}"] = {
+            "claims_per_second": summary["claims_per_second"],
+            "failed": summary["failed"],
+            "latency": summarize(seconds),
+        }
+        print(line(f"concurrency {concurrency}", summarize(seconds),
+                   f"  {summary['claims_per_second']:.2f} claims/s"))
+    return result
+
+
+def bench_retrieval(args) -> Dict[str, Any]:
+    from rag.chunker import default_chunks_path, iter_chunks_from_file
+    from rag.retrieval import ingest_chunks_if_needed, init_or_get_store
+
+    store = init_or_get_store()
+    ingest_chunks_if_needed(store)
+
+    texts = [c["text"] for c in iter_chunks_from_file(default_chunks_path())]
+    sentences = [" ".join(t.split()[:12]) for t in texts] or CLAIMS
+    queries = [KEYWORD_QUERIES[i % len(KEYWORD_QUERIES)] if i % 3 == 0 else sentences[i % len(sentences)]
+               for i in range(args.queries)]
+    # repeated texts get a suffix, so the cold pass never hits the result cache
+    queries = [f"{q} {i}" if i >= len(KEYWORD_QUERIES) * 3 else q for i, q in enumerate(queries)]
+
+    result = {}
+    print("retrieval")
+    for mode in args.retrieval_modes:
+        store.result_cache.clear()
+        store.embedding_cache.clear()
+        passes = {}
+        for name in ("cold", "warm"):
+            seconds = []
+            for query in queries:
+                start = time.perf_counter()
+                store.query(query, n_results=5, mode=mode)
+                seconds.append(time.perf_counter() - start)
+            passes[name] = summarize(seconds)
+            print(line(f"{mode} ({name})", passes[name]))
+        result[mode] = passes
+    return result
+
+
+def bench_ingest(args) -> Dict[str, Any]:
+    from rag.ingestPipeline import run_pipeline
+    from rag.vectorStore import DebateVectorStore
+
+    cold, rates = [], []
+    rerun = []
+    print("ingest")
+    for run in range(args.ingest_runs):
+        directory = os.path.join("bench", f"ingest_{run}")
+        store = DebateVectorStore(persist_directory=directory, collection_name="bench_chunks")
+        paths = {"pages_path": os.path.join(directory, "pages.jsonl"),
+                 "chunks_path": os.path.join(directory, "chunks.jsonl")}
+
+        start = time.perf_counter()
+        stats = run_pipeline(pdf_path=SOURCE_PDF, store=store, force=True, **paths)
+        cold.append(time.perf_counter() - start)
+        rates.append(stats)
+
+        start = time.perf_counter()
+        run_pipeline(pdf_path=SOURCE_PDF, store=store, **paths)
+        rerun.append(time.perf_counter() - start)
+
+    result = {
+        "cold": summarize(cold),
+        "unchanged_rerun": summarize(rerun),
+        "pages": rates[-1]["pages"] if rates else 0,
+        "chunks": rates[-1]["chunks"] if rates else 0,
+        "pages_per_second": round(float(np.median([r["pages_per_second"] for r in rates])), 1) if rates else 0.0,
+        "chunks_per_second": round(float(np.median([r["chunks_per_second"] for r in rates])), 1) if rates else 0.0,
+    }
+    print(line("cold", result["cold"], f"  {result['chunks_per_second']} chunks/s"))
+    print(line("unchanged re-run", result["unchanged_rerun"]))
+    return result
+
+
+BENCHES = {"debate": bench_debate, "batch": bench_batch, "retrieval": bench_retrieval, "ingest": bench_ingest}
+
+
+# ----------------------------------------------------------------------
+def prepare_workspace(workspace: str) -> None:
+    """Copy the rules PDF in and ingest it, so every suite starts from a built store."""
+    from rag.documentLoader import DEFAULT_PAGES_PATH
+    from rag.chunker import DEFAULT_CHUNKS_PATH
+    from rag.ingestPipeline import run_pipeline
+    from rag.manifest import DEFAULT_SOURCE_PDF
+    from rag.retrieval import init_or_get_store
+
+    pdf = os.path.join(workspace, DEFAULT_SOURCE_PDF)
+    os.makedirs(os.path.dirname(pdf), exist_ok=True)
+    shutil.copyfile(SOURCE_PDF, pdf)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_pipeline(DEFAULT_SOURCE_PDF, DEFAULT_PAGES_PATH, DEFAULT_CHUNKS_PATH, store=init_or_get_store())
+
+
+def compare(current: Any, baseline: Any, tolerance: float, path: str = "") -> List[str]:
+    """Regressions: p95 latencies up, or throughputs down, by more than `tolerance`."""
+    found = []
+    if isinstance(current, dict) and isinstance(baseline, dict):
+        for key, value in current.items():
+            if key not in baseline:
+                continue
+            where = f"{path}.{key}" if path else key
+            old = baseline[key]
+            if isinstance(value, (dict, list)):
+                found += compare(value, old, tolerance, where)
+            elif key == "p95_ms" and old and value > old * (1 + tolerance):
+                found.append(f"{where}: {old} -> {value} ms")
+            elif key.endswith("_per_second") and old and value < old * (1 - tolerance):
+                found.append(f"{where}: {old} -> {value}/s")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline debate benchmark with fake OpenAI / Tavily / Wikipedia")
+    parser.add_argument("--suites", nargs="+", default=SUITES, choices=SUITES)
+    parser.add_argument("--debates", type=int, default=20, help="Debate suite: sequential debates")
+    parser.add_argument("--batch-claims", type=int, default=32, help="Batch suite: claims per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8], help="Batch suite: concurrency levels")
+    parser.add_argument("--queries", type=int, default=200, help="Retrieval suite: queries per pass")
+    parser.add_argument("--retrieval-modes", nargs="+", default=["dense", "hybrid", "lexical", "auto"])
+    parser.add_argument("--ingest-runs", type=int, default=3, help="Ingest suite: cold ingestions")
+
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=100.0)
+    parser.add_argument("--llm-token-latency-ms", type=float, default=0.0, help="Extra delay per completion token")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-status", type=int, default=503)
+    parser.add_argument("--prompt-tokens", type=int, default=None, help="Reported prompt tokens (default: chars/4)")
+    parser.add_argument("--completion-tokens", type=int, default=300)
+    parser.add_argument("--tool-latency-ms", type=float, default=150.0, help="Tavily and Wikipedia latency")
+    parser.add_argument("--tool-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--tool-error-rate", type=float, default=0.0)
+
+    parser.add_argument("--backend", type=str, default="numpy", help="Vector backend (chroma or numpy)")
+    parser.add_argument("--fake-embeddings", action="store_true",
+                        help="Hashed bag-of-words embeddings instead of sentence-transformers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    parser.add_argument("--baseline", type=str, default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = os.path.abspath(args.baseline) if args.baseline else None
+
+    fakes = FakeServices(
+        openai=ServiceProfile(args.llm_latency_ms, args.llm_jitter_ms, args.llm_token_latency_ms,
+                              args.llm_error_rate, args.llm_error_status, args.prompt_tokens,
+                              args.completion_tokens),
+        tavily=ServiceProfile(args.tool_latency_ms, args.tool_jitter_ms, error_rate=args.tool_error_rate),
+        wikipedia=ServiceProfile(args.tool_latency_ms, args.tool_jitter_ms, error_rate=args.tool_error_rate),
+        seed=args.seed,
+    ).start()
+
+    workspace = tempfile.mkdtemp(prefix="debate_bench_")
+    cwd = os.getcwd()
+    os.environ.update(fakes.env())
+    os.environ.update({
+        "VECTOR_BACKEND": args.backend,
+        "LLM_CACHE_ENABLED": "0",   # every debate must reach the (fake) model
+        "VERDICT_CACHE_ENABLED": "0",
+        "TRACE_ENABLED": "1",
+        "LLM_RPM": "100000",
+        "LLM_TPM": "100000000",
+    })
+
+    results: Dict[str, Any] = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "suites": {},
+    }
+
+    try:
+        os.chdir(workspace)
+        from settings import reload_settings
+        reload_settings()
+        if args.fake_embeddings:
+            install_fake_embedder()
+
+        prepare_workspace(workspace)
+        for suite in args.suites:
+            results["suites"][suite] = BENCHES[suite](args)
+        results["fake_services"] = fakes.stats()
+    finally:
+        os.chdir(cwd)
+        fakes.stop()
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    if output:
+        directory = os.path.dirname(output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    if baseline:
+        with open(baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results["suites"], json.load(f).get("suites", {}), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        failed = bool(regressions)
+        if not failed:
+            print(f"OK   no regression beyond {args.max_regression:.0%} of {args.baseline}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+CPU embedding runtime benchmark.
+
+For each runtime (torch, torch-int8, onnx) reports the load time, the
+agreement with the torch reference (cosine similarity on probe sentences),
+batch throughput in texts per second and single-query latency. Exits
+non-zero when a runtime falls below the tolerance.
+
+Usage:
+    python -m benchmarks.embeddingBenchmark
+    python -m benchmarks.embeddingBenchmark --runtimes torch onnx --threads 4 --batch-size 128
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def sample_texts(count: int) -> list:
+    """Chunk-sized texts built from the rules PDF if it was chunked, else synthetic ones."""
+    from rag.chunker import default_chunks_path, iter_chunks_from_file
+
+    path = default_chunks_path()
+    texts = [c["text"] for c in iter_chunks_from_file(path)] if os.path.exists(path) else []
+    if not texts:
+        texts = [f"Argument {i}: the claim relies on an appeal to authority rather than evidence." * 8
+                 for i in range(64)]
+    return [texts[i % len(texts)] for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU embedding runtime benchmark")
+    parser.add_argument("--model", type=str, default="all-MiniLM-L6-v2")
+    parser.add_argument("--runtimes", nargs="+", default=["torch", "torch-int8", "onnx"])
+    parser.add_argument("--threads", type=int, default=None, help="Runtime threads (EMBEDDING_THREADS)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Encode batch size")
+    parser.add_argument("--texts", type=int, default=512, help="Texts embedded for throughput")
+    parser.add_argument("--queries", type=int, default=50, help="Single-query latency samples")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.threads:
+        os.environ["EMBEDDING_THREADS"] = str(args.threads)
+    os.environ["EMBEDDING_VERIFY"] = "0"  # verified explicitly below, without falling back
+
+    from rag.embeddings import embed_texts, get_embedding_model, verify_runtime
+    from settings import reload_settings
+
+    reload_settings()
+    texts = sample_texts(args.texts)
+    results = {"model": args.model, "batch_size": args.batch_size, "runtimes": {}}
+    failed = False
+
+    for runtime in args.runtimes:
+        start = time.perf_counter()
+        get_embedding_model(args.model, runtime)
+        load_seconds = time.perf_counter() - start
+
+        report = verify_runtime(args.model, runtime)
+        failed = failed or not report["ok"]
+
+        embed_texts(texts[:args.batch_size], args.model, batch_size=args.batch_size, runtime=runtime)  # warm-up
+        start = time.perf_counter()
+        embed_texts(texts, args.model, batch_size=args.batch_size, runtime=runtime)
+        throughput = len(texts) / (time.perf_counter() - start)
+
+        latencies = []
+        for i in range(args.queries):
+            start = time.perf_counter()
+            embed_texts([f"is this an ad hominem? #{i}"], args.model, batch_size=1, runtime=runtime)
+            latencies.append(time.perf_counter() - start)
+
+        results["runtimes"][runtime] = {
+            "load_seconds": round(load_seconds, 2),
+            "min_cosine": round(report["min_cosine"], 5),
+            "ok": report["ok"],
+            "texts_per_second": round(throughput, 1),
+            "query_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        }
+        print(f"{'OK  ' if report['ok'] else 'DIFF'} {runtime:<11} cos>={report['min_cosine']:.4f}  "
+              f"{throughput:8.1f} texts/s  query p50 {statistics.median(latencies) * 1000:6.2f} ms  "
+              f"(load {load_seconds:.1f}s)")
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Deterministic local stand-ins for the external services a debate calls.
+
+FakeServices runs one local HTTP server that answers like:
+
+  - OpenAI chat completions   POST /openai/v1/chat/completions
+  - Tavily search             POST /tavily/search
+  - Wikipedia page summary    GET  /wikipedia/page/summary/<topic>
+
+Each service has its own ServiceProfile: base latency plus jitter, an
+extra delay per completion token (OpenAI only), an error rate with the
+HTTP status to fail with, and the token counts reported in `usage`.
+Response bodies depend only on the request, so runs are reproducible;
+latency and errors come from a seeded random generator.
+
+The chat fake answers in the JSON shape each prompt asks for (supporter
+pros, critic cons, judge verdict, topic word, news bullets), so the whole
+graph runs unchanged. env() returns the variables that point settings.py
+at the server.
+
+For machines without the embedding model, install_fake_embedder() swaps
+the vector store's embedder for a hashed bag-of-words one.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+@dataclass
+class ServiceProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    token_latency_ms: float = 0.0     # extra delay per completion token
+    error_rate: float = 0.0           # fraction of requests that fail
+    error_status: int = 503           # status returned for a failure
+    prompt_tokens: Optional[int] = None   # default: about 4 characters per token
+    completion_tokens: int = 300
+
+
+def _digest(*parts: Any) -> int:
+    raw = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return int(hashlib.sha256(raw).hexdigest()[:8], 16)
+
+
+# ----------------------------------------------------------------------
+# Canned responses
+
+TOPICS = ["technology", "science", "economics", "politics", "environment", "ethics", "education", "health"]
+
+
+def _supporter_reply(seed: int) -> Dict[str, Any]:
+    return {"pros": [
+        {
+            "short_title": f"Supporting point {i + 1}",
+            "argument_text": f"Evidence item {seed % 97 + i} points in favour of the claim under typical conditions.",
+            "supporting_evidence": "Retrieved search result summary.",
+            "evidence_strength": ["strong", "moderate", "weak"][(seed + i) % 3],
+            "confidence": 50 + (seed + i) % 40,
+        }
+        for i in range(3)
+    ]}
+
+
+def _critic_reply(seed: int) -> Dict[str, Any]:
+    return {"cons": [
+        {
+            "short_title": f"Counterpoint {i + 1}",
+            "counter_text": f"The supporting point {i + 1} overgeneralizes from a limited sample of cases.",
+            "counter_evidence": "no retrieved evidence available",
+            "evidence_strength": ["moderate", "weak", "strong"][(seed + i) % 3],
+            "confidence": 40 + (seed + i) % 40,
+        }
+        for i in range(3)
+    ]}
+
+
+def _judge_reply(seed: int) -> Dict[str, Any]:
+    return {
+        "verdict_pros": [{"title": "Supporting point 1", "summary": "Plausible with moderate evidence.",
+                          "reliability": 60, "matched_rules": []}],
+        "verdict_cons": [{"title": "Counterpoint 1", "summary": "Valid concern about generalization.",
+                          "reliability": 55, "matched_rules": []}],
+        "fallacies_detected": [{"argument_title": "Counterpoint 2", "fallacy_name": "hasty generalization",
+                                "explanation": "Draws a broad conclusion from few cases.",
+                                "rule_reference": "rules"}],
+        "final_recommendation": ["Accept", "Lean Accept", "Undecided", "Lean Reject", "Reject"][seed % 5],
+        "explanation": "Both sides raise reasonable points; the evidence is moderate.",
+        "confidence": 50 + seed % 40,
+    }
+
+
+def chat_reply(messages) -> str:
+    """Text the fake model answers for these messages."""
+    system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    user = " ".join(m.get("content", "") for m in messages if m.get("role") != "system")
+    seed = _digest(user)
+
+    if "SUPPORTER agent" in system:
+        return json.dumps(_supporter_reply(seed))
+    if "CRITIC agent" in system:
+        return json.dumps(_critic_reply(seed))
+    if "JUDGE agent" in system:
+        return json.dumps(_judge_reply(seed))
+    if "Classify the following claim" in user:
+        return TOPICS[seed % len(TOPICS)]
+    return "- Fact one about the topic.\n- Fact two about the topic.\n- Fact three about the topic."
+
+
+def tavily_reply(query: str, max_results: int) -> Dict[str, Any]:
+    seed = _digest(query)
+    return {"results": [
+        {
+            "title": f"Result {i + 1} for {query[:40]}",
+            "url": f"https://example.org/{seed % 10000}/{i}",
+            "content": (f"Report {seed % 1000}-{i} discusses {query}. " * 6).strip(),
+        }
+        for i in range(max_results)
+    ]}
+
+
+def wikipedia_reply(topic: str) -> Dict[str, Any]:
+    title = topic.replace("_", " ")
+    return {
+        "title": title,
+        "extract": f"{title} is a subject discussed in many sources. " * 4,
+        "content_urls": {"desktop": {"page": f"https://en.wikipedia.org/wiki/{topic}"}},
+    }
+
+
+# ----------------------------------------------------------------------
+class FakeServices:
+    """
+    Local HTTP server standing in for OpenAI, Tavily and Wikipedia.
+
+    Usage:
+        with FakeServices(openai=ServiceProfile(latency_ms=400)) as fakes:
+            os.environ.update(fakes.env())
+            ...
+    """
+
+    def __init__(self, openai: Optional[ServiceProfile] = None, tavily: Optional[ServiceProfile] = None,
+                 wikipedia: Optional[ServiceProfile] = None, seed: int = 0, host: str = "127.0.0.1"):
+        self.profiles = {
+            "openai": openai or ServiceProfile(),
+            "tavily": tavily or ServiceProfile(),
+            "wikipedia": wikipedia or ServiceProfile(),
+        }
+        self.counts = {name: {"requests": 0, "errors": 0} for name in self.profiles}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        handler = type("BoundFakeHandler", (_FakeHandler,), {"services": self})
+        self.server = ThreadingHTTPServer((host, 0), handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self._thread = None
+
+    def start(self) -> "FakeServices":
+        self._thread = threading.Thread(target=self.server.serve_forever, name="fake-services", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "FakeServices":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def env(self) -> Dict[str, str]:
+        """Environment variables that point settings.py at this server."""
+        return {
+            "OPENAI_API_KEY": "fake-key",
+            "OPENAI_BASE_URL": f"{self.url}/openai/v1",
+            "TAVILY_API_KEY": "fake-key",
+            "TAVILY_ENDPOINT": f"{self.url}/tavily/search",
+            "WIKIPEDIA_ENDPOINT": f"{self.url}/wikipedia/page/summary/",
+        }
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(counts) for name, counts in self.counts.items()}
+
+    def draw(self, service: str, completion_tokens: int = 0):
+        """(delay in seconds, failed?) for one request."""
+        profile = self.profiles[service]
+        with self._lock:
+            jitter = self._rng.uniform(-profile.jitter_ms, profile.jitter_ms)
+            failed = self._rng.random() < profile.error_rate
+            self.counts[service]["requests"] += 1
+            self.counts[service]["errors"] += int(failed)
+        delay_ms = profile.latency_ms + jitter + profile.token_latency_ms * completion_tokens
+        return max(0.0, delay_ms) / 1000.0, failed
+
+
+class _FakeHandler(BaseHTTPRequestHandler):
+    services: FakeServices = None  # set by FakeServices
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _fail(self, service: str) -> None:
+        status = self.services.profiles[service].error_status
+        headers = {"Retry-After": "0.05"} if status == 429 else None
+        self._send(status, {"error": {"message": f"injected {service} failure", "type": "server_error"}}, headers)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def do_POST(self):
+        body = self._read_json()
+
+        if self.path.rstrip("/").endswith("/chat/completions"):
+            profile = self.services.profiles["openai"]
+            completion_tokens = min(profile.completion_tokens, int(body.get("max_tokens") or profile.completion_tokens))
+            delay, failed = self.services.draw("openai", completion_tokens)
+            time.sleep(delay)
+            if failed:
+                return self._fail("openai")
+
+            messages = body.get("messages", [])
+            prompt_tokens = profile.prompt_tokens
+            if prompt_tokens is None:
+                prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+            return self._send(200, {
+                "id": f"chatcmpl-{_digest(messages) % 10 ** 8}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": chat_reply(messages)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            })
+
+        if self.path.rstrip("/").endswith("/tavily/search"):
+            delay, failed = self.services.draw("tavily")
+            time.sleep(delay)
+            if failed:
+                return self._fail("tavily")
+            return self._send(200, tavily_reply(str(body.get("query", "")), int(body.get("max_results", 5))))
+
+        self._send(404, {"error": {"message": "not found"}})
+
+    def do_GET(self):
+        marker = "/wikipedia/page/summary/"
+        if marker in self.path:
+            delay, failed = self.services.draw("wikipedia")
+            time.sleep(delay)
+            if failed:
+                return self._fail("wikipedia")
+            return self._send(200, wikipedia_reply(self.path.split(marker, 1)[1]))
+
+        self._send(404, {"error": {"message": "not found"}})
+
+
+# ----------------------------------------------------------------------
+def hashed_embeddings(texts, dim: int = 384) -> np.ndarray:
+    """Deterministic hashed bag-of-words vectors, L2-normalized like the real model's."""
+    from rag.lexicalIndex import tokenize
+
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            h = _digest(token)
+            vectors[row, h % dim] += 1.0 if (h >> 16) & 1 else -1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def install_fake_embedder(dim: int = 384) -> None:
+    """Make the vector store embed with hashed_embeddings instead of sentence-transformers."""
+    import rag.vectorStore
+
+    def fake_embed_texts(texts, model_name=None, batch_size=None, runtime=None):
+        return hashed_embeddings(list(texts), dim)
+
+    rag.vectorStore.embed_texts = fake_embed_texts
@@ -0,0 +1,137 @@
+"""
+Recall / memory / latency benchmark for quantized vector search.
+
+Builds a NumPy-backend collection for each quantization mode from the same
+embeddings, runs the same queries, and reports recall@k against exact
+float32 search, the memory held in RAM by the first-pass index, and the
+query latency. Exits non-zero when a mode falls below --min-recall.
+
+Embeddings are synthetic (clustered, normalized, 384-d like
+all-MiniLM-L6-v2) unless --vectors points at an existing .npy matrix,
+e.g. data/processed/vectorstore/debate_rules_chunks.npy.
+
+Usage:
+    python -m benchmarks.quantizationBenchmark
+    python -m benchmarks.quantizationBenchmark --rows 200000 --k 5 --output data/results/quantization.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rag.quantization import code_bytes  # noqa: E402
+from rag.vectorBackends import NumpyBackend  # noqa: E402
+
+MODES = ["none", "int8", "binary"]
+
+
+def synthetic_embeddings(rows: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+    """Clustered unit vectors, closer to real sentence embeddings than pure noise."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, size=rows)] + 0.6 * rng.normal(size=(rows, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_queries(matrix: np.ndarray, count: int, seed: int) -> np.ndarray:
+    """Perturbed copies of random rows (a query is near, not equal to, a chunk)."""
+    rng = np.random.default_rng(seed + 1)
+    picked = matrix[rng.integers(0, len(matrix), size=count)]
+    queries = picked + 0.5 * rng.normal(size=picked.shape).astype(np.float32) / np.sqrt(matrix.shape[1])
+    return (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+
+def build(directory: str, matrix: np.ndarray, mode: str, rescore_factor) -> NumpyBackend:
+    backend = NumpyBackend(directory, f"bench_{mode}", quantization=mode, rescore_factor=rescore_factor)
+    ids = [f"doc:{i}" for i in range(len(matrix))]
+    backend.begin_bulk()
+    backend.upsert(ids, [""] * len(ids), matrix)
+    backend.end_bulk()
+    return backend
+
+
+def run_queries(backend: NumpyBackend, queries: np.ndarray, k: int, batch: int):
+    results, start = [], time.perf_counter()
+    for i in range(0, len(queries), batch):
+        results.extend(backend.search_many(queries[i:i + batch], k))
+    elapsed = time.perf_counter() - start
+    return [[item["id"] for item in r] for r in results], elapsed / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantized vector search benchmark")
+    parser.add_argument("--vectors", type=str, default=None, help="Existing (N, dim) .npy matrix to use")
+    parser.add_argument("--rows", type=int, default=50000, help="Synthetic rows")
+    parser.add_argument("--dim", type=int, default=384, help="Synthetic dimension")
+    parser.add_argument("--clusters", type=int, default=200, help="Synthetic clusters")
+    parser.add_argument("--queries", type=int, default=200, help="Queries")
+    parser.add_argument("--batch", type=int, default=16, help="Queries per search_many call")
+    parser.add_argument("--k", type=int, default=5, help="Results per query")
+    parser.add_argument("--rescore-factor", type=int, default=None,
+                        help="Candidates rescored = k * factor (default: per mode, see rag/quantization.py)")
+    parser.add_argument("--min-recall", type=float, default=0.95, help="Fail below this recall@k")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.vectors:
+        matrix = np.asarray(np.load(args.vectors), dtype=np.float32)
+    else:
+        matrix = synthetic_embeddings(args.rows, args.dim, args.clusters, args.seed)
+    queries = make_queries(matrix, args.queries, args.seed)
+
+    directory = tempfile.mkdtemp(prefix="quant_bench_")
+    results = {
+        "rows": int(matrix.shape[0]), "dim": int(matrix.shape[1]), "queries": len(queries),
+        "k": args.k, "modes": {},
+    }
+    failed = False
+
+    try:
+        exact = None
+        for mode in MODES:
+            backend = build(directory, matrix, mode, args.rescore_factor)
+            found, latency = run_queries(backend, queries, args.k, args.batch)
+            if exact is None:
+                exact = found
+
+            recall = float(np.mean([len(set(f) & set(e)) / len(e) for f, e in zip(found, exact)]))
+            resident = matrix.nbytes if backend.codes is None else code_bytes(backend.codes)
+            ok = recall >= args.min_recall
+            failed = failed or not ok
+
+            results["modes"][mode] = {
+                "rescore_factor": backend.rescore_factor,
+                "recall_at_k": round(recall, 4),
+                "index_bytes": int(resident),
+                "compression": round(matrix.nbytes / resident, 1),
+                "latency_ms": round(latency * 1000, 3),
+                "ok": ok,
+            }
+            print(f"{'OK  ' if ok else 'LOW '} {mode:<7} recall@{args.k} {recall:.3f}  "
+                  f"index {resident / 2**20:8.1f} MiB ({matrix.nbytes / resident:4.1f}x)  "
+                  f"{latency * 1000:7.3f} ms/query")
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.output:
+        out_dir = os.path.dirname(args.output)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
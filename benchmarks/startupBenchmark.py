@@ -0,0 +1,92 @@
+"""
+Startup-time benchmark for the CLI.
+
+Runs each startup case in a fresh interpreter several times, reports the
+median wall time, and exits non-zero when a case goes over its budget or
+when importing the graph pulls in a dependency that should load lazily.
+
+Usage:
+    python -m benchmarks.startupBenchmark
+    python -m benchmarks.startupBenchmark --runs 10 --output data/results/startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be imported until first use
+LAZY_MODULES = ["openai", "chromadb", "sentence_transformers", "torch", "onnxruntime"]
+
+# name -> (command, budget in seconds)
+CASES = {
+    "bare_interpreter": ([sys.executable, "-c", "pass"], 1.0),
+    "cli_help": ([sys.executable, "main.py", "--help"], 0.5),
+    "import_graph": ([sys.executable, "-c", "import graph"], 3.0),
+}
+
+
+def time_command(command, runs: int) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def eagerly_loaded_modules() -> list:
+    """Lazy modules that are already in sys.modules right after `import graph`."""
+    probe = (
+        "import json, sys, graph; "
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup-time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per case")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget (slow machines)")
+    parser.add_argument("--output", type=str, default=None, help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = {"cases": {}, "eager_modules": eagerly_loaded_modules()}
+    failed = bool(results["eager_modules"])
+
+    for name, (command, budget) in CASES.items():
+        timings = time_command(command, args.runs)
+        median = statistics.median(timings)
+        budget *= args.scale
+        ok = median <= budget
+        failed = failed or not ok
+
+        results["cases"][name] = {
+            "median_seconds": round(median, 4),
+            "min_seconds": round(min(timings), 4),
+            "budget_seconds": budget,
+            "ok": ok,
+        }
+        print(f"{'OK  ' if ok else 'SLOW'} {name:<18} median {median * 1000:7.1f} ms  (budget {budget * 1000:.0f} ms)")
+
+    if results["eager_modules"]:
+        print(f"FAIL eagerly imported by graph: {', '.join(results['eager_modules'])}")
+
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+checkpoints.py
+
+Durable per-node checkpoints for debates, so a debate that failed part
+way (a judge call that ran out of retries, a killed process) can be run
+again without repeating the steps that already finished.
+
+- Every graph node is wrapped with checkpointed(): inside a debate scope
+  the node's state update is saved to SQLite when it finishes, and a
+  later run of the same debate id (and the same claim and context)
+  returns the saved update instead of running the node again
+- run_debate opens the scope; checkpoints of a debate are deleted once
+  it finishes, and checkpoints older than CHECKPOINT_TTL are collected
+  whenever the store is opened
+- Storage: a single SQLite file, like the LLM response cache
+
+Settings (environment variables, read through settings.py):
+    CHECKPOINT_ENABLED  "0" disables checkpointing (default "1")
+    CHECKPOINT_PATH     SQLite file (default data/cache/checkpoints.sqlite)
+    CHECKPOINT_TTL      seconds a debate's checkpoints are kept (default 7 days)
+"""
+
+import contextvars
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from settings import get_settings
+from tracing import current_span
+
+DEFAULT_CHECKPOINT_PATH = os.path.join("data", "cache", "checkpoints.sqlite")
+
+# (debate_id, input_hash) of the debate running in this context
+_current_debate: contextvars.ContextVar = contextvars.ContextVar("current_debate", default=None)
+
+
+def input_hash(claim: str, context: Optional[str] = None) -> str:
+    """Checkpoints are only reused for the same claim and context."""
+    raw = json.dumps([claim, context or ""], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """
+    SQLite-backed store of node updates keyed by (debate id, node).
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, ttl_seconds: float = 7 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                debate_id TEXT NOT NULL,
+                node TEXT NOT NULL,
+                input_hash TEXT NOT NULL,
+                update_json TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (debate_id, node)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_checkpoint_created ON checkpoints(created_at)")
+        self._conn.commit()
+
+    # ----------------------------------------------------------------------
+    def load(self, debate_id: str, node: str, inputs: str) -> Optional[Dict[str, Any]]:
+        """The saved update of a node, or None if it has not finished for these inputs."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT update_json, created_at FROM checkpoints "
+                "WHERE debate_id = ? AND node = ? AND input_hash = ?",
+                (debate_id, node, inputs),
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > self.ttl_seconds:
+            return None
+        return json.loads(row[0])
+
+    def save(self, debate_id: str, node: str, inputs: str, update: Dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (debate_id, node, input_hash, update_json, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (debate_id, node, inputs, json.dumps(update, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    def completed_nodes(self, debate_id: str) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node FROM checkpoints WHERE debate_id = ? ORDER BY created_at", (debate_id,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self, debate_id: Optional[str] = None) -> None:
+        """Delete the checkpoints of one debate (or of every debate)."""
+        with self._lock:
+            if debate_id is None:
+                self._conn.execute("DELETE FROM checkpoints")
+            else:
+                self._conn.execute("DELETE FROM checkpoints WHERE debate_id = ?", (debate_id,))
+            self._conn.commit()
+
+    def collect_garbage(self, max_age: Optional[float] = None) -> int:
+        """Delete checkpoints older than max_age seconds (default: the TTL); returns rows removed."""
+        cutoff = time.time() - (self.ttl_seconds if max_age is None else max_age)
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM checkpoints WHERE created_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            debates, rows = self._conn.execute(
+                "SELECT COUNT(DISTINCT debate_id), COUNT(*) FROM checkpoints"
+            ).fetchone()
+        return {"debates": debates, "checkpoints": rows}
+
+
+# Module-level store so every debate shares one connection
+_STORE: Optional[CheckpointStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def checkpoints_enabled() -> bool:
+    return get_settings().checkpoint_enabled
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """Create (once) and return the shared CheckpointStore, collecting expired checkpoints."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            settings = get_settings()
+            _STORE = CheckpointStore(path=settings.checkpoint_path, ttl_seconds=settings.checkpoint_ttl)
+            _STORE.collect_garbage()
+    return _STORE
+
+
+# ----------------------------------------------------------------------
+@contextmanager
+def debate_scope(debate_id: str, claim: str, context: Optional[str] = None):
+    """
+    Checkpoint every node that runs inside the block under debate_id.
+    The debate's checkpoints are deleted when the block finishes without an error.
+    """
+    if not checkpoints_enabled():
+        yield None
+        return
+
+    store = get_checkpoint_store()
+    token = _current_debate.set((debate_id, input_hash(claim, context)))
+    try:
+        yield store
+    finally:
+        _current_debate.reset(token)
+    store.clear(debate_id)
+
+
+def checkpointed(node: str):
+    """Decorator that saves a node's update, and replays it when the debate is resumed."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            scope = _current_debate.get()
+            if scope is None:
+                return fn(*args, **kwargs)
+
+            debate_id, inputs = scope
+            store = get_checkpoint_store()
+            saved = store.load(debate_id, node, inputs)
+            if saved is not None:
+                current_span().set(checkpoint_hit=True)
+                return saved
+
+            update = fn(*args, **kwargs)
+            try:
+                store.save(debate_id, node, inputs, update)
+            except (TypeError, ValueError, sqlite3.Error) as e:
+                print(f"[CHECKPOINT ERROR] {node}:", e)
+            return update
+        return wrapper
+    return decorate
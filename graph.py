@@ -3,17 +3,43 @@ graph.py
 Defines the LangGraph pipeline for the Multi-Agent Debate Decision Advisor.
 
 Graph flow:
-    supporter → critic → judge → END
 
-The graph takes an initial DebateState (claim, context),
-runs each agent node in sequence, and outputs final_verdict.
+    START ─┬─ router ─ evidence ─ supporter ─ critic ─┐
+           └─ rules ──────────────────────────────────┴─ judge → END
+
+The graph takes an initial DebateState (claim, context).
+The router classifies the claim's topic with one short LLM call and
+picks the evidence tools worth calling for it (tools/toolRouter.py),
+so timeless claims skip news and low-yield lookups. Rule retrieval runs
+in parallel from the start; latency is roughly the critical path
+router → evidence → supporter → critic → judge. Parallel branches that
+write the same state field use reducers (see state/debateState.py).
+
+With ROUTER_ENABLED=0 the classifier runs in parallel with an evidence
+node that calls every registry tool:
+
+    START ─┬─ evidence ─┐
+           ├─ router ───┴─ supporter ─ critic ─┐
+           └─ rules ───────────────────────────┴─ judge → END
 """
 
-from langgraph.graph import StateGraph, END
+import uuid
+
+from langgraph.graph import StateGraph, START, END
 from state.debateState import DebateState
+from nodes.evidence import evidence_node, router_node
 from nodes.supporter import supporter_node
 from nodes.critic import critic_node
-from nodes.judge import judge_node
+from nodes.judge import judge_node, rules_node
+from checkpoints import checkpointed, debate_scope
+from tracing import span, trace, traced
+from settings import get_settings
+from verdictCache import cache_enabled, get_verdict_cache, is_cacheable
+
+
+def instrument(name: str, node):
+    """Node wrapped with a tracing span and a durable checkpoint (see checkpoints.py)."""
+    return traced("node", name)(checkpointed(name)(node))
 
 
 def build_graph() -> StateGraph:
@@ -24,26 +50,75 @@ def build_graph() -> StateGraph:
     #graph with DebateState as the state
     graph = StateGraph(DebateState)
 
-    # add nodes
-    graph.add_node("supporter", supporter_node)
-    graph.add_node("critic", critic_node)
-    graph.add_node("judge", judge_node)
-
-    # add edges
+    # add nodes (each one traced and checkpointed)
+    graph.add_node("evidence", instrument("evidence", evidence_node))
+    graph.add_node("router", instrument("router", router_node))
+    graph.add_node("rules", instrument("rules", rules_node))
+    graph.add_node("supporter", instrument("supporter", supporter_node))
+    graph.add_node("critic", instrument("critic", critic_node))
+    graph.add_node("judge", instrument("judge", judge_node))
+
+    # fan out: claim-only branches start together
+    graph.add_edge(START, "router")
+    graph.add_edge(START, "rules")
+
+    if get_settings().router_enabled:
+        # evidence runs the router's tool plan
+        graph.add_edge("router", "evidence")
+        graph.add_edge("evidence", "supporter")
+    else:
+        graph.add_edge(START, "evidence")
+        graph.add_edge(["evidence", "router"], "supporter")
+
+    # fan in: each step waits only for what it reads
     graph.add_edge("supporter", "critic")
-    graph.add_edge("critic", "judge")
+    graph.add_edge(["critic", "rules"], "judge")
     graph.add_edge("judge", END)
 
-    # 4. Set start and end nodes
-    graph.set_entry_point("supporter")
-
     # compile graph to object
     return graph.compile()
 
 
-def run_debate(claim: str, context: str = None):
+# Compiled graph reused by every debate in this process
+_GRAPH_CACHE = None
+
+
+def get_graph():
+    """
+    Returns the compiled debate graph, building it on first use.
+    The compiled graph is stateless between invocations, so it is safe
+    to share across threads.
+    """
+    global _GRAPH_CACHE
+    if _GRAPH_CACHE is None:
+        _GRAPH_CACHE = build_graph()
+    return _GRAPH_CACHE
+
+
+def run_debate(claim: str, context: str = None, graph=None, on_update=None, debate_id: str = None,
+               use_cache: bool = None):
     """
     Creates initial state, runs the graph, returns the final verdict.
+    The whole run is one trace (see tracing.py).
+
+    A fresh verdict for the same claim, or a close paraphrase of it, with
+    the same context is answered from the verdict cache (verdictCache.py)
+    without running the graph; it carries a "provenance" field.
+
+    Every finished node is checkpointed under debate_id. If the run fails
+    (e.g. the judge's LLM call runs out of retries), calling run_debate
+    again with the same debate_id, claim and context re-runs only the
+    nodes that did not finish.
+
+    Args:
+        claim: the claim to evaluate
+        context: optional extra context
+        graph: compiled graph to use; defaults to the shared one from get_graph()
+        on_update: optional callback on_update(node_name, update) called as each
+                   node finishes (used to stream progress)
+        debate_id: id of this debate (checkpoints, trace id, cached verdicts);
+                   random if not given, so only a given id can be resumed
+        use_cache: False skips the verdict cache; None follows VERDICT_CACHE_ENABLED
     Returns:
         dict: The judge's final verdict JSON.
     """
@@ -52,8 +127,39 @@ def run_debate(claim: str, context: str = None):
 
     state = initialize_state(claim=claim, context=context)
 
-    graph = build_graph()
-
-    final_state = graph.invoke(state) #run
-
-    return final_state.get("final_verdict", {})
+    graph = graph or get_graph()
+    debate_id = debate_id or uuid.uuid4().hex
+
+    with trace("run_debate", trace_id=debate_id):
+        cache = cached = None
+        if use_cache is not False and cache_enabled():
+            try:
+                cache = get_verdict_cache()
+                with span("cache", "verdict_cache") as lookup:
+                    cached = cache.lookup(claim, context)
+                    lookup.set(cache_hit=cached is not None)
+            except Exception as e:
+                print("[VERDICT CACHE ERROR]:", e)
+            if cached is not None:
+                if on_update is not None:
+                    on_update("verdict_cache", {"final_verdict": cached})
+                return cached
+
+        with debate_scope(debate_id, claim, context):
+            if on_update is None:
+                final_state = graph.invoke(state) #run
+                verdict = final_state.get("final_verdict", {})
+            else:
+                verdict = {}
+                for chunk in graph.stream(state, stream_mode="updates"):
+                    for node, update in chunk.items():
+                        on_update(node, update)
+                        if update and "final_verdict" in update:
+                            verdict = update["final_verdict"]
+
+        if cache is not None and is_cacheable(verdict):
+            try:
+                cache.put(claim, context, verdict, debate_id=debate_id)
+            except Exception as e:
+                print("[VERDICT CACHE ERROR]:", e)
+        return verdict
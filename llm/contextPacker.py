@@ -0,0 +1,279 @@
+"""
+Context Packer
+--------------
+Turns the evidence, arguments and RAG snippets that go into a prompt into a
+compact, predictable block of text:
+
+  - token counts come from the model's tokenizer (tiktoken), falling back
+    to ~4 characters per token when tiktoken is not installed
+  - everything is serialized as compact JSON (no indentation)
+  - exact duplicates and snippets mostly contained in another one are
+    dropped, and the text shared by overlapping chunks is trimmed
+  - snippets are ranked by relevance and added until the node's token
+    budget is full; what was kept and left out is recorded as attributes
+    of the node's trace span (see tracing.py)
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from tracing import current_span
+
+# Token budget for the variable inputs of each node's prompt (arguments from
+# earlier nodes + packed evidence / rule snippets)
+CONTEXT_BUDGETS = {
+    "supporter": 1200,
+    "critic": 1800,
+    "judge": 2600,
+}
+DEFAULT_CONTEXT_BUDGET = 1200
+
+# Snippets always get at least this many tokens, however long the arguments are
+MIN_SNIPPET_BUDGET = 300
+
+# Longest single snippet, so one long web page cannot take the whole budget
+MAX_SNIPPET_TOKENS = 300
+
+# A snippet with this share of its words already in a kept snippet is a duplicate
+# (only checked for snippets of at least MIN_CONTAINMENT_WORDS distinct words)
+CONTAINMENT_THRESHOLD = 0.6
+MIN_CONTAINMENT_WORDS = 8
+
+# Shortest shared prefix/suffix (characters) trimmed from overlapping chunks
+MIN_OVERLAP_CHARS = 40
+
+# How much a source is trusted before looking at the text (web evidence only)
+SOURCE_PRIORS = {
+    "topic_classifier": 1.0,
+    "news_summary": 0.9,
+    "wikipedia": 0.7,
+    "tavily": 0.6,
+}
+
+_ENCODERS: Dict[str, Any] = {}
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "should", "that", "the", "this",
+    "to", "was", "were", "will", "with", "would",
+}
+
+
+# ----------------------------------------------------------------------
+# Tokens and serialization
+
+def _get_encoder(model: str):
+    """tiktoken encoder for the model, loaded once; None if tiktoken is missing."""
+    if model not in _ENCODERS:
+        try:
+            import tiktoken
+            try:
+                _ENCODERS[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _ENCODERS[model] = tiktoken.get_encoding("o200k_base")
+        except ImportError:
+            _ENCODERS[model] = None
+    return _ENCODERS[model]
+
+
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    encoder = _get_encoder(model)
+    if encoder is None:
+        return (len(text) + 3) // 4
+    return len(encoder.encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o-mini") -> str:
+    """Cut text to at most max_tokens tokens (marked with an ellipsis)."""
+    encoder = _get_encoder(model)
+    if encoder is None:
+        limit = max_tokens * 4
+        return text if len(text) <= limit else text[:limit - 1] + "…"
+
+    tokens = encoder.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens - 1]) + "…"
+
+
+def compact_json(value: Any) -> str:
+    """JSON without indentation or spaces after separators."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+# ----------------------------------------------------------------------
+# Snippets
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+def relevance(query: str, text: str) -> float:
+    """Share of the query's content words that appear in text (0..1)."""
+    terms = {w for w in _words(query) if w not in _STOPWORDS}
+    if not terms:
+        return 0.0
+    return len(terms & set(_words(text))) / len(terms)
+
+
+def evidence_snippets(evidence: Dict[str, Any], claim: str) -> List[Dict[str, Any]]:
+    """
+    Flatten the tool results of one agent into scored snippets.
+
+    Args:
+        evidence: {tool_name: result} as returned by select_evidence
+        claim: used to score each snippet
+
+    Returns:
+        list of {"source", "text", "score", ...} dicts
+    """
+    snippets = []
+    for tool, result in evidence.items():
+        prior = SOURCE_PRIORS.get(tool, 0.5)
+
+        if tool == "tavily":
+            for rank, item in enumerate(result or []):
+                text = item.get("content", "")
+                snippets.append({
+                    "source": tool,
+                    "title": item.get("title", ""),
+                    "url": item.get("url", ""),
+                    "text": text,
+                    # later search results are trusted a little less
+                    "score": 0.7 * relevance(claim, text) + 0.3 * prior / (1 + 0.2 * rank),
+                })
+
+        elif tool == "wikipedia" and result:
+            text = result.get("extract", "")
+            snippets.append({
+                "source": tool,
+                "title": result.get("title", ""),
+                "url": result.get("url", ""),
+                "text": text,
+                "score": 0.7 * relevance(claim, text) + 0.3 * prior,
+            })
+
+        elif isinstance(result, str) and result:
+            # news_summary, topic_classifier: short LLM outputs
+            snippets.append({
+                "source": tool,
+                "text": result,
+                "score": 0.7 * relevance(claim, result) + 0.3 * prior,
+            })
+
+    return [s for s in snippets if s["text"].strip()]
+
+
+def rule_snippets(rule_docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Scored snippets from RAG results ({"id", "text", "distance"})."""
+    return [
+        {"id": doc["id"], "text": doc["text"], "score": 1.0 - float(doc.get("distance", 0.0))}
+        for doc in rule_docs
+        if doc.get("text", "").strip()
+    ]
+
+
+def _shared_edge(kept: str, text: str) -> Tuple[int, int]:
+    """
+    Length of text's prefix that ends `kept` and of text's suffix that starts
+    `kept` (the overlap the chunker leaves between neighbouring chunks).
+    """
+    head = tail = 0
+    longest = min(len(kept), len(text))
+    for size in range(longest, MIN_OVERLAP_CHARS - 1, -1):
+        if not head and kept.endswith(text[:size]):
+            head = size
+        if not tail and kept.startswith(text[-size:]):
+            tail = size
+        if head and tail:
+            break
+    return head, tail
+
+
+def dedupe_snippets(snippets: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Drop duplicate / contained snippets and trim overlap between neighbours.
+    Snippets are visited best-first, so the better-ranked copy survives.
+
+    Returns:
+        (kept snippets, {"duplicate": n, "overlap_trimmed": n})
+    """
+    kept: List[Dict[str, Any]] = []
+    kept_words: List[set] = []
+    dropped = {"duplicate": 0, "overlap_trimmed": 0}
+
+    for snippet in sorted(snippets, key=lambda s: s["score"], reverse=True):
+        text = " ".join(snippet["text"].split())
+
+        for other in kept:
+            head, tail = _shared_edge(other["text"], text)
+            if head or tail:
+                text = text[head:len(text) - tail].strip()
+                dropped["overlap_trimmed"] += 1
+
+        words = set(_words(text))
+        contained = len(words) >= MIN_CONTAINMENT_WORDS and any(
+            len(words & other) >= CONTAINMENT_THRESHOLD * len(words) for other in kept_words
+        )
+        if not words or contained:
+            dropped["duplicate"] += 1
+            continue
+
+        kept.append({**snippet, "text": text})
+        kept_words.append(words)
+
+    return kept, dropped
+
+
+# ----------------------------------------------------------------------
+def pack_snippets(
+    snippets: List[Dict[str, Any]],
+    node: str,
+    budget: Optional[int] = None,
+    reserved: int = 0,
+    model: str = "gpt-4o-mini",
+) -> List[Dict[str, Any]]:
+    """
+    Rank, deduplicate and fit snippets into the node's token budget.
+
+    Args:
+        snippets: scored snippets (evidence_snippets / rule_snippets)
+        node: "supporter", "critic" or "judge" (selects the budget)
+        budget: tokens available; defaults to CONTEXT_BUDGETS[node]
+        reserved: tokens of the budget already used by other variable inputs
+        model: tokenizer to count with
+
+    Returns:
+        kept snippets, best first, without their scores
+    """
+    budget = max((budget or CONTEXT_BUDGETS.get(node, DEFAULT_CONTEXT_BUDGET)) - reserved, MIN_SNIPPET_BUDGET)
+    unique, dropped = dedupe_snippets(snippets)
+
+    packed = []
+    used = 2  # the enclosing []
+    over_budget = []
+
+    for snippet in unique:
+        record = {k: v for k, v in snippet.items() if k != "score" and v}
+        record["text"] = truncate_to_tokens(record["text"], MAX_SNIPPET_TOKENS, model)
+
+        cost = count_tokens(compact_json(record), model) + 1
+        if used + cost > budget:
+            over_budget.append(snippet.get("id") or snippet.get("source", "?"))
+            continue
+
+        packed.append(record)
+        used += cost
+
+    current_span().set(
+        context_snippets=len(snippets),
+        context_kept=len(packed),
+        context_tokens=used,
+        context_budget=budget,
+        context_duplicates=dropped["duplicate"],
+        context_overlaps_trimmed=dropped["overlap_trimmed"],
+        context_over_budget=over_budget,
+    )
+
+    return packed
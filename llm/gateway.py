@@ -0,0 +1,294 @@
+"""
+LLM Gateway
+-----------
+Single entry point for every chat completion in the project
+(Supporter, Critic, Judge, news summary, topic classifier).
+
+- One shared OpenAI client, so HTTP connections are pooled and reused
+- Token-bucket limits on requests-per-minute and tokens-per-minute
+- Calls wait in a priority queue: the Judge goes ahead of the debating
+  agents, which go ahead of auxiliary tools
+- 429 / 5xx / connection errors are retried with backoff, honouring the
+  provider's Retry-After header; a rate-limit pause applies to every caller
+- Responses go through the shared response cache (llm/responseCache.py)
+- Every call is traced (tracing.py) with its tokens, estimated cost,
+  retries and cache hit
+
+The openai package is imported on the first call, not at import time.
+
+Settings (environment variables, read through settings.py):
+    OPENAI_API_KEY    API key for the shared client
+    OPENAI_BASE_URL   alternative API base URL (default: the OpenAI API)
+    LLM_RPM           requests per minute allowed (default 500)
+    LLM_TPM           tokens per minute allowed (default 200000)
+    LLM_MAX_RETRIES   retries per call after the first attempt (default 5)
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from llm.responseCache import get_response_cache, make_cache_key, should_cache
+from settings import get_settings
+from tracing import span
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# USD per million (prompt, completion) tokens, used for cost estimates
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+# Lower number = served first
+PRIORITY_JUDGE = 0
+PRIORITY_AGENT = 1
+PRIORITY_TOOL = 2
+
+BACKOFF_BASE = 1.0   # seconds
+BACKOFF_MAX = 30.0   # seconds
+
+
+class LLMGatewayError(Exception):
+    """Raised when a call still fails after every retry."""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute` tokens per minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+    """
+    Admits calls in priority order once both the request and token buckets allow it.
+    """
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.blocked_until = 0.0
+
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._seq = itertools.count()
+
+    def acquire(self, estimated_tokens: int, priority: int = PRIORITY_AGENT) -> None:
+        """Block until this call may be sent."""
+        with self._cond:
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+
+            while True:
+                if self._waiters[0] == entry:
+                    wait = max(
+                        self.blocked_until - time.monotonic(),
+                        self.requests.wait_time(1),
+                        self.tokens.wait_time(estimated_tokens),
+                    )
+                    if wait <= 0:
+                        self.requests.take(1)
+                        self.tokens.take(estimated_tokens)
+                        heapq.heappop(self._waiters)
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait(timeout=wait)
+                else:
+                    self._cond.wait()
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the token bucket once the real usage is known."""
+        with self._cond:
+            difference = estimated_tokens - actual_tokens
+            if difference > 0:
+                self.tokens.give_back(difference)
+            else:
+                self.tokens.take(-difference)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every queued call for `seconds` (provider asked us to back off)."""
+        with self._cond:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+
+# ----------------------------------------------------------------------
+# Shared client and limiter
+
+_CLIENT = None
+_LIMITER: Optional[RateLimiter] = None
+_INIT_LOCK = threading.Lock()
+
+
+def get_client():
+    """Create (once) and return the shared OpenAI client."""
+    global _CLIENT
+    with _INIT_LOCK:
+        if _CLIENT is None:
+            from openai import OpenAI
+
+            # retries are handled here so they respect the shared rate limiter
+            settings = get_settings()
+            _CLIENT = OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url, max_retries=0)
+    return _CLIENT
+
+
+def get_limiter() -> RateLimiter:
+    global _LIMITER
+    with _INIT_LOCK:
+        if _LIMITER is None:
+            settings = get_settings()
+            _LIMITER = RateLimiter(rpm=settings.llm_rpm, tpm=settings.llm_tpm)
+    return _LIMITER
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_tokens: int) -> int:
+    """Rough upper estimate (about 4 characters per token) used for admission."""
+    prompt_chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return prompt_chars // 4 + max_tokens
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of a call (0 for models missing from MODEL_PRICES)."""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    headers = response.headers
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        return None
+    return None
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    from openai import RateLimitError
+    return isinstance(error, RateLimitError)
+
+
+def _is_retryable(error: Exception) -> bool:
+    from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+    if isinstance(error, (RateLimitError, APIConnectionError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+# ----------------------------------------------------------------------
+def chat(
+    messages: List[Dict[str, Any]],
+    model: str = DEFAULT_MODEL,
+    max_tokens: int = 1000,
+    temperature: float = 0.0,
+    priority: int = PRIORITY_AGENT,
+    cache: Optional[bool] = None,
+) -> str:
+    """
+    Send a chat completion through the gateway and return the stripped text.
+
+    Args:
+        messages: OpenAI chat messages
+        model: model name
+        max_tokens: completion token limit
+        temperature: sampling temperature
+        priority: PRIORITY_JUDGE, PRIORITY_AGENT or PRIORITY_TOOL
+        cache: per-call-site cache override (see responseCache.should_cache)
+
+    Raises:
+        LLMGatewayError: if the call still fails after every retry
+    """
+    with span("llm", model, model=model, priority=priority) as current:
+        return _chat(messages, model, max_tokens, temperature, priority, cache, current)
+
+
+def _chat(messages, model, max_tokens, temperature, priority, cache, current) -> str:
+    use_cache = should_cache(temperature, cache)
+    if use_cache:
+        key = make_cache_key(model, messages, temperature, max_tokens)
+        cached = get_response_cache().get(key)
+        if cached is not None:
+            current.set(cache_hit=True)
+            return cached
+
+    client = get_client()
+    limiter = get_limiter()
+    estimated = estimate_tokens(messages, max_tokens)
+    max_retries = get_settings().llm_max_retries
+
+    for attempt in range(max_retries + 1):
+        limiter.acquire(estimated, priority)
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        except Exception as e:
+            limiter.settle(estimated, 0)
+            if not _is_retryable(e) or attempt == max_retries:
+                current.set(retries=attempt)
+                raise LLMGatewayError(f"{type(e).__name__}: {e}") from e
+
+            delay = _retry_after(e)
+            if delay is None:
+                delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+            if _is_rate_limit(e):
+                limiter.pause(delay)
+            time.sleep(delay)
+            continue
+
+        usage = getattr(response, "usage", None)
+        if usage is not None and getattr(usage, "total_tokens", None):
+            limiter.settle(estimated, usage.total_tokens)
+            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+            current.set(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cost_usd=estimate_cost(model, prompt_tokens, completion_tokens),
+            )
+        current.set(retries=attempt, cache_hit=False)
+
+        content = (response.choices[0].message.content or "").strip()
+        if use_cache and content:
+            get_response_cache().put(key, content)
+        return content
@@ -0,0 +1,101 @@
+"""
+Prompt Registry
+---------------
+Loads the agent prompts from prompts/ once per process and renders them
+in a single pass.
+
+Each prompt file has two parts separated by a line containing only
+`<<<user>>>`:
+
+  - the static system prefix (role, task, rules, output format); it may not
+    contain placeholders, so it is byte-identical on every call and
+    provider-side prompt-prefix caching can reuse it
+  - the user suffix with the {{placeholders}} for the claim, evidence and
+    arguments
+
+render() checks that every placeholder gets a value and rejects unknown ones.
+"""
+
+import os
+import re
+import threading
+from typing import Dict, List
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prompts")
+
+PROMPT_FILES = {
+    "supporter": "supporterPrompt.txt",
+    "critic": "criticPrompt.txt",
+    "judge": "judgePrompt.txt",
+}
+
+USER_MARKER = "<<<user>>>"
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*\}\}")
+
+_TEMPLATES: Dict[str, "PromptTemplate"] = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+class PromptError(ValueError):
+    """A prompt file is malformed or was rendered with the wrong values."""
+
+
+class PromptTemplate:
+    """A compiled prompt: static system text plus a pre-split user template."""
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+
+        system, marker, user = text.partition(USER_MARKER)
+        if not marker:
+            raise PromptError(f"prompt '{name}' has no {USER_MARKER} line")
+
+        self.system = system.strip()
+        if PLACEHOLDER_RE.search(self.system):
+            raise PromptError(f"prompt '{name}': placeholders must be in the user part, not the system prefix")
+
+        # re.split alternates literal text and placeholder names: [text, name, text, ...]
+        self._parts: List[str] = PLACEHOLDER_RE.split(user.strip())
+        self.placeholders = frozenset(self._parts[1::2])
+
+    def render(self, **values) -> str:
+        """Fill the user part in one pass over the pre-split template."""
+        missing = self.placeholders - values.keys()
+        unknown = values.keys() - self.placeholders
+        if missing or unknown:
+            raise PromptError(
+                f"prompt '{self.name}': missing {sorted(missing)}, unknown {sorted(unknown)}"
+            )
+
+        parts = self._parts[:]
+        for i in range(1, len(parts), 2):
+            parts[i] = str(values[parts[i]])
+        return "".join(parts)
+
+    def messages(self, **values) -> List[Dict[str, str]]:
+        """Chat messages: the static system prefix first, then the rendered user part."""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.render(**values)},
+        ]
+
+
+def get_prompt(name: str) -> PromptTemplate:
+    """Load and compile a prompt on first use; later calls return the cached template."""
+    template = _TEMPLATES.get(name)
+    if template is not None:
+        return template
+
+    with _TEMPLATES_LOCK:
+        if name not in _TEMPLATES:
+            if name not in PROMPT_FILES:
+                raise PromptError(f"unknown prompt '{name}'")
+            with open(os.path.join(PROMPTS_DIR, PROMPT_FILES[name]), "r", encoding="utf-8") as f:
+                _TEMPLATES[name] = PromptTemplate(name, f.read())
+        return _TEMPLATES[name]
+
+
+def reload_prompts() -> None:
+    """Drop the compiled templates (e.g. after editing a prompt file)."""
+    with _TEMPLATES_LOCK:
+        _TEMPLATES.clear()
@@ -0,0 +1,203 @@
+"""
+LLM Response Cache
+------------------
+Persistent, content-addressed cache for chat completions. Every LLM call
+goes through llm/gateway.py, which consults this cache first.
+
+- Key: SHA-256 of (model, messages, temperature, max_tokens)
+- Storage: a single SQLite file (safe across threads and processes)
+- Eviction: entries older than the TTL, then least-recently-used entries
+  once the stored responses exceed the size limit
+- Stats: hit/miss counters for the current process
+
+Settings (environment variables, read through settings.py):
+    LLM_CACHE_ENABLED          "0" disables the cache entirely (default "1")
+    LLM_CACHE_PATH             SQLite file (default data/cache/llm_cache.sqlite)
+    LLM_CACHE_TTL              seconds before an entry expires (default 7 days)
+    LLM_CACHE_MAX_MB           size limit of stored responses (default 256)
+    LLM_CACHE_MAX_TEMPERATURE  highest temperature cached by default (default 0.2)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from settings import get_settings
+
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "llm_cache.sqlite")
+
+
+def make_cache_key(model: str, messages: List[Dict[str, Any]], temperature: float, max_tokens: int) -> str:
+    """Hash everything that determines the completion into a stable key."""
+    payload = json.dumps(
+        {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    SQLite-backed key/value store for completion texts with TTL and LRU eviction.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    # ----------------------------------------------------------------------
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss or an expired entry."""
+
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    # ----------------------------------------------------------------------
+    def put(self, key: str, response: str) -> None:
+        """Store a response and evict expired / least-recently-used entries."""
+
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl_seconds,))
+
+        # keep the most recently used entries whose combined size fits the limit
+        self._conn.execute(
+            """
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY last_access DESC, key) AS running
+                    FROM responses
+                ) WHERE running > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+
+    # ----------------------------------------------------------------------
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current cache size."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+        }
+
+
+# Module-level cache so every call site shares one connection
+_CACHE: Optional[ResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    return get_settings().llm_cache_enabled
+
+
+def get_response_cache() -> ResponseCache:
+    """Create (once) and return the shared ResponseCache."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            settings = get_settings()
+            _CACHE = ResponseCache(
+                path=settings.llm_cache_path,
+                ttl_seconds=settings.llm_cache_ttl,
+                max_bytes=int(settings.llm_cache_max_mb * 1024 * 1024),
+            )
+    return _CACHE
+
+
+def should_cache(temperature: float, cache: Optional[bool] = None) -> bool:
+    """
+    Decide whether a call is cacheable.
+
+    Args:
+        temperature: sampling temperature of the call
+        cache: per-call-site override; None means "cache if the temperature
+               is at most LLM_CACHE_MAX_TEMPERATURE"
+    """
+    if not cache_enabled() or cache is False:
+        return False
+    if cache is True:
+        return True
+    return temperature <= get_settings().llm_cache_max_temperature
+
@@ -5,23 +5,83 @@ CLI entrypoint for the Multi-Agent Debate Decision Advisor.
 
 Usage:
     python main.py --claim "claim"
+    python main.py --claim "claim" --profile
+    python main.py --claims-file claims.jsonl --output verdicts.jsonl --concurrency 8
+    python main.py serve --port 8765
 """
 
 import argparse
-from graph import run_debate
+import sys
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from server import serve_main
+
+        serve_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(description="Multi-Agent Debate Decision Advisor")
-    parser.add_argument("--claim", type=str, required=True, help="The claim to evaluate")
-    parser.add_argument("--context", type=str, default=None, help="Optional context")
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--claim", type=str, help="The claim to evaluate")
+    source.add_argument("--claims-file", type=str, help="JSONL or CSV file of claims to evaluate in batch")
+
+    parser.add_argument("--context", type=str, default=None, help="Optional context (single claim only)")
+    parser.add_argument("--output", type=str, default="data/results/verdicts.jsonl",
+                        help="Batch mode: JSONL file verdicts are appended to")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Batch mode: number of debates run at the same time")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="Batch mode: extra attempts per failed debate (resumed from checkpoints)")
+    parser.add_argument("--debate-id", type=str, default=None,
+                        help="Checkpoint id of a single debate (default: derived from claim and context)")
+    parser.add_argument("--no-verdict-cache", action="store_true",
+                        help="Always run the full debate, even for a recently debated claim")
+    parser.add_argument("--profile", action="store_true",
+                        help="Trace the run and print a per-stage time / token / cost breakdown")
 
     args = parser.parse_args()
 
+    if args.profile:
+        import tracing
+        from settings import get_settings
+
+        tracing.set_enabled(True)
+        with tracing.collect() as spans:
+            run(args)
+        print("\nPROFILE")
+        print(tracing.format_profile(spans))
+        settings = get_settings()
+        print(f"\nTrace: {settings.trace_path}  Metrics: {settings.metrics_path}")
+        return
+
+    run(args)
+
+
+def run(args):
+    if args.claims_file:
+        from batch import run_batch
+
+        print("\nRunning Multi-Agent Debate System (batch)\n")
+        run_batch(args.claims_file, args.output, concurrency=args.concurrency, retries=args.retries)
+        return
+
+    from batch import claim_id
+    from graph import run_debate
+
     print("\nRunning Multi-Agent Debate System\n")
     print(f"Claim: {args.claim}\n")
 
-    result = run_debate(claim=args.claim, context=args.context)
+    # a stable id, so running the same command again resumes a failed debate
+    debate_id = args.debate_id or claim_id(args.claim, args.context)
+    try:
+        result = run_debate(claim=args.claim, context=args.context, debate_id=debate_id,
+                            use_cache=not args.no_verdict_cache)
+    except Exception as e:
+        print(f"\n[DEBATE FAILED] {e}")
+        print("Finished steps are checkpointed; run the same command again to resume.")
+        sys.exit(1)
 
     print("\nFINAL VERDICT")
     print(result)
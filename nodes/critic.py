@@ -1,91 +1,54 @@
 import json
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
 
-from state.debateState import DebateState
-from tools.assignTools import TOOLS
-from tools.searchTool import search_tavily
-from tools.wikipediaTool import wikipedia_search
-from tools.newsSummaryTool import summarize_news
-from tools.topicClassifierTool import classify_topic
+from llm.gateway import chat, PRIORITY_AGENT
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from state.debateState import DebateState
+from nodes.evidence import select_evidence
+from llm.promptRegistry import get_prompt
+from llm.contextPacker import compact_json, count_tokens, evidence_snippets, pack_snippets
 
 
-def call_llm(prompt: str) -> str:
+def call_llm(messages: list) -> str:
+    """Errors are re-raised, so the debate resumes from the critic step when retried."""
     try:
-        response = client.chat.completions.create(
+        return chat(
             model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
             max_tokens=1100,
-            temperature=0.2
+            temperature=0.2,
+            priority=PRIORITY_AGENT,
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
         print("[Critic LLM ERROR]:", e)
-        return "{}"
-
-
-def load_critic_prompt():
-    with open("prompts/criticPrompt.txt", "r", encoding="utf-8") as f:
-        return f.read()
-
-
-def run_tool(tool_name: str, claim: str, tavily_cache=None):
-    if tool_name == "tavily":
-        return search_tavily(claim)
-
-    elif tool_name == "wikipedia":
-        return wikipedia_search(claim)
-
-    elif tool_name == "news_summary":
-        return summarize_news(tavily_cache or [])
-
-    elif tool_name == "topic_classifier":
-        return classify_topic(claim)
-
-    else:
-        return None
+        raise
 
 
 def critic_node(state: DebateState) -> DebateState:
-    """Critic uses tools dynamically, guided by the registry."""
+    """Critic reads the shared evidence for the tools listed in registry."""
 
     claim = state["claim"]
-    tool_list = TOOLS["critic"]
-
-    combined_docs = {}
-    tavily_cache = None
-
-    for tool in tool_list:
-        result = run_tool(tool, claim, tavily_cache)
 
-        if tool == "tavily":
-            tavily_cache = result
+    # Evidence was gathered once by the evidence node
+    evidence = select_evidence(state, "critic")
 
-        combined_docs[tool] = result
-
-    state["retrieved_docs"] = combined_docs
-
-    # Build prompt
-    prompt_template = load_critic_prompt()
+    # The supporter's arguments are always included; evidence fills the rest of the budget
+    supporter_json = compact_json(state.get("supporter_output", {}))
+    combined_docs = pack_snippets(
+        evidence_snippets(evidence, claim), node="critic", reserved=count_tokens(supporter_json)
+    )
 
-    filled_prompt = (
-        prompt_template
-        .replace("{{claim}}", claim)
-        .replace("{{context}}", str(state.get("context")))
-        .replace("{{supporter_output}}", json.dumps(state.get("supporter_output", {}), indent=2))
-        .replace("{{retrieved_docs}}", json.dumps(combined_docs, indent=2))
+    messages = get_prompt("critic").messages(
+        claim=claim,
+        context=state.get("context"),
+        supporter_output=supporter_json,
+        retrieved_docs=compact_json(combined_docs),
     )
 
-    response_text = call_llm(filled_prompt)
+    response_text = call_llm(messages)
 
     try:
         critic_output = json.loads(response_text)
     except json.JSONDecodeError:
         critic_output = {"cons": []}
 
-    state["critic_output"] = critic_output
-    return state
+    return {"retrieved_docs": combined_docs, "critic_output": critic_output}
@@ -0,0 +1,136 @@
+"""
+Evidence Node
+-------------
+Runs the registry tools ONCE per debate and stores their results in
+DebateState["evidence"], so Supporter and Critic share the same evidence
+instead of each repeating every search and LLM tool call.
+
+The router node runs first: it classifies the claim's topic and picks
+the evidence tools worth calling for it (tools/toolRouter.py). The
+evidence node runs that plan and records how each tool did.
+"""
+
+import time
+
+from state.debateState import DebateState
+from tools.assignTools import TOOLS
+from tools.searchTool import search_tavily
+from tools.wikipediaTool import wikipedia_search
+from tools.newsSummaryTool import summarize_news
+from tools.topicClassifierTool import classify_topic
+from tools.toolRouter import get_outcome_store, normalize_topic, plan_tools
+from tools.toolScheduler import run_tool_graph
+from settings import get_settings
+from tracing import current_span, span
+
+# Agents whose tools are gathered by the evidence stage
+EVIDENCE_AGENTS = ["supporter", "critic"]
+
+# Claim-only tools that run in their own node (see router_node)
+BRANCH_TOOLS = ["topic_classifier"]
+
+
+def run_tool(tool_name: str, claim: str, tavily_cache=None):
+
+    with span("tool", tool_name):
+        if tool_name == "tavily":
+            return search_tavily(claim)
+
+        elif tool_name == "wikipedia":
+            return wikipedia_search(claim)
+
+        elif tool_name == "news_summary":
+            return summarize_news(tavily_cache or [])
+
+        elif tool_name == "topic_classifier":
+            return classify_topic(claim)
+
+        else:
+            return None
+
+
+def plan_tool_calls(claim: str, agents=None) -> list:
+    """
+    Collect the distinct (tool, query) pairs needed by the given agents.
+
+    Returns:
+        list of (tool_name, query) tuples without duplicates
+    """
+    plan = []
+    for agent in agents or EVIDENCE_AGENTS:
+        for tool in TOOLS.get(agent, []):
+            if (tool, claim) not in plan:
+                plan.append((tool, claim))
+    return plan
+
+
+def gather_evidence(claim: str, agents=None, only=None, skip=None, timings=None) -> dict:
+    """
+    Run every distinct tool call once and return {tool_name: result}.
+
+    Tools run concurrently; news_summary starts as soon as tavily is done
+    and any tool past its deadline is replaced by a placeholder.
+
+    Args:
+        claim: the claim used as the query
+        agents: agents whose registry tools are needed (default: Supporter and Critic)
+        only: if given, run only these tools
+        skip: tools to leave out
+        timings: optional dict filled with {tool_name: seconds} of the tools that finished
+    """
+    queries = {
+        tool: query
+        for tool, query in plan_tool_calls(claim, agents)
+        if (only is None or tool in only) and tool not in (skip or [])
+    }
+
+    def run_scheduled(tool, dep_results):
+        start = time.perf_counter()
+        result = run_tool(tool, queries[tool], dep_results.get("tavily"))
+        if timings is not None:
+            timings[tool] = time.perf_counter() - start
+        return result
+
+    return run_tool_graph(list(queries), run_scheduled)
+
+
+def select_evidence(state: DebateState, agent: str) -> dict:
+    """Pick the shared evidence for the tools this agent is registered for."""
+    evidence = state.get("evidence") or {}
+    return {tool: evidence.get(tool) for tool in TOOLS.get(agent, [])}
+
+
+def evidence_node(state: DebateState) -> DebateState:
+    """
+    Gathers shared web evidence for Supporter and Critic before any argument is written.
+    Runs the router's tool plan when there is one, otherwise every registry tool.
+    """
+
+    plan = state.get("tool_plan")
+    if plan is None:
+        return {"evidence": gather_evidence(state["claim"], skip=BRANCH_TOOLS)}
+
+    timings = {}
+    evidence = gather_evidence(state["claim"], only=plan["tools"], skip=BRANCH_TOOLS, timings=timings)
+
+    try:
+        get_outcome_store().record(plan["topic"], evidence, timings, skipped=list(plan["skipped"]))
+    except Exception as e:
+        print("[ROUTER ERROR]:", e)
+
+    return {"evidence": evidence}
+
+
+def router_node(state: DebateState) -> DebateState:
+    """
+    Classifies the claim's topic (a cheap LLM call) and plans the evidence
+    tools for it; the classification is merged into the evidence dict.
+    """
+
+    evidence = gather_evidence(state["claim"], only=BRANCH_TOOLS)
+    if not get_settings().router_enabled:
+        return {"evidence": evidence}
+
+    plan = plan_tools(normalize_topic(evidence.get("topic_classifier")))
+    current_span().set(topic=plan["topic"], tools=plan["tools"], estimated_cost=plan["estimated_cost"])
+    return {"evidence": evidence, "tool_plan": plan}
@@ -2,68 +2,105 @@
 """
 Judge Node
 ----------
-Retrieves relevant fallacy/rule chunks using RAG,
-loads judge prompt, calls OpenAI,
+Retrieves relevant fallacy/rule chunks using RAG
+(rules_node prefetches them for the claim in a parallel branch,
+then the judge looks up rules for every pro and con in one batch),
+renders the judge prompt, calls OpenAI,
 parses JSON, updates final verdict.
 """
 
 import json
-import os
 
-from dotenv import load_dotenv
-load_dotenv()
-
-from openai import OpenAI
+from llm.contextPacker import compact_json, count_tokens, pack_snippets, rule_snippets
+from llm.gateway import chat, PRIORITY_JUDGE
+from llm.promptRegistry import get_prompt
 from state.debateState import DebateState
-from rag.retrieval import retrieve_relevant_rules
+from rag.retrieval import retrieve_relevant_rules, retrieve_rules_for_arguments, merge_results
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Rule chunks retrieved per argument, and cap on the merged rule list
+ARGUMENT_TOP_K = 2
+MAX_RULE_DOCS = 10
 
 
-def call_llm(prompt: str) -> str:
+def call_llm(messages: list) -> str:
+    """
+    Like the debating agents, the judge does not fall back to an empty
+    answer: the error fails the debate, so a retry resumes from the
+    checkpoints and re-runs only this step.
+    """
     try:
-        response = client.chat.completions.create(
+        return chat(
             model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
+            messages=messages,
             max_tokens=1500,
-            temperature=0.0  
+            temperature=0.0,
+            priority=PRIORITY_JUDGE,
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
         print("[Judge LLM ERROR]:", e)
-        return "{}"
-
-
-def load_judge_prompt() -> str:
-    with open("prompts/judgePrompt.txt", "r", encoding="utf-8") as f:
-        return f.read()
+        raise
+
+
+def rules_node(state: DebateState) -> DebateState:
+    """Retrieves rule chunks for the claim; runs in parallel with the debating agents."""
+
+    return {"rule_docs": retrieve_relevant_rules(state["claim"], top_k=5)}
+
+
+def collect_argument_texts(state: DebateState) -> list:
+    """
+    Texts of every supporter pro and critic con, used as rule queries.
+    The agents' JSON comes from the model, so anything not shaped like
+    {"pros": [{...}]} / {"cons": [{...}]} is skipped.
+    """
+    texts = []
+    for output_key, list_key, text_key in (("supporter_output", "pros", "argument_text"),
+                                           ("critic_output", "cons", "counter_text")):
+        output = state.get(output_key)
+        items = output.get(list_key) if isinstance(output, dict) else None
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            text = next((value for value in (item.get(text_key), item.get("short_title"))
+                         if isinstance(value, str) and value.strip()), None)
+            if text:
+                texts.append(text)
+    return texts
 
 
 def judge_node(state: DebateState) -> DebateState:
     """Main Judge logic."""
 
-    # (RAG)
-    rag_snippets = retrieve_relevant_rules(state["claim"], top_k=5)
-    state["retrieved_docs"] = rag_snippets
+    # (RAG) prefetched by rules_node; retrieve here if the judge runs on its own
+    claim_rules = state.get("rule_docs") or retrieve_relevant_rules(state["claim"], top_k=5)
 
+    # rules for every argument in a single batched lookup
+    argument_rules = retrieve_rules_for_arguments(collect_argument_texts(state), top_k=ARGUMENT_TOP_K)
+    rag_snippets = merge_results([claim_rules, argument_rules], limit=MAX_RULE_DOCS)
 
-    prompt_template = load_judge_prompt()
+    # Both sides' arguments are always included; rule snippets fill the rest of the budget
+    supporter_json = compact_json(state.get("supporter_output", {}))
+    critic_json = compact_json(state.get("critic_output", {}))
+    rag_snippets = pack_snippets(
+        rule_snippets(rag_snippets), node="judge",
+        reserved=count_tokens(supporter_json) + count_tokens(critic_json),
+    )
 
-    filled_prompt = (
-        prompt_template
-        .replace("{{claim}}", state["claim"])
-        .replace("{{context}}", str(state.get("context")))
-        .replace("{{supporter_output}}", json.dumps(state.get("supporter_output", {}), indent=2))
-        .replace("{{critic_output}}", json.dumps(state.get("critic_output", {}), indent=2))
-        .replace("{{retrieved_docs}}", json.dumps(rag_snippets, indent=2))
+    messages = get_prompt("judge").messages(
+        claim=state["claim"],
+        context=state.get("context"),
+        supporter_output=supporter_json,
+        critic_output=critic_json,
+        retrieved_docs=compact_json(rag_snippets),
     )
 
-    response_text = call_llm(filled_prompt)
+    response_text = call_llm(messages)
 
     try:
         verdict = json.loads(response_text)
     except json.JSONDecodeError:
         verdict = {"final_recommendation": "Undecided", "confidence": 0}
 
-    state["final_verdict"] = verdict
-    return state
+    return {"retrieved_docs": rag_snippets, "final_verdict": verdict}
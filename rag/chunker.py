@@ -1,38 +1,102 @@
 """
 Splits the debate-rules text into clean, overlapping chunks for embedding.
-This file defines a simple, reliable character-based chunker.
+This file defines a simple, reliable character-based chunker that works
+on a stream of page texts, so large documents never have to be held in
+memory as one string.
 """
 
 import os
+import re
 import json
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, List, Optional
 
+from rag.jsonlIO import read_jsonl, tee_jsonl
 
-def chunk_text(text: str, chunk_size: int = 700, overlap: int = 150) -> List[Dict[str, str]]:
+# Defaults, also recorded in the ingestion manifest (rag/manifest.py)
+CHUNK_SIZE = 700
+CHUNK_OVERLAP = 150
+
+DEFAULT_CHUNKS_PATH = os.path.join("data", "processed", "chunks.jsonl")
+LEGACY_CHUNKS_PATH = os.path.join("data", "processed", "chunks.json")
+
+
+def document_id(path: str, root: Optional[str] = None) -> str:
     """
-    Splits the input text into overlapping chunks.
+    Slug for a source document, e.g. "data/raw/Fallacy Guide.pdf" -> "fallacy-guide".
+    With a root directory, subfolders are kept: "guides/fallacy-guide".
+    """
+    relative = os.path.relpath(path, root) if root else os.path.basename(path)
+    parts = os.path.splitext(relative)[0].split(os.sep)
+    return "/".join(re.sub(r"[^a-z0-9]+", "-", part.lower()).strip("-") or "doc" for part in parts)
+
+
+def chunk_id_for(doc_id: Optional[str], n: int) -> str:
+    """Stable chunk id: "<doc_id>:<n>", or the legacy "chunk_<n>" without a document."""
+    return f"{doc_id}:{n}" if doc_id else f"chunk_{n}"
+
+
+def iter_chunks(texts: Iterable[str],
+                chunk_size: int = CHUNK_SIZE,
+                overlap: int = CHUNK_OVERLAP,
+                doc_id: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """
+    Splits a stream of texts into overlapping chunks.
+
+    The texts are treated as one whitespace-normalized document joined by
+    single spaces, so the output is identical to chunking the whole text at
+    once, but only about one chunk plus one page is buffered at a time.
+    Chunk ids are namespaced by doc_id (see chunk_id_for), so they stay the
+    same when other documents in the corpus are added or removed.
     """
+    if overlap >= chunk_size:
+        raise ValueError("overlap must be smaller than chunk_size")
 
-    chunks = []
-    start = 0
+    step = chunk_size - overlap
+    buffer = ""        # document text from the start of the next chunk
+    seen_text = False
     chunk_id = 0
 
-    # Normalize whitespace
-    text = " ".join(text.split())
+    for text in texts:
+        # Normalize whitespace
+        text = " ".join(text.split())
+        if not text:
+            continue
 
-    while start < len(text):
-        end = start + chunk_size
-        chunk_content = text[start:end]
+        buffer = f"{buffer} {text}" if seen_text else text
+        seen_text = True
 
-        chunks.append({
-            "id": f"chunk_{chunk_id}",
-            "text": chunk_content
-        })
+        while len(buffer) >= chunk_size:
+            yield {"id": chunk_id_for(doc_id, chunk_id), "text": buffer[:chunk_size]}
+            chunk_id += 1
+            buffer = buffer[step:]
 
+    while buffer:
+        yield {"id": chunk_id_for(doc_id, chunk_id), "text": buffer[:chunk_size]}
         chunk_id += 1
-        start += (chunk_size - overlap)
+        buffer = buffer[step:]
 
-    return chunks
+
+def chunk_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[Dict[str, str]]:
+    """
+    Splits the input text into overlapping chunks.
+    """
+    return list(iter_chunks([text], chunk_size=chunk_size, overlap=overlap))
+
+
+def iter_chunks_from_file(path: str) -> Iterator[Dict[str, str]]:
+    """Stream chunks from chunks.jsonl (or load a legacy chunks.json array)."""
+    if path.endswith(".jsonl"):
+        yield from read_jsonl(path)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+
+def default_chunks_path() -> str:
+    """chunks.jsonl, or the legacy chunks.json if only that one exists."""
+    if not os.path.exists(DEFAULT_CHUNKS_PATH) and os.path.exists(LEGACY_CHUNKS_PATH):
+        return LEGACY_CHUNKS_PATH
+    return DEFAULT_CHUNKS_PATH
 
 
 def save_chunks_to_json(chunks: List[Dict[str, str]], output_path: str) -> None:
@@ -42,34 +106,36 @@ def save_chunks_to_json(chunks: List[Dict[str, str]], output_path: str) -> None:
 
 
 def process_and_save_chunks(raw_text: str,
-                            output_path: str = "data/processed/chunks.json",
-                            chunk_size: int = 700,
-                            overlap: int = 150) -> List[Dict[str, str]]:
+                            output_path: str = DEFAULT_CHUNKS_PATH,
+                            chunk_size: int = CHUNK_SIZE,
+                            overlap: int = CHUNK_OVERLAP) -> List[Dict[str, str]]:
+
+    chunks = iter_chunks([raw_text], chunk_size=chunk_size, overlap=overlap)
 
-    chunks = chunk_text(
-        text=raw_text,
-        chunk_size=chunk_size,
-        overlap=overlap
-    )
+    if output_path.endswith(".jsonl"):
+        return list(tee_jsonl(chunks, output_path))
 
+    chunks = list(chunks)
     save_chunks_to_json(chunks, output_path)
     return chunks
 
 
 def main():
-    """Loads raw_text.txt and creates chunks.json"""
-    input_path = os.path.join("data", "processed", "raw_text.txt")
-    output_path = os.path.join("data", "processed", "chunks.json")
+    """Streams pages.jsonl into chunks.jsonl"""
+    input_path = os.path.join("data", "processed", "pages.jsonl")
+    output_path = DEFAULT_CHUNKS_PATH
 
     if not os.path.exists(input_path):
-        raise FileNotFoundError(f"raw_text.txt not found at {input_path}. Run documentLoader.py first.")
+        raise FileNotFoundError(f"pages.jsonl not found at {input_path}. Run documentLoader.py first.")
 
-    with open(input_path, "r", encoding="utf-8") as f:
-        raw_text = f.read()
+    page_texts = (page["text"] for page in read_jsonl(input_path))
+    doc_id = document_id(os.path.join("data", "raw", "debate_rules.pdf"))
 
-    chunks = process_and_save_chunks(raw_text, output_path)
+    count = 0
+    for _ in tee_jsonl(iter_chunks(page_texts, doc_id=doc_id), output_path):
+        count += 1
 
-    print(f" Saved chunks to: {output_path}")
+    print(f" Saved {count} chunks to: {output_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,280 @@
+"""
+corpusIngest.py
+---------------
+Index a whole directory of PDFs (rulebooks, fallacy guides, style manuals)
+into the vector store, using every core.
+
+  1. PDFs are split into page ranges and extracted in a process pool, so
+     one large PDF is spread over several workers too.
+  2. Each document is chunked on its own, with chunk ids namespaced by the
+     document ("fallacy-guide:12"), so adding or editing one PDF does not
+     shift the ids of the others. Per-document chunks are kept in
+     data/processed/corpus/<doc>.chunks.jsonl; a PDF whose hash has not
+     changed since the last run is not extracted again.
+  3. Changed chunks are embedded in shards by a second process pool (one
+     model per worker) while the parent writes finished shards to the store.
+
+Usage:
+    python -m rag.corpusIngest --dir data/raw
+    python -m rag.corpusIngest --dir data/raw --workers 8 --shard-size 512
+"""
+
+import argparse
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rag.chunker import CHUNK_SIZE, CHUNK_OVERLAP, document_id, iter_chunks
+from rag.documentLoader import extract_page_range, page_count
+from rag.ingestPipeline import ThroughputMeter
+from rag.jsonlIO import read_jsonl, tee_jsonl
+from rag.manifest import load_manifest, sha256_file, sync_chunk_stream
+
+DEFAULT_CORPUS_DIR = os.path.join("data", "raw")
+CORPUS_OUTPUT_DIR = os.path.join("data", "processed", "corpus")
+
+# Pages extracted per worker task
+PAGES_PER_TASK = 16
+
+
+def discover_pdfs(corpus_dir: str) -> List[str]:
+    """All PDFs under corpus_dir, in a stable order."""
+    found = []
+    for root, _, files in os.walk(corpus_dir):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                found.append(os.path.join(root, name))
+    return sorted(found)
+
+
+def default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def doc_chunks_path(output_dir: str, doc_id: str) -> str:
+    return os.path.join(output_dir, doc_id + ".chunks.jsonl")
+
+
+# ----------------------------------------------------------------------
+# Embedding workers
+
+_WORKER_MODEL: Optional[str] = None
+_WORKER_RUNTIME: Optional[str] = None
+
+
+def _init_embed_worker(model_name: str, runtime: str, threads: int) -> None:
+    """Keep the runtime from oversubscribing cores; the model loads on the first shard."""
+    global _WORKER_MODEL, _WORKER_RUNTIME
+    _WORKER_MODEL = model_name
+    _WORKER_RUNTIME = runtime
+    os.environ.setdefault("EMBEDDING_THREADS", str(threads))
+
+
+def _embed_shard(texts: List[str], batch_size: Optional[int]):
+    from rag.embeddings import embed_texts
+    return embed_texts(texts, _WORKER_MODEL, batch_size=batch_size, runtime=_WORKER_RUNTIME)
+
+
+def sharded_embedder(pool: ProcessPoolExecutor, batch_size: Optional[int], max_pending: int):
+    """
+    Build an embed_batches function for sync_chunk_stream: shards are
+    embedded by the pool, at most max_pending in flight, and yielded in
+    their original order.
+    """
+    def embed_batches(batches: Iterable[List[Dict[str, str]]]) -> Iterator[Tuple[List[Dict[str, str]], Any]]:
+        pending = deque()
+        for batch in batches:
+            pending.append((batch, pool.submit(_embed_shard, [c["text"] for c in batch], batch_size)))
+            if len(pending) >= max_pending:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+    return embed_batches
+
+
+# ----------------------------------------------------------------------
+def extract_documents(
+    pdfs: List[str],
+    corpus_dir: str,
+    output_dir: str,
+    pool: ProcessPoolExecutor,
+    chunk_size: int,
+    overlap: int,
+    meter: ThroughputMeter,
+) -> None:
+    """
+    Extract the given PDFs in page-range tasks and write each document's
+    chunks file as soon as all of its pages are in.
+    """
+    tasks = {}
+    pages: Dict[str, List[Dict[str, Any]]] = {}
+    remaining: Dict[str, int] = {}
+
+    for path in pdfs:
+        try:
+            total = page_count(path)
+        except Exception as e:
+            print(f"[CORPUS ERROR] {path}: {e}")
+            continue
+
+        pages[path] = []
+        remaining[path] = 0
+        for start in range(0, max(total, 1), PAGES_PER_TASK):
+            future = pool.submit(extract_page_range, path, start, start + PAGES_PER_TASK)
+            tasks[future] = path
+            remaining[path] += 1
+
+    for future in as_completed(tasks):
+        path = tasks[future]
+        try:
+            pages[path].extend(future.result())
+        except Exception as e:
+            print(f"[CORPUS ERROR] {path}: {e}")
+        remaining[path] -= 1
+
+        if remaining[path] == 0:
+            doc_pages = sorted(pages.pop(path), key=lambda page: page["page"])
+            meter.pages += len(doc_pages)
+
+            doc_id = document_id(path, corpus_dir)
+            chunks = iter_chunks((page["text"] for page in doc_pages),
+                                 chunk_size=chunk_size, overlap=overlap, doc_id=doc_id)
+            target = doc_chunks_path(output_dir, doc_id)
+            count = sum(1 for _ in tee_jsonl(chunks, target))
+            print(f"[CORPUS] {doc_id}: {len(doc_pages)} pages, {count} chunks")
+
+
+def ingest_corpus(
+    corpus_dir: str = DEFAULT_CORPUS_DIR,
+    output_dir: str = CORPUS_OUTPUT_DIR,
+    store=None,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+    shard_size: int = 256,
+    embed_batch_size: Optional[int] = None,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """
+    Extract, chunk, embed and index every PDF in corpus_dir.
+
+    Args:
+        corpus_dir: directory searched (recursively) for PDFs
+        output_dir: where per-document and combined chunk files are written
+        store: DebateVectorStore; defaults to rag.retrieval.init_or_get_store()
+        workers: processes used for extraction and for embedding (default: all cores)
+        chunk_size, overlap: chunker parameters
+        shard_size: chunks per embedding task (and per store write)
+        embed_batch_size: texts per embedding forward pass inside a worker
+        force: re-extract every PDF and rebuild the whole collection
+
+    Returns:
+        dict: documents, upserted/deleted/unchanged counts and throughput figures
+    """
+    if store is None:
+        from rag.retrieval import init_or_get_store
+        store = init_or_get_store()
+
+    workers = workers or default_workers()
+    meter = ThroughputMeter()
+    pdfs = discover_pdfs(corpus_dir)
+    if not pdfs:
+        raise FileNotFoundError(f"No PDFs found in {corpus_dir}")
+
+    manifest = load_manifest(store)
+    previous = manifest.get("documents", {}) if not force else {}
+    same_chunker = manifest.get("chunker") == {"chunk_size": chunk_size, "overlap": overlap}
+
+    documents = {}
+    stale = []
+    for path in pdfs:
+        doc_id = document_id(path, corpus_dir)
+        digest = sha256_file(path)
+        documents[doc_id] = {"path": path, "sha256": digest}
+
+        fresh = (
+            same_chunker
+            and previous.get(doc_id, {}).get("sha256") == digest
+            and os.path.exists(doc_chunks_path(output_dir, doc_id))
+        )
+        if not fresh:
+            stale.append(path)
+
+    # spawn: workers must not inherit model or thread state from the parent
+    context = multiprocessing.get_context("spawn")
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            extract_documents(stale, corpus_dir, output_dir, pool, chunk_size, overlap, meter)
+
+    def corpus_chunks():
+        for doc_id in sorted(documents):
+            path = doc_chunks_path(output_dir, doc_id)
+            if os.path.exists(path):
+                yield from meter.count_chunks(read_jsonl(path))
+
+    combined_path = os.path.join(output_dir, "chunks.jsonl")
+    threads = max(1, default_workers() // workers)
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_embed_worker,
+                             initargs=(store.embedding_model, store.embedding_runtime, threads)) as pool:
+        stats = sync_chunk_stream(
+            store,
+            tee_jsonl(corpus_chunks(), combined_path),
+            chunks_path=combined_path,
+            source_pdf_path=corpus_dir,
+            force=force,
+            batch_size=shard_size,
+            embed_batch_size=embed_batch_size,
+            chunker={"chunk_size": chunk_size, "overlap": overlap},
+            on_batch=meter.on_batch,
+            embed_batches=sharded_embedder(pool, embed_batch_size, max_pending=workers * 2),
+            extra={"documents": documents},
+        )
+
+    return {"documents": len(documents), "extracted": len(stale), **stats, **meter.rates()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index a directory of PDFs into the vector store")
+    parser.add_argument("--dir", type=str, default=DEFAULT_CORPUS_DIR, help="Directory of PDFs")
+    parser.add_argument("--output-dir", type=str, default=CORPUS_OUTPUT_DIR, help="Where chunk files are written")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Characters per chunk")
+    parser.add_argument("--overlap", type=int, default=CHUNK_OVERLAP, help="Characters shared by consecutive chunks")
+    parser.add_argument("--shard-size", type=int, default=256, help="Chunks per embedding task")
+    parser.add_argument("--embed-batch-size", type=int, default=None,
+                        help="Texts per embedding forward pass (default: EMBEDDING_BATCH_SIZE)")
+    parser.add_argument("--backend", type=str, default=None, help="Vector backend (chroma or numpy)")
+    parser.add_argument("--force", action="store_true", help="Re-extract everything and rebuild the collection")
+    args = parser.parse_args(argv)
+
+    from rag.retrieval import init_or_get_store
+
+    result = ingest_corpus(
+        corpus_dir=args.dir,
+        output_dir=args.output_dir,
+        store=init_or_get_store(backend=args.backend),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        shard_size=args.shard_size,
+        embed_batch_size=args.embed_batch_size,
+        force=args.force,
+    )
+
+    print(f"[CORPUS] {result['documents']} documents ({result['extracted']} extracted): "
+          f"{result['upserted']} upserted, {result['deleted']} deleted, {result['unchanged']} unchanged")
+    print(f"[CORPUS] {result['pages']} pages ({result['pages_per_second']}/s), "
+          f"{result['chunks']} chunks ({result['chunks_per_second']}/s), "
+          f"{result['vectors']} vectors ({result['vectors_per_second']}/s) in {result['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
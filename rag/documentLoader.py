@@ -1,47 +1,73 @@
 """
-Loads the debate-rules PDF from data/raw/ and extracts clean text,
-then saves it to data/processed/raw_text.txt
+Loads the debate-rules PDF from data/raw/ and extracts clean text
+page by page, then saves it to data/processed/pages.jsonl
+(one {"page": n, "text": ...} record per line).
 """
 
 import os
+from typing import Dict, Iterator, List, Optional
+
 from pypdf import PdfReader
 
+from rag.jsonlIO import tee_jsonl
 
-def load_pdf_text(filepath: str) -> str:
+DEFAULT_PAGES_PATH = os.path.join("data", "processed", "pages.jsonl")
+
+
+def iter_pdf_pages(filepath: str, start: int = 0, end: Optional[int] = None) -> Iterator[Dict[str, object]]:
     """
-    Extract text from PDF, clean whitespace, return as string.
+    Yield {"page": n, "text": cleaned} for every page with text.
+    Pages are extracted one at a time, so memory stays flat for large PDFs.
+
+    Args:
+        filepath: PDF file
+        start, end: 0-based page range [start, end); the whole document by default
     """
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"PDF file not found: {filepath}")
 
     reader = PdfReader(filepath)
-    all_text = []
+    end = len(reader.pages) if end is None else min(end, len(reader.pages))
 
-    for page in reader.pages:
-        text = page.extract_text()
+    for index in range(start, end):
+        text = reader.pages[index].extract_text()
         if text:
             cleaned = " ".join(text.split())  # remove awkward spacing
-            all_text.append(cleaned)
+            if cleaned:
+                yield {"page": index + 1, "text": cleaned}
 
-    return "\n".join(all_text)
 
+def page_count(filepath: str) -> int:
+    """Number of pages in a PDF (reads only the page tree, not the content)."""
+    return len(PdfReader(filepath).pages)
 
-def main():
+
+def extract_page_range(filepath: str, start: int, end: int) -> List[Dict[str, object]]:
     """
-    Load debate_rules.pdf and save raw_text.txt into data/processed/.
+    Pages [start, end) (0-based) of a PDF as a list; used by the corpus
+    ingestion workers so one large PDF can be split over several processes.
     """
-    input_path = os.path.join("data", "raw", "debate_rules.pdf")
-    output_dir = os.path.join("data", "processed")
-    output_path = os.path.join(output_dir, "raw_text.txt")
+    return list(iter_pdf_pages(filepath, start, end))
 
-    os.makedirs(output_dir, exist_ok=True)
 
-    text = load_pdf_text(input_path)
+def load_pdf_text(filepath: str) -> str:
+    """
+    Extract text from PDF, clean whitespace, return as string.
+    """
+    return "\n".join(page["text"] for page in iter_pdf_pages(filepath))
+
+
+def main():
+    """
+    Load debate_rules.pdf and stream its pages into pages.jsonl in data/processed/.
+    """
+    input_path = os.path.join("data", "raw", "debate_rules.pdf")
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(text)
+    pages = 0
+    for _ in tee_jsonl(iter_pdf_pages(input_path), DEFAULT_PAGES_PATH):
+        pages += 1
 
-    print("PDF extraction complete")
+    print(f"PDF extraction complete ({pages} pages -> {DEFAULT_PAGES_PATH})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+"""
+Sentence-transformers embedding helpers shared by the vector store backends.
+The model is loaded once per process, on first use.
+
+The CPU runtime is selectable (EMBEDDING_RUNTIME):
+  - "torch":      plain PyTorch inference (reference)
+  - "torch-int8": PyTorch with Linear layers dynamically quantized to int8
+  - "onnx":       the same model exported to ONNX and run by onnxruntime
+                  (sentence-transformers exports it on first load; needs
+                  `pip install optimum[onnxruntime]`)
+
+EMBEDDING_THREADS sets the intra-op threads of the runtime and
+EMBEDDING_BATCH_SIZE the encode batch size. Non-reference runtimes are
+checked against the torch embeddings of a few probe sentences when they
+are loaded (EMBEDDING_VERIFY); if the cosine similarity falls below
+EMBEDDING_MIN_COSINE, the torch runtime is used instead. The torch
+embeddings of the probes are computed once per model and stored under
+REFERENCE_DIR, so a verified int8 / ONNX process never loads the torch
+model itself.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from settings import get_settings
+
+EMBEDDING_RUNTIMES = ["torch", "torch-int8", "onnx"]
+
+# Sentences embedded by verify_runtime()
+PROBE_TEXTS = [
+    "An ad hominem attacks the person instead of the argument.",
+    "A strawman misrepresents the opposing position to make it easier to refute.",
+    "The burden of proof lies with the one who makes the claim.",
+    "Remote work increases productivity for most software teams.",
+    "Correlation does not imply causation.",
+]
+
+# Stored torch embeddings of PROBE_TEXTS, one .npy file per model
+REFERENCE_DIR = os.path.join("data", "cache", "embedding_reference")
+
+_MODELS: Dict[Tuple[str, str], object] = {}
+_MODELS_LOCK = threading.RLock()
+
+
+def _load_model(model_name: str, runtime: str, threads: int):
+    from sentence_transformers import SentenceTransformer
+
+    if runtime == "onnx":
+        model_kwargs: Dict[str, Any] = {"provider": "CPUExecutionProvider"}
+        if threads:
+            import onnxruntime
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = threads
+            model_kwargs["session_options"] = options
+        return SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+
+    import torch
+    if threads:
+        torch.set_num_threads(threads)
+
+    model = SentenceTransformer(model_name, device="cpu")
+    if runtime == "torch-int8":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def reference_path(model_name: str) -> str:
+    """Reference file of a model; the probe texts are part of the name, so editing them starts a new file."""
+    probes = hashlib.sha256("\n".join(PROBE_TEXTS).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(REFERENCE_DIR, f"{model_name.replace('/', '__')}-{probes}.npy")
+
+
+def reference_vectors(model_name: str) -> np.ndarray:
+    """
+    Torch embeddings of PROBE_TEXTS, read from REFERENCE_DIR. The first call
+    for a model computes them with a torch model that is dropped afterwards
+    (unless the process already uses the torch runtime) and stores them.
+    """
+    path = reference_path(model_name)
+    if os.path.exists(path):
+        return np.load(path)
+
+    with _MODELS_LOCK:
+        model = _MODELS.get((model_name, "torch")) or _load_model(model_name, "torch", get_settings().embedding_threads)
+    vectors = _encode(model, PROBE_TEXTS, batch_size=len(PROBE_TEXTS))
+    del model
+
+    os.makedirs(REFERENCE_DIR, exist_ok=True)
+    tmp = path + ".tmp.npy"
+    np.save(tmp, vectors)
+    os.replace(tmp, path)
+    return vectors
+
+
+def verify_runtime(model_name: str, runtime: str, min_cosine: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Compare a runtime's embeddings of PROBE_TEXTS with the stored torch reference.
+
+    Returns:
+        dict: runtime, min_cosine, mean_cosine and ok (min_cosine above the tolerance)
+    """
+    if min_cosine is None:
+        min_cosine = get_settings().embedding_min_cosine
+
+    reference = reference_vectors(model_name)
+    candidate = _encode(get_embedding_model(model_name, runtime, verify=False), PROBE_TEXTS,
+                        batch_size=len(PROBE_TEXTS))
+    cosines = np.sum(reference * candidate, axis=1)
+
+    return {
+        "runtime": runtime,
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "ok": bool(cosines.min() >= min_cosine),
+    }
+
+
+def get_embedding_model(model_name: str = "all-MiniLM-L6-v2", runtime: Optional[str] = None,
+                        verify: Optional[bool] = None):
+    """
+    Load (once) and return the model for a runtime.
+    A runtime that fails verification is replaced by the torch model.
+    """
+    settings = get_settings()
+    runtime = runtime or settings.embedding_runtime
+    if runtime not in EMBEDDING_RUNTIMES:
+        raise ValueError(f"Unknown embedding runtime '{runtime}', expected one of {EMBEDDING_RUNTIMES}")
+    verify = settings.embedding_verify if verify is None else verify
+
+    key = (model_name, runtime)
+    with _MODELS_LOCK:
+        if key not in _MODELS:
+            _MODELS[key] = _load_model(model_name, runtime, settings.embedding_threads)
+
+            if runtime != "torch" and verify:
+                report = verify_runtime(model_name, runtime)
+                if not report["ok"]:
+                    print(f"[EMBEDDING WARNING] {runtime} runtime differs from torch "
+                          f"(min cosine {report['min_cosine']:.4f}); using torch")
+                    _MODELS[key] = get_embedding_model(model_name, "torch")
+    return _MODELS[key]
+
+
+def _encode(model, texts: List[str], batch_size: int) -> np.ndarray:
+    vectors = model.encode(
+        list(texts),
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+    )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def embed_texts(texts: List[str], model_name: str = "all-MiniLM-L6-v2", batch_size: Optional[int] = None,
+                runtime: Optional[str] = None) -> np.ndarray:
+    """
+    Embed texts into L2-normalized float32 vectors.
+
+    Args:
+        texts: texts to embed
+        model_name: sentence-transformers model
+        batch_size: encode batch size; defaults to EMBEDDING_BATCH_SIZE
+        runtime: "torch", "torch-int8" or "onnx"; defaults to EMBEDDING_RUNTIME
+
+    Returns:
+        np.ndarray of shape (len(texts), dim)
+    """
+    model = get_embedding_model(model_name, runtime)
+    return _encode(model, texts, batch_size or get_settings().embedding_batch_size)
@@ -0,0 +1,182 @@
+"""
+ingestPipeline.py
+-----------------
+Streaming ingestion: PDF -> pages -> chunks -> embedding batches -> store writes.
+
+Every stage is a generator, so only one page, about one chunk of buffered
+text and one write batch are in memory at a time, whatever the size of the
+PDF. Pages and chunks are written to JSONL on the way through
+(data/processed/pages.jsonl and chunks.jsonl), and the store is updated
+through the manifest, so unchanged chunks are not re-embedded. When the
+PDF, chunker parameters and chunks file all match the manifest, the run
+stops after hashing them, without extracting a single page.
+
+Usage:
+    python -m rag.ingestPipeline
+    python -m rag.ingestPipeline --pdf data/raw/debate_rules.pdf --embed-batch-size 128 --write-batch-size 512
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, Iterable, Iterator, Optional
+
+from rag.chunker import CHUNK_SIZE, CHUNK_OVERLAP, DEFAULT_CHUNKS_PATH, document_id, iter_chunks
+from rag.documentLoader import DEFAULT_PAGES_PATH, iter_pdf_pages
+from rag.jsonlIO import tee_jsonl
+from rag.manifest import DEFAULT_SOURCE_PDF, load_manifest, sha256_file, store_matches, sync_chunk_stream
+
+
+class ThroughputMeter:
+    """Counts pages, chunks and vectors and reports their rates."""
+
+    def __init__(self, report_every: float = 5.0):
+        self.started = time.perf_counter()
+        self.report_every = report_every
+        self._last_report = self.started
+        self.pages = 0
+        self.chunks = 0
+        self.vectors = 0
+
+    def count_pages(self, pages: Iterable[Dict]) -> Iterator[Dict]:
+        for page in pages:
+            self.pages += 1
+            yield page
+
+    def count_chunks(self, chunks: Iterable[Dict]) -> Iterator[Dict]:
+        for chunk in chunks:
+            self.chunks += 1
+            yield chunk
+
+    def on_batch(self, chunks_seen: int, vectors_written: int) -> None:
+        self.vectors = vectors_written
+        now = time.perf_counter()
+        if now - self._last_report >= self.report_every:
+            self._last_report = now
+            print(f"[INGEST] {self.line()}")
+
+    def rates(self) -> Dict[str, float]:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "seconds": round(elapsed, 2),
+            "pages": self.pages,
+            "chunks": self.chunks,
+            "vectors": self.vectors,
+            "pages_per_second": round(self.pages / elapsed, 1),
+            "chunks_per_second": round(self.chunks / elapsed, 1),
+            "vectors_per_second": round(self.vectors / elapsed, 1),
+        }
+
+    def line(self) -> str:
+        r = self.rates()
+        return (f"{r['pages']} pages ({r['pages_per_second']}/s), "
+                f"{r['chunks']} chunks ({r['chunks_per_second']}/s), "
+                f"{r['vectors']} vectors ({r['vectors_per_second']}/s) in {r['seconds']}s")
+
+
+def run_pipeline(
+    pdf_path: str = DEFAULT_SOURCE_PDF,
+    pages_path: str = DEFAULT_PAGES_PATH,
+    chunks_path: str = DEFAULT_CHUNKS_PATH,
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+    embed_batch_size: Optional[int] = None,
+    write_batch_size: int = 256,
+    store=None,
+    force: bool = False,
+    meter: Optional[ThroughputMeter] = None,
+) -> Dict[str, float]:
+    """
+    Run the whole ingestion as one stream.
+
+    Args:
+        pdf_path: source PDF
+        pages_path: JSONL file the extracted pages are written to
+        chunks_path: JSONL file the chunks are written to
+        chunk_size, overlap: chunker parameters
+        embed_batch_size: texts per embedding model forward pass
+        write_batch_size: chunks embedded and written per store write
+        store: DebateVectorStore; defaults to rag.retrieval.init_or_get_store()
+        force: rebuild the whole collection
+        meter: optional ThroughputMeter (a new one is created otherwise)
+
+    Returns:
+        dict: upserted/deleted/unchanged counts plus throughput figures
+    """
+    if store is None:
+        from rag.retrieval import init_or_get_store
+        store = init_or_get_store()
+
+    meter = meter or ThroughputMeter()
+    chunker = {"chunk_size": chunk_size, "overlap": overlap}
+
+    # Unchanged source: skip extraction altogether
+    manifest = load_manifest(store)
+    if (
+        not force
+        and manifest.get("source_pdf") == pdf_path
+        and manifest.get("chunker") == chunker
+        and manifest.get("chunks_file") == chunks_path
+        and os.path.exists(pages_path)
+        and manifest.get("source_sha256") == sha256_file(pdf_path)
+        and store_matches(store, manifest, sha256_file(chunks_path))
+    ):
+        unchanged = len(manifest.get("chunks", {}))
+        return {"upserted": 0, "deleted": 0, "unchanged": unchanged, **meter.rates()}
+
+    pages = meter.count_pages(tee_jsonl(iter_pdf_pages(pdf_path), pages_path))
+    page_texts = (page["text"] for page in pages)
+    chunks = tee_jsonl(
+        meter.count_chunks(iter_chunks(page_texts, chunk_size=chunk_size, overlap=overlap,
+                                       doc_id=document_id(pdf_path))),
+        chunks_path,
+    )
+
+    stats = sync_chunk_stream(
+        store,
+        chunks,
+        chunks_path=chunks_path,
+        source_pdf_path=pdf_path,
+        force=force,
+        batch_size=write_batch_size,
+        embed_batch_size=embed_batch_size,
+        chunker=chunker,
+        on_batch=meter.on_batch,
+    )
+
+    return {**stats, **meter.rates()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream the rules PDF into the vector store")
+    parser.add_argument("--pdf", type=str, default=DEFAULT_SOURCE_PDF, help="Source PDF")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Characters per chunk")
+    parser.add_argument("--overlap", type=int, default=CHUNK_OVERLAP, help="Characters shared by consecutive chunks")
+    parser.add_argument("--embed-batch-size", type=int, default=None,
+                        help="Texts per embedding forward pass (default: EMBEDDING_BATCH_SIZE)")
+    parser.add_argument("--write-batch-size", type=int, default=256, help="Chunks per store write")
+    parser.add_argument("--backend", type=str, default=None, help="Vector backend (chroma or numpy)")
+    parser.add_argument("--force", action="store_true", help="Rebuild the whole collection")
+    args = parser.parse_args(argv)
+
+    from rag.retrieval import init_or_get_store
+
+    result = run_pipeline(
+        pdf_path=args.pdf,
+        chunk_size=args.chunk_size,
+        overlap=args.overlap,
+        embed_batch_size=args.embed_batch_size,
+        write_batch_size=args.write_batch_size,
+        store=init_or_get_store(backend=args.backend),
+        force=args.force,
+    )
+
+    print(f"[INGEST] done: {result['upserted']} upserted, {result['deleted']} deleted, "
+          f"{result['unchanged']} unchanged")
+    print(f"[INGEST] {result['pages']} pages ({result['pages_per_second']}/s), "
+          f"{result['chunks']} chunks ({result['chunks_per_second']}/s), "
+          f"{result['vectors']} vectors ({result['vectors_per_second']}/s) in {result['seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Small JSONL helpers for the streaming ingestion pipeline.
+Records are read and written one line at a time, so memory use does not
+grow with the size of the file.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield one record per non-empty line."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def tee_jsonl(records: Iterable[Dict[str, Any]], path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Pass records through unchanged while writing each one to `path`.
+    The file is written to a temp name and swapped in once the stream is
+    exhausted, so an interrupted run never leaves a truncated file behind.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            yield record
+    os.replace(tmp, path)
+
+
+def iter_batches(records: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Group a stream into lists of at most batch_size items."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
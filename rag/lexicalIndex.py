@@ -0,0 +1,198 @@
+"""
+BM25 inverted index kept next to the vectors of a collection.
+
+DebateVectorStore updates it on every write, so it is built during
+ingestion with no extra pass. Only term frequencies are kept (chunk texts
+live in the vector backend, which search results are filled from), so
+memory grows with the number of distinct terms per chunk, not with the
+text. The index is persisted as an append-only log,
+`{collection}.bm25.jsonl`: each save appends the chunks upserted or
+deleted since the last one, and the log is rewritten only when it has
+grown to COMPACT_RATIO times the live chunk count. The postings are
+rebuilt in memory when the log is replayed on load.
+
+Exact rule names ("ad hominem", "burden of proof") are found by term match
+without running the embedding model, and rank_fusion() combines the BM25
+and dense rankings with reciprocal rank fusion.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in",
+    "into", "is", "it", "its", "of", "on", "or", "that", "the", "their", "this",
+    "to", "was", "were", "which", "with",
+}
+
+# Reciprocal rank fusion constant (Cormack et al. use 60)
+RRF_K = 60
+
+# The log is rewritten once it holds this many entries per live chunk
+COMPACT_RATIO = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased alphanumeric terms without stopwords ("ad-hominem" -> ["ad", "hominem"])."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over chunk texts, with incremental upsert/delete."""
+
+    def __init__(self, path: str, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+
+        self.doc_terms: Dict[str, Dict[str, int]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+
+        self._pending: Dict[str, Optional[Dict[str, int]]] = {}  # changes since the last save; None = deleted
+        self._log_entries = 0
+        self._load()
+
+    # ----------------------------------------------------------------------
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # an append cut short by a crash; the manifest check refills what is missing
+                        print(f"[RAG WARNING] skipping a damaged entry in {self.path}")
+                        continue
+                    self._remove(entry["id"])
+                    if entry.get("terms") is not None:
+                        self._add(entry["id"], entry["terms"])
+                    self._log_entries += 1
+        except OSError:
+            print(f"[RAG WARNING] unreadable BM25 index {self.path}; it will be rebuilt")
+
+    def save(self) -> None:
+        """Append the changes since the last save, or rewrite the log once it has grown too long."""
+        if not self._pending:
+            return
+
+        if self._log_entries + len(self._pending) > COMPACT_RATIO * max(self.count(), 1):
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for doc_id, terms in self.doc_terms.items():
+                    f.write(json.dumps({"id": doc_id, "terms": terms}, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+            self._log_entries = self.count()
+        else:
+            with open(self.path, "a", encoding="utf-8") as f:
+                for doc_id, terms in self._pending.items():
+                    f.write(json.dumps({"id": doc_id, "terms": terms}, ensure_ascii=False) + "\n")
+            self._log_entries += len(self._pending)
+        self._pending.clear()
+
+    # ----------------------------------------------------------------------
+    def _add(self, doc_id: str, terms: Dict[str, int]) -> None:
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = sum(terms.values())
+        self.total_length += self.doc_lengths[doc_id]
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+
+    def _remove(self, doc_id: str) -> None:
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+
+    def upsert(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        for doc_id, text in zip(ids, texts):
+            terms = dict(Counter(tokenize(text)))
+            self._remove(doc_id)
+            self._add(doc_id, terms)
+            self._pending[doc_id] = terms
+
+    def delete(self, ids: Sequence[str]) -> None:
+        for doc_id in ids:
+            if doc_id in self.doc_terms:
+                self._remove(doc_id)
+                self._pending[doc_id] = None
+
+    def clear(self) -> None:
+        self.doc_terms.clear()
+        self.doc_lengths.clear()
+        self.postings.clear()
+        self.total_length = 0
+        self._pending.clear()
+        self._log_entries = 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def count(self) -> int:
+        return len(self.doc_terms)
+
+    # ----------------------------------------------------------------------
+    def search(self, query_text: str, n_results: int = 5) -> List[Dict[str, Any]]:
+        """
+        Top-n chunks by BM25 score.
+
+        Returns:
+            list of {"id", "bm25"} dicts, best first; empty if no term matches
+        """
+        n_docs = len(self.doc_terms)
+        if not n_docs:
+            return []
+
+        avg_length = self.total_length / n_docs
+        scores: Dict[str, float] = {}
+
+        for term in set(tokenize(query_text)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1.0 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                norm = tf + self.k1 * (1.0 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1.0) / norm
+
+        best = heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+        return [{"id": doc_id, "bm25": score} for doc_id, score in best]
+
+
+def rank_fusion(rankings: List[List[Dict[str, Any]]], n_results: int, k: int = RRF_K) -> List[Dict[str, Any]]:
+    """
+    Reciprocal rank fusion of several best-first result lists.
+
+    Each result gets "rrf" = sum of 1 / (k + rank) over the lists it appears
+    in, and "distance" = 1 - rrf / (n / (k + 1)), where n is the number of
+    non-empty lists fused. A chunk ranked first by every list has distance 0
+    whether it came from BM25 alone (the lexical fast path) or from BM25 and
+    dense search together, so merge_results() can order both kinds side by side.
+    """
+    fused: Dict[str, Dict[str, Any]] = {}
+    for results in rankings:
+        for rank, item in enumerate(results, start=1):
+            entry = fused.setdefault(item["id"], {"id": item["id"], "text": item["text"], "rrf": 0.0})
+            entry["rrf"] += 1.0 / (k + rank)
+
+    best_possible = max(1, sum(1 for results in rankings if results)) / (k + 1)
+    ranked = sorted(fused.values(), key=lambda item: item["rrf"], reverse=True)[:n_results]
+    for item in ranked:
+        item["distance"] = max(0.0, 1.0 - item["rrf"] / best_possible)
+    return ranked
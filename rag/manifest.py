@@ -0,0 +1,255 @@
+"""
+Ingestion manifest for the vector store.
+
+The manifest records what the collection was built from:
+  - source PDF path and SHA-256
+  - chunker parameters
+  - embedding model and backend
+  - SHA-256 of the chunks file and of every chunk's text
+
+sync_store() compares the manifest with the current chunks file and only
+re-embeds chunks whose text changed, deletes chunks that disappeared, and
+rebuilds everything only when the embedding model or backend changed.
+The BM25 index (rag/lexicalIndex.py) is refilled from the chunks if it is
+missing, without re-embedding anything.
+When nothing changed it returns after hashing one file, without touching
+the embedding model.
+
+sync_chunk_stream() does the same diff on a stream of chunks (e.g. straight
+from the chunker), embedding and writing changed chunks in fixed-size
+batches so memory stays bounded for large corpora.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rag.chunker import CHUNK_SIZE, CHUNK_OVERLAP, iter_chunks_from_file, default_chunks_path
+from rag.jsonlIO import iter_batches
+
+DEFAULT_SOURCE_PDF = os.path.join("data", "raw", "debate_rules.pdf")
+
+# Fields sync_chunk_stream always writes; anything else in a manifest came in through `extra`
+MANIFEST_FIELDS = ("source_pdf", "source_sha256", "chunker", "embedding_model", "backend",
+                   "chunks_file", "chunks_sha256", "chunks")
+
+
+def sha256_file(path: str) -> Optional[str]:
+    """Hash a file in blocks; None if it does not exist (or is a directory)."""
+    if not os.path.isfile(path):
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def manifest_path(store) -> str:
+    return os.path.join(store.persist_directory, f"{store.collection_name}.manifest.json")
+
+
+def load_manifest(store) -> Dict[str, Any]:
+    path = manifest_path(store)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(store, manifest: Dict[str, Any]) -> None:
+    path = manifest_path(store)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+
+
+def store_matches(store, manifest: Dict[str, Any], chunks_sha: Optional[str]) -> bool:
+    """
+    Is the store exactly what the manifest describes, built from a chunks
+    file with this hash, with the same model and backend, and with every
+    chunk in both the vector and the BM25 index?
+    """
+    return (
+        manifest.get("embedding_model") == store.embedding_model
+        and manifest.get("backend") == store.backend_name
+        and chunks_sha is not None
+        and manifest.get("chunks_sha256") == chunks_sha
+        and store.count() == len(manifest.get("chunks", {}))
+        and store.lexical.count() == store.count()
+    )
+
+
+def sync_store(
+    store,
+    chunks_json_path: Optional[str] = None,
+    source_pdf_path: Optional[str] = None,
+    force: bool = False,
+    batch_size: int = 256,
+    embed_batch_size: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Bring the store in line with the chunks file using the manifest.
+
+    When the chunks file is the one the manifest was built from, a resync
+    keeps what that build recorded (source, chunker parameters and extra
+    fields such as a corpus run's "documents"), so it does not force the
+    next build to start over.
+
+    Args:
+        store: DebateVectorStore instance
+        chunks_json_path: path to chunks.jsonl (or legacy chunks.json); defaults to the
+            file recorded in the manifest (e.g. a corpus build), then default_chunks_path()
+        source_pdf_path: PDF the chunks were built from (recorded for provenance); defaults
+            to the source recorded in the manifest, then DEFAULT_SOURCE_PDF
+        force: rebuild the whole collection
+        batch_size: chunks embedded and written per store write
+        embed_batch_size: texts per embedding model forward pass (default: EMBEDDING_BATCH_SIZE)
+
+    Returns:
+        dict: counts of upserted, deleted and unchanged chunks
+    """
+    manifest = load_manifest(store)
+
+    if chunks_json_path is None:
+        recorded = manifest.get("chunks_file")
+        chunks_json_path = recorded if recorded and os.path.exists(recorded) else default_chunks_path()
+    if not os.path.exists(chunks_json_path):
+        raise FileNotFoundError(f"Chunks file not found: {chunks_json_path}")
+
+    same_file = manifest.get("chunks_file") == chunks_json_path
+    if source_pdf_path is None:
+        source_pdf_path = (manifest.get("source_pdf") if same_file else None) or DEFAULT_SOURCE_PDF
+
+    chunks_sha = sha256_file(chunks_json_path)
+    source_sha = sha256_file(source_pdf_path)
+
+    # Fast path: chunks file and setup unchanged since the last sync
+    if not force and store_matches(store, manifest, chunks_sha):
+        if source_sha and manifest.get("source_sha256") not in (None, source_sha):
+            print(f"[RAG WARNING] {source_pdf_path} changed since ingestion; "
+                  f"re-run documentLoader.py and chunker.py to refresh the chunks")
+        return {"upserted": 0, "deleted": 0, "unchanged": len(manifest.get("chunks", {}))}
+
+    return sync_chunk_stream(
+        store,
+        iter_chunks_from_file(chunks_json_path),
+        chunks_path=chunks_json_path,
+        source_pdf_path=source_pdf_path,
+        force=force,
+        batch_size=batch_size,
+        embed_batch_size=embed_batch_size,
+        chunker=manifest.get("chunker") if same_file else None,
+        extra={k: v for k, v in manifest.items() if k not in MANIFEST_FIELDS} if same_file else None,
+    )
+
+
+def sync_chunk_stream(
+    store,
+    chunks: Iterable[Dict[str, str]],
+    chunks_path: str,
+    source_pdf_path: str = DEFAULT_SOURCE_PDF,
+    force: bool = False,
+    batch_size: int = 256,
+    embed_batch_size: Optional[int] = None,
+    chunker: Optional[Dict[str, int]] = None,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+    embed_batches: Optional[Callable[[Iterable[List[Dict[str, str]]]], Iterator[Tuple[List[Dict[str, str]], Any]]]] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, int]:
+    """
+    Diff a stream of chunks against the manifest and write only what changed.
+
+    Chunks are consumed lazily: changed ones are embedded and upserted in
+    batches of batch_size, so at most one batch is held in memory. If the
+    stream writes chunks_path as it goes (see jsonlIO.tee_jsonl), the file
+    hash is taken once the stream is exhausted.
+
+    Args:
+        store: DebateVectorStore instance
+        chunks: iterable of {"id", "text"} dicts
+        chunks_path: chunks file the stream comes from (recorded in the manifest)
+        source_pdf_path: PDF the chunks were built from
+        force: rebuild the whole collection
+        batch_size: chunks embedded and written per store write
+        embed_batch_size: texts per embedding model forward pass (default: EMBEDDING_BATCH_SIZE)
+        chunker: chunker parameters to record; defaults to CHUNK_SIZE/CHUNK_OVERLAP
+        on_batch: called as on_batch(chunks_seen, chunks_written) after every write
+        embed_batches: maps the stream of write batches to (batch, embeddings) pairs,
+            e.g. to embed them in worker processes; by default the store embeds each batch
+        extra: additional fields recorded in the manifest
+
+    Returns:
+        dict: counts of upserted, deleted and unchanged chunks
+    """
+    manifest = load_manifest(store)
+    same_setup = (
+        manifest.get("embedding_model") == store.embedding_model
+        and manifest.get("backend") == store.backend_name
+    )
+
+    if force or not same_setup or store.count() != len(manifest.get("chunks", {})):
+        # different model/backend or an out-of-sync collection: start over
+        store.reset()
+        old_hashes = {}
+    else:
+        old_hashes = manifest.get("chunks", {})
+
+    # BM25 index missing or out of step (e.g. built before it existed): refill it
+    # from the stream, without re-embedding unchanged chunks
+    rebuild_lexical = store.lexical.count() != store.count()
+    if rebuild_lexical:
+        store.lexical.clear()
+
+    new_hashes: Dict[str, str] = {}
+
+    def changed_chunks():
+        for chunk in chunks:
+            digest = sha256_text(chunk["text"])
+            new_hashes[chunk["id"]] = digest
+            if old_hashes.get(chunk["id"]) != digest:
+                yield chunk
+            elif rebuild_lexical:
+                store.lexical.upsert([chunk["id"]], [chunk["text"]])
+
+    batches = iter_batches(changed_chunks(), batch_size)
+    embedded = embed_batches(batches) if embed_batches else ((batch, None) for batch in batches)
+
+    upserted = 0
+    with store.bulk_write():
+        for batch, embeddings in embedded:
+            store.upsert_chunks(batch, batch_size=embed_batch_size, embeddings=embeddings)
+            upserted += len(batch)
+            if on_batch:
+                on_batch(len(new_hashes), upserted)
+
+    removed = [chunk_id for chunk_id in old_hashes if chunk_id not in new_hashes]
+    store.delete_chunks(removed)
+
+    save_manifest(store, {
+        "source_pdf": source_pdf_path,
+        "source_sha256": sha256_file(source_pdf_path),
+        "chunker": chunker or {"chunk_size": CHUNK_SIZE, "overlap": CHUNK_OVERLAP},
+        "embedding_model": store.embedding_model,
+        "backend": store.backend_name,
+        "chunks_file": chunks_path,
+        "chunks_sha256": sha256_file(chunks_path),
+        "chunks": new_hashes,
+        **(extra or {}),
+    })
+
+    return {
+        "upserted": upserted,
+        "deleted": len(removed),
+        "unchanged": len(new_hashes) - upserted,
+    }
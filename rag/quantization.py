@@ -0,0 +1,86 @@
+"""
+Compact codes for normalized embeddings, used by the NumPy backend for a
+fast first-pass scan before exact rescoring:
+
+  - "int8":   one signed byte per dimension plus a float32 scale per row
+              (about 4x smaller than float32)
+  - "binary": one bit per dimension, the sign of each component
+              (32x smaller); compared by Hamming distance
+
+The float32 matrix stays on disk (memory-mapped); only the rows of the
+first-pass candidates are read back to rescore them exactly.
+"""
+
+from typing import Dict
+
+import numpy as np
+
+QUANTIZATIONS = ["none", "int8", "binary"]
+
+# Candidates rescored per requested result; sign bits lose more ranking
+# information than int8, so binary needs a longer shortlist
+DEFAULT_RESCORE_FACTORS = {"none": 1, "int8": 4, "binary": 40}
+
+# Rows converted at a time when scanning int8 codes
+SCAN_BLOCK_ROWS = 16384
+
+# popcount of every byte value (fallback for NumPy < 2.0)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def quantize_int8(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Symmetric per-row int8 codes: row ~= codes * scale."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    scales = np.abs(matrix).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return {"codes": codes, "scales": scales.astype(np.float32)}
+
+
+def quantize_binary(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """Sign bits packed 8 per byte."""
+    return {"codes": np.packbits(np.asarray(matrix) > 0, axis=1)}
+
+
+def quantize(matrix: np.ndarray, method: str) -> Dict[str, np.ndarray]:
+    if method == "int8":
+        return quantize_int8(matrix)
+    if method == "binary":
+        return quantize_binary(matrix)
+    raise ValueError(f"Unknown quantization '{method}', expected one of {QUANTIZATIONS}")
+
+
+def int8_scores(codes: np.ndarray, scales: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """Approximate (N, Q) dot products between int8 rows and float32 queries."""
+    scores = np.empty((len(codes), len(queries)), dtype=np.float32)
+    for start in range(0, len(codes), SCAN_BLOCK_ROWS):
+        block = codes[start:start + SCAN_BLOCK_ROWS].astype(np.float32)
+        scores[start:start + len(block)] = block @ queries.T
+    return scores * scales[:, None]
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _POPCOUNT[values]
+
+
+def hamming_scores(codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """(N, Q) similarity = -(Hamming distance) between packed sign bits."""
+    query_bits = np.packbits(np.asarray(queries) > 0, axis=1)
+    scores = np.empty((len(codes), len(queries)), dtype=np.float32)
+    for q, bits in enumerate(query_bits):
+        scores[:, q] = -popcount(np.bitwise_xor(codes, bits)).sum(axis=1, dtype=np.int32)
+    return scores
+
+
+def approximate_scores(codes: Dict[str, np.ndarray], method: str, queries: np.ndarray) -> np.ndarray:
+    """First-pass (N, Q) scores; higher is more similar."""
+    if method == "int8":
+        return int8_scores(codes["codes"], codes["scales"], queries)
+    return hamming_scores(codes["codes"], queries)
+
+
+def code_bytes(codes: Dict[str, np.ndarray]) -> int:
+    """Memory held by a set of codes."""
+    return sum(array.nbytes for array in codes.values())
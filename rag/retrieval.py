@@ -4,33 +4,40 @@ retrieval.py
 High-level retrieval helpers that wrap DebateVectorStore for the Judge (and Critic).
 Provide functions to:
  - initialize/load the vector store
- - ingest chunks (if needed)
+ - sync chunks into the store (once per process, via the manifest)
  - retrieve top-k relevant chunks for a query or list of queries
 """
 
 from typing import List, Dict, Any, Optional
-import os
+import threading
 
+from rag.manifest import sync_store
 from rag.vectorStore import DebateVectorStore
 
 
 # Keep a module-level cache so we don't re-create the client repeatedly.
 _STORE_CACHE: Optional[DebateVectorStore] = None
 
+# Ingestion is checked against the manifest once per process
+_INGEST_CHECKED = False
+_INGEST_LOCK = threading.Lock()
+
 
 def init_or_get_store(
     persist_directory: str = "data/processed/vectorstore",
     collection_name: str = "debate_rules_chunks",
     embedding_model: str = "all-MiniLM-L6-v2",
+    backend: Optional[str] = None,
 ) -> DebateVectorStore:
     """
     Initialize and return a DebateVectorStore instance. Uses a module-level cache
     so repeated calls return the same instance.
 
     Args:
-        persist_directory: directory where chroma persists data
-        collection_name: chroma collection name
+        persist_directory: directory where the backend persists data
+        collection_name: collection name
         embedding_model: sentence-transformers model name used internally
+        backend: "chroma" or "numpy"; defaults to the VECTOR_BACKEND env variable
 
     Returns:
         DebateVectorStore: initialized vector store wrapper
@@ -41,39 +48,36 @@ def init_or_get_store(
             persist_directory=persist_directory,
             collection_name=collection_name,
             embedding_model=embedding_model,
+            backend=backend,
         )
     return _STORE_CACHE
 
 
 def ingest_chunks_if_needed(
     store: DebateVectorStore,
-    chunks_json_path: str = "data/processed/chunks.json",
+    chunks_json_path: Optional[str] = None,
     force: bool = False,
 ) -> None:
     """
-    Load chunks from a JSON file and add them to the store if the collection appears empty
-    or if force=True. This is a convenient helper for notebooks and scripts.
+    Sync the store with the chunks file using the ingestion manifest
+    (see rag/manifest.py). The check runs once per process; later calls
+    return immediately unless force=True.
 
     Args:
         store: DebateVectorStore instance
-        chunks_json_path: path to precomputed chunks.json
-        force: if True, always (re)ingest chunks
+        chunks_json_path: path to chunks.jsonl; defaults to rag.chunker.default_chunks_path()
+        force: if True, always rebuild the collection
     """
-    # Very small heuristic: if collection is empty (no ids) or force is set, ingest.
-    try:
-        # Try a lightweight query to check existence. If there are no items,
-        # collection.query may return empty lists.
-        existing = store.query("test", n_results=1)
-        should_ingest = force or (len(existing) == 0)
-    except Exception:
-        # If anything goes wrong (e.g., empty DB), set to ingest
-        should_ingest = True
-
-    if should_ingest:
-        if not os.path.exists(chunks_json_path):
-            raise FileNotFoundError(f"Chunks JSON not found: {chunks_json_path}")
-        chunks = store.load_chunks_from_json(chunks_json_path)
-        store.add_chunks(chunks)
+    global _INGEST_CHECKED
+    with _INGEST_LOCK:
+        if _INGEST_CHECKED and not force:
+            return
+
+        stats = sync_store(store, chunks_json_path=chunks_json_path, force=force)
+        if stats["upserted"] or stats["deleted"]:
+            print(f"[RAG] ingested {stats['upserted']} chunks, removed {stats['deleted']}")
+
+        _INGEST_CHECKED = True
 
 
 def retrieve_relevant_rules(query_text: str, top_k: int = 5) -> List[Dict[str, Any]]:
@@ -89,7 +93,7 @@ def retrieve_relevant_rules(query_text: str, top_k: int = 5) -> List[Dict[str, A
     """
     store = init_or_get_store()
     # Ensure data exists; don't force re-ingest by default.
-    ingest_chunks_if_needed(store, chunks_json_path="data/processed/chunks.json", force=False)
+    ingest_chunks_if_needed(store, force=False)
     return store.query(query_text, n_results=top_k)
 
 
@@ -98,6 +102,7 @@ def batch_retrieve_for_arguments(
 ) -> List[List[Dict[str, Any]]]:
     """
     For a list of argument texts, retrieve top_k relevant chunks for each one.
+    All texts are embedded in one batch and searched in one index call.
 
     Args:
         texts: list of strings (e.g., supporter argument texts)
@@ -108,10 +113,50 @@ def batch_retrieve_for_arguments(
         is a list of retrieved chunk dicts for that text.
     """
     store = init_or_get_store()
-    ingest_chunks_if_needed(store, chunks_json_path="data/processed/chunks.json", force=False)
+    ingest_chunks_if_needed(store, force=False)
+
+    return store.query_many(texts, n_results=top_k)
+
+
+def merge_results(
+    grouped_results: List[List[Dict[str, Any]]], limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Merge several result lists into one, keeping each chunk once with its
+    best (smallest) distance, ordered from most to least relevant.
+
+    Args:
+        grouped_results: result lists, e.g. from batch_retrieve_for_arguments
+        limit: maximum number of chunks to return
+
+    Returns:
+        List[Dict[str, Any]]: deduplicated chunk dicts
+    """
+    best: Dict[str, Dict[str, Any]] = {}
+    for results in grouped_results:
+        for item in results:
+            current = best.get(item["id"])
+            if current is None or item["distance"] < current["distance"]:
+                best[item["id"]] = item
+
+    merged = sorted(best.values(), key=lambda item: item["distance"])
+    return merged[:limit] if limit else merged
+
+
+def retrieve_rules_for_arguments(
+    texts: List[str], top_k: int = 2, limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Retrieve rules for many arguments in one round trip and merge them.
+
+    Args:
+        texts: argument texts
+        top_k: chunks retrieved per text
+        limit: maximum number of merged chunks
 
-    grouped_results: List[List[Dict[str, Any]]] = []
-    for t in texts:
-        snippets = store.query(t, n_results=top_k)
-        grouped_results.append(snippets)
-    return grouped_results
+    Returns:
+        List[Dict[str, Any]]: deduplicated chunk dicts
+    """
+    if not texts:
+        return []
+    return merge_results(batch_retrieve_for_arguments(texts, top_k=top_k), limit=limit)
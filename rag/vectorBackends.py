@@ -0,0 +1,416 @@
+"""
+Storage backends behind DebateVectorStore.
+
+Both backends receive precomputed, L2-normalized embeddings and return
+results as dicts with keys: id, text, distance.
+
+- ChromaBackend: ChromaDB PersistentClient collection (original backend)
+- NumpyBackend: normalized embeddings in a memory-mapped .npy file plus a
+  JSONL file of ids/texts; exact top-k with one matrix-vector product.
+  Needs no database, and a corpus of a few hundred chunks is searched in
+  well under a millisecond.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from rag.quantization import DEFAULT_RESCORE_FACTORS, QUANTIZATIONS, approximate_scores, quantize
+
+BACKENDS = ["chroma", "numpy"]
+
+# Rows copied at a time when the NumPy index is rebuilt after a bulk write
+COPY_BLOCK_ROWS = 8192
+
+
+class VectorBackend(ABC):
+    """Interface every storage backend implements."""
+
+    @abstractmethod
+    def add(self, ids: List[str], texts: List[str], embeddings: np.ndarray) -> None:
+        """Add chunks with their precomputed embeddings."""
+
+    @abstractmethod
+    def upsert(self, ids: List[str], texts: List[str], embeddings: np.ndarray) -> None:
+        """Insert chunks, overwriting any with the same id."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Remove chunks by id; unknown ids are ignored."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every chunk."""
+
+    def begin_bulk(self) -> None:
+        """Start a series of writes; a backend may defer expensive work until end_bulk."""
+
+    def end_bulk(self) -> None:
+        """Finish the writes started by begin_bulk."""
+
+    def search(self, query_embedding: np.ndarray, n_results: int) -> List[Dict[str, Any]]:
+        return self.search_many(np.asarray(query_embedding)[None, :], n_results)[0]
+
+    @abstractmethod
+    def search_many(self, query_embeddings: np.ndarray, n_results: int) -> List[List[Dict[str, Any]]]:
+        """One index call for a (Q, dim) batch; one result list per query."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored chunks."""
+
+    @abstractmethod
+    def get_texts(self, ids: List[str]) -> Dict[str, str]:
+        """{id: text} of the stored chunks among ids."""
+
+
+# ----------------------------------------------------------------------
+class ChromaBackend(VectorBackend):
+    """
+    ChromaDB collection. New collections use cosine distance; collections
+    created by older versions keep their original (L2) space.
+    """
+
+    def __init__(self, persist_directory: str, collection_name: str):
+        from chromadb import PersistentClient
+
+        self.collection_name = collection_name
+        self.client = PersistentClient(path=persist_directory)
+        self._open_collection()
+
+    def _open_collection(self) -> None:
+        self.collection = self.client.get_or_create_collection(
+            name=self.collection_name,
+            metadata={"hnsw:space": "cosine"},
+            embedding_function=None,
+        )
+
+    def add(self, ids, texts, embeddings):
+        self.collection.add(
+            ids=list(ids),
+            documents=list(texts),
+            embeddings=np.asarray(embeddings).tolist(),
+        )
+
+    def upsert(self, ids, texts, embeddings):
+        self.collection.upsert(
+            ids=list(ids),
+            documents=list(texts),
+            embeddings=np.asarray(embeddings).tolist(),
+        )
+
+    def delete(self, ids):
+        if ids:
+            self.collection.delete(ids=list(ids))
+
+    def clear(self):
+        self.client.delete_collection(self.collection_name)
+        self._open_collection()
+
+    def search_many(self, query_embeddings, n_results):
+        results = self.collection.query(
+            query_embeddings=np.asarray(query_embeddings).tolist(),
+            n_results=n_results,
+        )
+
+        grouped = []
+        for q in range(len(results["ids"])):
+            retrieved = []
+            for i in range(len(results["ids"][q])):
+                retrieved.append({
+                    "id": results["ids"][q][i],
+                    "text": results["documents"][q][i],
+                    "distance": results["distances"][q][i]
+                })
+            grouped.append(retrieved)
+        return grouped
+
+    def count(self):
+        return self.collection.count()
+
+    def get_texts(self, ids):
+        if not ids:
+            return {}
+        results = self.collection.get(ids=list(ids), include=["documents"])
+        return dict(zip(results["ids"], results["documents"]))
+
+
+# ----------------------------------------------------------------------
+class NumpyBackend(VectorBackend):
+    """
+    Exact in-memory index over a memory-mapped matrix of normalized embeddings.
+    Distance is cosine distance (1 - cosine similarity).
+
+    Between begin_bulk() and end_bulk(), new rows are appended to a raw
+    sidecar file and existing rows are updated in place, and the .npy file
+    is rebuilt once at the end by copying blocks, so streaming ingestion
+    does not rewrite (or hold) the whole matrix for every batch.
+
+    With quantization "int8" or "binary", compact codes of every row are
+    kept in memory (`{collection}.q-<method>.npz`) and searched first; the
+    top n_results * rescore_factor candidates are then rescored with the
+    float32 rows, which are only read from the memory-mapped file.
+    """
+
+    def __init__(self, persist_directory: str, collection_name: str,
+                 quantization: str = "none", rescore_factor: Optional[int] = None):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization '{quantization}', expected one of {QUANTIZATIONS}")
+
+        self.vectors_path = os.path.join(persist_directory, f"{collection_name}.npy")
+        self.meta_path = os.path.join(persist_directory, f"{collection_name}.jsonl")
+        self.codes_path = os.path.join(persist_directory, f"{collection_name}.q-{quantization}.npz")
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor or DEFAULT_RESCORE_FACTORS[quantization]
+
+        self.ids: List[str] = []
+        self.texts: List[str] = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.codes: Optional[Dict[str, np.ndarray]] = None
+        self._rows: Optional[Dict[str, int]] = None  # id -> row, rebuilt after rows move
+        self._bulk_file = None
+        self._load()
+
+    def _load(self) -> None:
+        if not (os.path.exists(self.vectors_path) and os.path.exists(self.meta_path)):
+            return
+
+        self.matrix = np.load(self.vectors_path, mmap_mode="r")
+        with open(self.meta_path, "r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        self.ids = [row["id"] for row in rows]
+        self.texts = [row["text"] for row in rows]
+        self._rows = None
+
+        if self.quantization != "none":
+            if os.path.exists(self.codes_path):
+                with np.load(self.codes_path) as data:
+                    self.codes = {key: data[key] for key in data.files}
+            if self.codes is None or len(self.codes["codes"]) != len(self.ids):
+                self._refresh_codes()
+
+    def _refresh_codes(self) -> None:
+        """Re-quantize the matrix (in blocks) after it changed."""
+        if self.quantization == "none":
+            return
+        if not self.ids:
+            self.codes = None
+            if os.path.exists(self.codes_path):
+                os.remove(self.codes_path)
+            return
+
+        blocks = [
+            quantize(self.matrix[start:start + COPY_BLOCK_ROWS], self.quantization)
+            for start in range(0, len(self.ids), COPY_BLOCK_ROWS)
+        ]
+        self.codes = {key: np.concatenate([block[key] for block in blocks]) for key in blocks[0]}
+
+        tmp = self.codes_path + ".tmp.npz"
+        np.savez(tmp, **self.codes)
+        os.replace(tmp, self.codes_path)
+
+    def _write_meta(self) -> str:
+        tmp_meta = self.meta_path + ".tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            for chunk_id, text in zip(self.ids, self.texts):
+                f.write(json.dumps({"id": chunk_id, "text": text}, ensure_ascii=False) + "\n")
+        return tmp_meta
+
+    def _save(self, matrix: np.ndarray) -> None:
+        # write to temp files and swap them in, so readers never see a partial index
+        tmp_vectors = self.vectors_path + ".tmp.npy"
+
+        np.save(tmp_vectors, np.ascontiguousarray(matrix, dtype=np.float32))
+        tmp_meta = self._write_meta()
+
+        os.replace(tmp_vectors, self.vectors_path)
+        os.replace(tmp_meta, self.meta_path)
+        self.matrix = np.load(self.vectors_path, mmap_mode="r")
+        self._refresh_codes()
+
+    # ----------------------------------------------------------------------
+    def begin_bulk(self):
+        self._bulk_path = self.vectors_path + ".append.tmp"
+        self._bulk_file = open(self._bulk_path, "wb")
+        self._bulk_base = len(self.ids)       # rows already in the .npy file
+        self._bulk_rows = 0
+        self._bulk_dim = self.matrix.shape[1] if self._bulk_base else None
+        self._bulk_position = {chunk_id: i for i, chunk_id in enumerate(self.ids)}
+        self._bulk_writable = None
+
+    def _bulk_upsert(self, ids, texts, embeddings):
+        for chunk_id, text, vector in zip(ids, texts, embeddings):
+            vector = np.asarray(vector, dtype=np.float32)
+            self._bulk_dim = self._bulk_dim or vector.shape[0]
+            i = self._bulk_position.get(chunk_id)
+
+            if i is None:
+                self._bulk_position[chunk_id] = len(self.ids)
+                self.ids.append(chunk_id)
+                self.texts.append(text)
+                self._bulk_file.write(vector.tobytes())
+                self._bulk_rows += 1
+
+            elif i < self._bulk_base:
+                if self._bulk_writable is None:
+                    self._bulk_writable = np.load(self.vectors_path, mmap_mode="r+")
+                self._bulk_writable[i] = vector
+                self.texts[i] = text
+
+            else:
+                # appended earlier in this bulk write: overwrite its row in the sidecar
+                self._bulk_file.seek((i - self._bulk_base) * self._bulk_dim * 4)
+                self._bulk_file.write(vector.tobytes())
+                self._bulk_file.seek(0, os.SEEK_END)
+                self.texts[i] = text
+
+    def end_bulk(self):
+        if self._bulk_file is None:
+            return
+        self._bulk_file.close()
+        self._bulk_file = None
+
+        if self._bulk_writable is not None:
+            self._bulk_writable.flush()
+            self._bulk_writable = None
+
+        if self._bulk_rows:
+            tmp_vectors = self.vectors_path + ".tmp.npy"
+            total = len(self.ids)
+            out = np.lib.format.open_memmap(
+                tmp_vectors, mode="w+", dtype=np.float32, shape=(total, self._bulk_dim)
+            )
+            for start in range(0, self._bulk_base, COPY_BLOCK_ROWS):
+                stop = min(start + COPY_BLOCK_ROWS, self._bulk_base)
+                out[start:stop] = self.matrix[start:stop]
+
+            appended = np.memmap(self._bulk_path, dtype=np.float32, mode="r",
+                                 shape=(self._bulk_rows, self._bulk_dim))
+            for start in range(0, self._bulk_rows, COPY_BLOCK_ROWS):
+                rows = appended[start:start + COPY_BLOCK_ROWS]
+                out[self._bulk_base + start:self._bulk_base + start + len(rows)] = rows
+            out.flush()
+            del out, appended
+
+            os.replace(tmp_vectors, self.vectors_path)
+
+        os.replace(self._write_meta(), self.meta_path)
+        os.remove(self._bulk_path)
+
+        if self.ids:
+            self.matrix = np.load(self.vectors_path, mmap_mode="r")
+        self._refresh_codes()
+
+    def add(self, ids, texts, embeddings):
+        """Add chunks; an existing id is overwritten."""
+        self.upsert(ids, texts, embeddings)
+
+    def upsert(self, ids, texts, embeddings):
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(embeddings) == 0:
+            return
+        if self._bulk_file is not None:
+            return self._bulk_upsert(ids, texts, embeddings)
+        matrix = np.array(self.matrix) if len(self.ids) else np.zeros((0, embeddings.shape[1]), dtype=np.float32)
+
+        position = {chunk_id: i for i, chunk_id in enumerate(self.ids)}
+        new_rows = []
+        for chunk_id, text, vector in zip(ids, texts, embeddings):
+            if chunk_id in position:
+                matrix[position[chunk_id]] = vector
+                self.texts[position[chunk_id]] = text
+            else:
+                position[chunk_id] = len(self.ids)
+                self.ids.append(chunk_id)
+                self.texts.append(text)
+                new_rows.append(vector)
+
+        if new_rows:
+            matrix = np.vstack([matrix, np.stack(new_rows)])
+        self._save(matrix)
+
+    def delete(self, ids):
+        remove = set(ids)
+        keep = [i for i, chunk_id in enumerate(self.ids) if chunk_id not in remove]
+        if len(keep) == len(self.ids):
+            return
+
+        matrix = np.array(self.matrix)[keep]
+        self.ids = [self.ids[i] for i in keep]
+        self.texts = [self.texts[i] for i in keep]
+        self._rows = None
+        self._save(matrix)
+
+    def clear(self):
+        for path in (self.vectors_path, self.meta_path, self.codes_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.ids, self.texts = [], []
+        self._rows = None
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.codes = None
+
+    def search_many(self, query_embeddings, n_results):
+        query_embeddings = np.asarray(query_embeddings, dtype=np.float32)
+        if not self.ids or n_results <= 0:
+            return [[] for _ in range(len(query_embeddings))]
+
+        k = min(n_results, len(self.ids))
+        candidates = k * self.rescore_factor
+        if self.codes is not None and candidates < len(self.ids):
+            return self._search_quantized(query_embeddings, k, candidates)
+
+        # (N, Q) similarity matrix in a single product
+        scores = self.matrix @ query_embeddings.T
+
+        top = np.argpartition(-scores, k - 1, axis=0)[:k]
+
+        grouped = []
+        for q in range(scores.shape[1]):
+            column = scores[:, q]
+            ranked = top[:, q][np.argsort(-column[top[:, q]])]
+            grouped.append(self._results(ranked, column[ranked]))
+        return grouped
+
+    def _search_quantized(self, query_embeddings, k, candidates):
+        """Compact-code scan for candidates, then exact float32 rescoring."""
+        approx = approximate_scores(self.codes, self.quantization, query_embeddings)
+        shortlist = np.argpartition(-approx, candidates - 1, axis=0)[:candidates]
+
+        grouped = []
+        for q in range(len(query_embeddings)):
+            rows = np.sort(shortlist[:, q])  # sorted reads from the memory map
+            exact = self.matrix[rows] @ query_embeddings[q]
+            best = np.argsort(-exact)[:k]
+            grouped.append(self._results(rows[best], exact[best]))
+        return grouped
+
+    def _results(self, rows, similarities):
+        return [
+            {"id": self.ids[i], "text": self.texts[i], "distance": max(0.0, float(1.0 - score))}
+            for i, score in zip(rows, similarities)
+        ]
+
+    def count(self):
+        return len(self.ids)
+
+    def get_texts(self, ids):
+        # rows are only appended between rebuilds of the map, so a size change means new rows
+        if self._rows is None or len(self._rows) != len(self.ids):
+            self._rows = {chunk_id: i for i, chunk_id in enumerate(self.ids)}
+        return {chunk_id: self.texts[self._rows[chunk_id]] for chunk_id in ids if chunk_id in self._rows}
+
+
+def make_backend(name: str, persist_directory: str, collection_name: str,
+                 quantization: str = "none", rescore_factor: Optional[int] = None) -> VectorBackend:
+    """Build the backend selected by name ("chroma" or "numpy")."""
+    if name == "chroma":
+        if quantization != "none":
+            print(f"[RAG WARNING] quantization '{quantization}' is only supported by the numpy backend")
+        return ChromaBackend(persist_directory, collection_name)
+    if name == "numpy":
+        return NumpyBackend(persist_directory, collection_name, quantization, rescore_factor)
+    raise ValueError(f"Unknown vector backend '{name}', expected one of {BACKENDS}")
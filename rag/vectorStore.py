@@ -1,50 +1,164 @@
 """
 Builds and manages the vector database for RAG.
-Uses ChromaDB PersistentClient for local vector storage (new API).
+Embeds text with sentence-transformers (on a selectable CPU runtime: torch,
+dynamically quantized torch or ONNX, see rag/embeddings.py) and stores vectors in a pluggable
+backend (rag/vectorBackends.py):
+  - "chroma": ChromaDB PersistentClient (default)
+  - "numpy":  memory-mapped .npy matrix with exact top-k search, optionally
+              with int8 / binary codes and rescoring (VECTOR_QUANTIZATION)
+The backend is chosen with the `backend` argument or the VECTOR_BACKEND
+environment variable.
+
+Queries go through two bounded LRU caches:
+  - query embeddings, keyed by (embedding model, normalized text)
+  - top-k results, keyed by (normalized text, k, index version); any write
+    to the collection bumps the index version and empties this cache
+Sizes are set with QUERY_EMBEDDING_CACHE_SIZE and QUERY_RESULT_CACHE_SIZE.
+
+Every write also updates a BM25 index (rag/lexicalIndex.py), and queries
+run in one of these modes (RETRIEVAL_MODE, default "dense"):
+  - "dense":   embedding search only
+  - "hybrid":  BM25 and dense candidates fused with reciprocal rank fusion
+  - "lexical": BM25 only; never loads the embedding model
+  - "auto":    short keyword queries ("ad hominem") take the lexical fast
+               path when BM25 finds enough matches, everything else is hybrid
+Only "dense" results carry a cosine distance. In the other modes
+"distance" is 1 - the normalized fused rank score (0 for a chunk every
+ranking put first), so it orders results but is not a similarity.
 """
 
-import json
 import os
-from typing import List, Dict, Any
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+
+from rag.chunker import iter_chunks_from_file, default_chunks_path
+from rag.embeddings import embed_texts
+from rag.lexicalIndex import BM25Index, rank_fusion, tokenize
+from rag.vectorBackends import make_backend
+from settings import get_settings
+from tracing import span
+
+
+RETRIEVAL_MODES = ["dense", "hybrid", "lexical", "auto"]
+
+# "auto" mode: queries with at most this many terms skip the embedding model
+LEXICAL_MAX_TERMS = 4
+
+# Hybrid mode: candidates taken from each ranking per requested result
+HYBRID_CANDIDATE_FACTOR = 4
+
+
+def is_keyword_query(text: str) -> bool:
+    """Short term lookups such as "strawman" or "burden of proof"."""
+    terms = tokenize(text)
+    return 0 < len(terms) <= LEXICAL_MAX_TERMS
+
+
+def normalize_query(text: str) -> str:
+    """
+    Cache key form of a query. all-MiniLM-L6-v2 uses an uncased tokenizer,
+    so lower-casing and collapsing whitespace does not change the embedding.
+    """
+    return " ".join(text.lower().split())
+
 
-from chromadb import PersistentClient
-from chromadb.utils import embedding_functions
+class LRUCache:
+    """Thread-safe bounded LRU mapping with hit/miss counters."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
 
 
 class DebateVectorStore:
     """
-    Wrapper around ChromaDB using the new PersistentClient interface.
+    Embeds chunks and queries, and delegates storage/search to a backend.
     """
 
     def __init__(
         self,
         persist_directory: str = "data/processed/vectorstore",
         collection_name: str = "debate_rules_chunks",
-        embedding_model: str = "all-MiniLM-L6-v2"
+        embedding_model: str = "all-MiniLM-L6-v2",
+        backend: Optional[str] = None,
+        retrieval_mode: Optional[str] = None,
+        embedding_runtime: Optional[str] = None,
     ):
 
         self.persist_directory = persist_directory
         self.collection_name = collection_name
+        self.embedding_model = embedding_model
+        settings = get_settings()
+        self.backend_name = backend or settings.vector_backend
+        # "torch", "torch-int8" or "onnx" (see rag/embeddings.py)
+        self.embedding_runtime = embedding_runtime or settings.embedding_runtime
 
         # Ensure directory exists
         os.makedirs(persist_directory, exist_ok=True)
 
-        # New Chroma client syntax
-        self.client = PersistentClient(path=persist_directory)
-
-        # Embedding function (SentenceTransformer)
-        self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=embedding_model
+        self.backend = make_backend(
+            self.backend_name, persist_directory, collection_name,
+            quantization=settings.vector_quantization,
+            rescore_factor=settings.vector_rescore_factor,
         )
+        self.lexical = BM25Index(os.path.join(persist_directory, f"{collection_name}.bm25.jsonl"))
+        legacy_lexical = os.path.join(persist_directory, f"{collection_name}.bm25.json")
+        if os.path.exists(legacy_lexical):
+            # older single-document index (with chunk texts); the next sync refills the log
+            os.remove(legacy_lexical)
+        self._bulk = False
 
-        # Load or create the collection
-        try:
-            self.collection = self.client.get_collection(name=collection_name)
-        except:
-            self.collection = self.client.create_collection(
-                name=collection_name,
-                embedding_function=self.embedding_fn
-            )
+        self.retrieval_mode = retrieval_mode or settings.retrieval_mode
+        if self.retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{self.retrieval_mode}'. Choose from {RETRIEVAL_MODES}")
+
+        # Query caches; index_version changes whenever the collection does
+        self.index_version = 0
+        self.embedding_cache = LRUCache(settings.query_embedding_cache_size)
+        self.result_cache = LRUCache(settings.query_result_cache_size)
+
+    def _collection_changed(self) -> None:
+        self.index_version += 1
+        self.result_cache.clear()
+        if not self._bulk:
+            self.lexical.save()
 
     # ----------------------------------------------------------------------
     def add_chunks(self, chunks: List[Dict[str, str]]) -> None:
@@ -53,35 +167,171 @@ class DebateVectorStore:
         ids = [chunk["id"] for chunk in chunks]
         texts = [chunk["text"] for chunk in chunks]
 
-        self.collection.add(
-            ids=ids,
-            documents=texts
-        )
+        self.backend.add(ids, texts, embed_texts(texts, self.embedding_model, runtime=self.embedding_runtime))
+        self.lexical.upsert(ids, texts)
+        self._collection_changed()
 
     # ----------------------------------------------------------------------
-    def query(self, query_text: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    def upsert_chunks(self, chunks: List[Dict[str, str]], batch_size: Optional[int] = None, embeddings=None) -> None:
+        """
+        Adds new chunks and overwrites chunks whose id already exists.
+        Pass embeddings (one row per chunk) when they were computed elsewhere,
+        e.g. by embedding workers during corpus ingestion.
+        """
+
+        if not chunks:
+            return
+        ids = [chunk["id"] for chunk in chunks]
+        texts = [chunk["text"] for chunk in chunks]
+
+        if embeddings is None:
+            embeddings = embed_texts(texts, self.embedding_model, batch_size=batch_size,
+                                     runtime=self.embedding_runtime)
+        self.backend.upsert(ids, texts, embeddings)
+        self.lexical.upsert(ids, texts)
+        self._collection_changed()
+
+    @contextmanager
+    def bulk_write(self):
+        """Group many upserts; the backend and BM25 index are saved once at the end."""
+        self.backend.begin_bulk()
+        self._bulk = True
+        try:
+            yield self
+        finally:
+            self._bulk = False
+            self.backend.end_bulk()
+            self._collection_changed()
+
+    def delete_chunks(self, ids: List[str]) -> None:
+        """Removes chunks by id."""
+        if not ids:
+            return
+        self.backend.delete(ids)
+        self.lexical.delete(ids)
+        self._collection_changed()
+
+    def reset(self) -> None:
+        """Removes every chunk from the collection."""
+        self.backend.clear()
+        self.lexical.clear()
+        self._collection_changed()
+
+    # ----------------------------------------------------------------------
+    def embed_queries(self, query_texts: List[str]):
+        """
+        Embeddings for query texts, served from the LRU cache where possible.
+        Cache misses are embedded together in one batch.
+        """
+        keys = [(self.embedding_model, normalize_query(t)) for t in query_texts]
+        vectors = [self.embedding_cache.get(key) for key in keys]
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fresh = embed_texts([query_texts[i] for i in missing], self.embedding_model,
+                                runtime=self.embedding_runtime)
+            for i, vector in zip(missing, fresh):
+                vectors[i] = vector
+                self.embedding_cache.put(keys[i], vector)
+
+        return vectors
+
+    def query(self, query_text: str, n_results: int = 5, mode: Optional[str] = None) -> List[Dict[str, Any]]:
         """Performs similarity search."""
 
-        results = self.collection.query(
-            query_texts=[query_text],
-            n_results=n_results
-        )
+        return self.query_many([query_text], n_results=n_results, mode=mode)[0]
+
+    def query_many(
+        self, query_texts: List[str], n_results: int = 5, mode: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for many queries: one batched encode call and one index call
+        for all queries that need the dense index.
+        Queries already answered for the current index version skip both.
+
+        Args:
+            query_texts: queries
+            n_results: results per query
+            mode: "dense", "hybrid", "lexical" or "auto"; defaults to self.retrieval_mode
 
-        retrieved = []
-        for i in range(len(results["ids"][0])):
-            retrieved.append({
-                "id": results["ids"][0][i],
-                "text": results["documents"][0][i],
-                "distance": results["distances"][0][i]
-            })
+        Returns:
+            List[List[Dict[str, Any]]]: one result list per query, in input order
+        """
+        if not query_texts:
+            return []
 
-        return retrieved
+        mode = mode or self.retrieval_mode
+        with span("retrieval", "vector_store.query", mode=mode, queries=len(query_texts)) as current:
+            return self._query_many(query_texts, n_results, mode, current)
+
+    def _lexical_search(self, query_text: str, n_results: int) -> List[Dict[str, Any]]:
+        """BM25 hits with their texts, which the index does not keep (they are read from the backend)."""
+        hits = self.lexical.search(query_text, n_results)
+        texts = self.backend.get_texts([hit["id"] for hit in hits])
+        return [{**hit, "text": texts[hit["id"]]} for hit in hits if hit["id"] in texts]
+
+    def _query_many(self, query_texts: List[str], n_results: int, mode: str, current) -> List[List[Dict[str, Any]]]:
+        version = self.index_version
+        keys = [(normalize_query(t), n_results, mode, version) for t in query_texts]
+        grouped = [self.result_cache.get(key) for key in keys]
+
+        missing = [i for i, results in enumerate(grouped) if results is None]
+        current.set(cache_hits=len(query_texts) - len(missing))
+
+        # Lexical fast path: no embedding, no dense index call
+        if mode in ("lexical", "auto"):
+            needs_dense = []
+            for i in missing:
+                if mode == "lexical" or is_keyword_query(query_texts[i]):
+                    hits = self._lexical_search(query_texts[i], n_results)
+                    # auto only answers lexically when BM25 fills the whole result list
+                    if mode == "lexical" or len(hits) >= n_results:
+                        grouped[i] = rank_fusion([hits], n_results)
+                        continue
+                needs_dense.append(i)
+        else:
+            needs_dense = missing
+
+        current.set(dense_queries=len(needs_dense))
+        if needs_dense:
+            query_embeddings = self.embed_queries([query_texts[i] for i in needs_dense])
+
+            if mode == "dense":
+                fresh = self.backend.search_many(query_embeddings, n_results)
+            else:
+                candidates = n_results * HYBRID_CANDIDATE_FACTOR
+                dense = self.backend.search_many(query_embeddings, candidates)
+                fresh = [
+                    rank_fusion([self._lexical_search(query_texts[i], candidates), dense_results], n_results)
+                    for i, dense_results in zip(needs_dense, dense)
+                ]
+
+            for i, results in zip(needs_dense, fresh):
+                grouped[i] = results
+
+        for i in missing:
+            self.result_cache.put(keys[i], grouped[i])
+
+        # copies, so callers cannot modify cached results
+        return [[dict(item) for item in results] for results in grouped]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit-rate statistics for the query caches."""
+        return {
+            "index_version": self.index_version,
+            "embeddings": self.embedding_cache.stats(),
+            "results": self.result_cache.stats(),
+        }
+
+    # ----------------------------------------------------------------------
+    def count(self) -> int:
+        """Number of stored chunks."""
+        return self.backend.count()
 
     # ----------------------------------------------------------------------
     def load_chunks_from_json(self, path: str = "data/processed/chunks.json") -> List[Dict[str, str]]:
-        """Load chunks.json."""
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        """Load chunks.json (or chunks.jsonl)."""
+        return list(iter_chunks_from_file(path))
 
 
 # ====================
@@ -89,23 +339,22 @@ class DebateVectorStore:
 # ====================
 def main():
     """
-    Build vectorstore from chunks.json.
+    Build (or incrementally update) the vectorstore from chunks.jsonl.
     """
+    from rag.manifest import sync_store
 
-    chunks_path = "data/processed/chunks.json"
+    chunks_path = default_chunks_path()
     vectorstore_dir = "data/processed/vectorstore"
 
     if not os.path.exists(chunks_path):
-        raise FileNotFoundError("❌ chunks.json missing! Run chunker.py first.")
-
-    with open(chunks_path, "r", encoding="utf-8") as f:
-        chunks = json.load(f)
+        raise FileNotFoundError("❌ chunks.jsonl missing! Run chunker.py first.")
 
     vs = DebateVectorStore(persist_directory=vectorstore_dir)
 
-    vs.add_chunks(chunks)
+    stats = sync_store(vs, chunks_json_path=chunks_path)
 
-    print(" Built vector store succesfuuly")
+    print(f" Built vector store succesfuuly ({stats['upserted']} upserted, "
+          f"{stats['deleted']} deleted, {stats['unchanged']} unchanged)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,371 @@
+"""
+server.py
+
+Long-running debate server. Keeps the compiled graph, embedding model,
+vector store, HTTP session and LLM client warm, and exposes a small local
+JSON API over TCP or a Unix socket.
+
+Usage:
+    python main.py serve --port 8765
+    python main.py serve --socket /tmp/debate.sock --workers 8
+
+API:
+    GET  /health                 server status and queue depth
+    POST /debates                {"claim": "...", "context": "..."} -> 202 {"id": ...}
+                                 429 with Retry-After when the queue is full
+    GET  /debates/<id>           job status and verdict; ?wait=<seconds> long-polls
+    GET  /debates/<id>/stream    NDJSON events (queued, node, done / failed)
+    GET  /metrics                Prometheus text metrics (spans recorded when TRACE_ENABLED)
+"""
+
+import argparse
+import json
+import math
+import os
+import queue
+import socketserver
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse, parse_qs
+
+from graph import get_graph, run_debate
+
+FINISHED = ("done", "failed")
+
+# Largest POST body accepted (a claim and its context)
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class Job:
+    """One submitted debate and the events it has produced so far."""
+
+    def __init__(self, claim: str, context: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.claim = claim
+        self.context = context
+        self.status = "queued"
+        self.verdict = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        self.events = [{"event": "queued"}]
+        self.cond = threading.Condition()
+
+    def emit(self, event: Dict[str, Any], status: Optional[str] = None) -> None:
+        with self.cond:
+            if status:
+                self.status = status
+            self.events.append(event)
+            self.cond.notify_all()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "claim": self.claim,
+            "context": self.context,
+            "status": self.status,
+            "verdict": self.verdict,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class DebateService:
+    """
+    Bounded job queue served by a fixed pool of worker threads.
+    Finished jobs are kept (up to max_jobs) so clients can poll them.
+    """
+
+    def __init__(self, workers: int = 4, max_queue: int = 64, max_jobs: int = 10000):
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.max_jobs = max_jobs
+        self.workers = workers
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"debate-worker-{i}", daemon=True).start()
+
+    # ----------------------------------------------------------------------
+    def warm_up(self) -> None:
+        """Load everything a debate needs so the first request pays no cold start."""
+        from llm.gateway import get_client
+        from rag.retrieval import init_or_get_store, ingest_chunks_if_needed
+        from tools.httpClient import get_session
+
+        start = time.perf_counter()
+        get_graph()
+        get_session()
+        get_client()
+
+        store = init_or_get_store()
+        try:
+            ingest_chunks_if_needed(store)
+            store.query("warm up", n_results=1)  # loads the embedding model
+        except OSError as e:
+            # e.g. no chunks file yet: serve anyway, debates report the error themselves
+            print("[SERVER WARNING] skipping vector store warm-up:", e)
+
+        print(f"[SERVER] warm in {time.perf_counter() - start:.1f}s")
+
+    # ----------------------------------------------------------------------
+    def submit(self, claim: str, context: Optional[str]) -> Optional[Job]:
+        """Queue a debate; returns None when the queue is full."""
+        job = Job(claim, context)
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            return None
+
+        with self._lock:
+            self.jobs[job.id] = job
+            self._trim()
+        return job
+
+    def _trim(self) -> None:
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            if self.jobs[job_id].status in FINISHED:
+                del self.jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "queued": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+        }
+
+    # ----------------------------------------------------------------------
+    def _worker(self) -> None:
+        graph = None
+        while True:
+            job = self.queue.get()
+            graph = graph or get_graph()
+
+            with self._lock:
+                self.running += 1
+            job.started_at = time.time()
+            job.emit({"event": "running"}, status="running")
+
+            try:
+                job.verdict = run_debate(
+                    job.claim,
+                    job.context,
+                    graph=graph,
+                    on_update=lambda node, update: job.emit({"event": "node", "node": node}),
+                    debate_id=job.id,
+                )
+                job.finished_at = time.time()
+                job.emit({"event": "done", "verdict": job.verdict}, status="done")
+                with self._lock:
+                    self.completed += 1
+
+            except Exception as e:
+                job.error = str(e)
+                job.finished_at = time.time()
+                job.emit({"event": "failed", "error": job.error}, status="failed")
+                with self._lock:
+                    self.failed += 1
+                print(f"[SERVER ERROR] job {job.id}: {e}")
+
+            finally:
+                with self._lock:
+                    self.running -= 1
+                self.queue.task_done()
+
+
+# ----------------------------------------------------------------------
+class DebateRequestHandler(BaseHTTPRequestHandler):
+    service: DebateService = None  # set by make_server
+    protocol_version = "HTTP/1.0"
+
+    def address_string(self):
+        # Unix-socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        pass  # keep the console for server events
+
+    def _send_json(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    # ----------------------------------------------------------------------
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["health"]:
+            return self._send_json(200, self.service.health())
+
+        if parts == ["metrics"]:
+            return self._send_metrics()
+
+        if len(parts) in (2, 3) and parts[0] == "debates":
+            job = self.service.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": "unknown debate id"})
+
+            if len(parts) == 3 and parts[2] == "stream":
+                return self._stream(job)
+            if len(parts) == 2:
+                try:
+                    wait = float(parse_qs(url.query).get("wait", ["0"])[0])
+                except ValueError:
+                    wait = -1.0
+                if not math.isfinite(wait) or wait < 0:
+                    return self._send_json(400, {"error": "'wait' must be a non-negative number of seconds"})
+                if wait > 0:
+                    with job.cond:
+                        job.cond.wait_for(lambda: job.status in FINISHED, timeout=min(wait, 300))
+                return self._send_json(200, job.to_dict())
+
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/debates":
+            return self._send_json(404, {"error": "not found"})
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._send_json(400, {"error": "invalid Content-Length"})
+        if length > MAX_BODY_BYTES:
+            return self._send_json(413, {"error": f"body larger than {MAX_BODY_BYTES} bytes"})
+
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except (ValueError, json.JSONDecodeError):
+            return self._send_json(400, {"error": "body must be JSON"})
+
+        claim = body.get("claim") if isinstance(body, dict) else None
+        claim = claim.strip() if isinstance(claim, str) else ""
+        if not claim:
+            return self._send_json(400, {"error": "missing 'claim'"})
+
+        context = body.get("context")
+        if context is not None and not isinstance(context, str):
+            return self._send_json(400, {"error": "'context' must be a string or null"})
+
+        job = self.service.submit(claim, context)
+        if job is None:
+            return self._send_json(429, {"error": "queue full, retry later"}, headers={"Retry-After": "5"})
+
+        self._send_json(202, {"id": job.id, "status": job.status})
+
+    # ----------------------------------------------------------------------
+    def _send_metrics(self) -> None:
+        from tracing import render_prometheus
+
+        data = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream(self, job: Job) -> None:
+        """Write job events as NDJSON until the job finishes (heartbeat every 15s)."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        sent = 0
+        try:
+            while True:
+                with job.cond:
+                    job.cond.wait_for(lambda: len(job.events) > sent, timeout=15)
+                    events = job.events[sent:]
+                    finished = job.status in FINISHED
+
+                for event in events or [{"event": "heartbeat"}]:
+                    self.wfile.write((json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8"))
+                self.wfile.flush()
+                sent += len(events)
+
+                if finished and sent == len(job.events):
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(service: DebateService, host: str = "127.0.0.1", port: int = 8765,
+                socket_path: Optional[str] = None):
+    """Bind the API to a Unix socket (if given) or a TCP host/port."""
+    handler = type("BoundDebateRequestHandler", (DebateRequestHandler,), {"service": service})
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        return ThreadingUnixHTTPServer(socket_path, handler)
+
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def serve_main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py serve", description="Warm debate server")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="TCP host to bind")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to bind")
+    parser.add_argument("--socket", type=str, default=None, help="Unix socket path (instead of TCP)")
+    parser.add_argument("--workers", type=int, default=4, help="Debates run at the same time")
+    parser.add_argument("--max-queue", type=int, default=64, help="Queued debates before new ones get 429")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip loading models at startup")
+    args = parser.parse_args(argv)
+
+    service = DebateService(workers=args.workers, max_queue=args.max_queue)
+    if not args.no_warmup:
+        service.warm_up()
+
+    server = make_server(service, args.host, args.port, args.socket)
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"[SERVER] listening on {where} with {args.workers} workers")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[SERVER] shutting down")
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
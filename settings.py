@@ -0,0 +1,182 @@
+"""
+settings.py
+
+One settings object for the whole project, read from the environment
+(and a .env file, loaded once) the first time get_settings() is called.
+Modules read their configuration from here instead of calling
+load_dotenv / os.getenv themselves.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+@dataclass(frozen=True)
+class Settings:
+    # API keys
+    openai_api_key: Optional[str]
+    tavily_api_key: Optional[str]
+
+    # Endpoint overrides (None: the public APIs); used to point the
+    # project at local stand-ins, e.g. benchmarks/fakeServices.py
+    openai_base_url: Optional[str]
+    tavily_endpoint: Optional[str]
+    wikipedia_endpoint: Optional[str]
+
+    # LLM gateway (llm/gateway.py)
+    llm_rpm: float
+    llm_tpm: float
+    llm_max_retries: int
+
+    # LLM response cache (llm/responseCache.py)
+    llm_cache_enabled: bool
+    llm_cache_path: str
+    llm_cache_ttl: float
+    llm_cache_max_mb: float
+    llm_cache_max_temperature: float
+
+    # Verdict cache (verdictCache.py)
+    verdict_cache_enabled: bool
+    verdict_cache_path: str
+    verdict_cache_threshold: float
+    verdict_cache_ttl: float
+    verdict_cache_max_entries: int
+
+    # Debate checkpoints (checkpoints.py)
+    checkpoint_enabled: bool
+    checkpoint_path: str
+    checkpoint_ttl: float
+
+    # Tool router (tools/toolRouter.py)
+    router_enabled: bool
+    router_stats_path: str
+    router_min_samples: int
+    router_min_yield: float
+    router_explore_rate: float
+    router_max_cost: float
+
+    # HTTP client for web tools (tools/httpClient.py)
+    http_connect_timeout: float
+    http_read_timeout: float
+    http_max_retries: int
+    http_pool_size: int
+
+    # Embedding runtime (rag/embeddings.py)
+    embedding_runtime: str
+    embedding_threads: int
+    embedding_batch_size: int
+    embedding_verify: bool
+    embedding_min_cosine: float
+
+    # Vector store (rag/vectorStore.py)
+    vector_backend: str
+    vector_quantization: str
+    vector_rescore_factor: Optional[int]
+    query_embedding_cache_size: int
+    query_result_cache_size: int
+    retrieval_mode: str
+
+    # Tracing and metrics (tracing.py)
+    trace_enabled: bool
+    trace_path: str
+    metrics_path: str
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            openai_api_key=os.getenv("OPENAI_API_KEY"),
+            tavily_api_key=os.getenv("TAVILY_API_KEY"),
+
+            openai_base_url=os.getenv("OPENAI_BASE_URL") or None,
+            tavily_endpoint=os.getenv("TAVILY_ENDPOINT") or None,
+            wikipedia_endpoint=os.getenv("WIKIPEDIA_ENDPOINT") or None,
+
+            llm_rpm=float(os.getenv("LLM_RPM", 500)),
+            llm_tpm=float(os.getenv("LLM_TPM", 200000)),
+            llm_max_retries=int(os.getenv("LLM_MAX_RETRIES", 5)),
+
+            llm_cache_enabled=_env_bool("LLM_CACHE_ENABLED", True),
+            llm_cache_path=os.getenv("LLM_CACHE_PATH", os.path.join("data", "cache", "llm_cache.sqlite")),
+            llm_cache_ttl=float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600)),
+            llm_cache_max_mb=float(os.getenv("LLM_CACHE_MAX_MB", 256)),
+            llm_cache_max_temperature=float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", 0.2)),
+
+            verdict_cache_enabled=_env_bool("VERDICT_CACHE_ENABLED", True),
+            verdict_cache_path=os.getenv("VERDICT_CACHE_PATH", os.path.join("data", "cache", "verdict_cache.sqlite")),
+            # all-MiniLM-L6-v2 scores a claim and its negation around or above 0.95; the
+            # cache also requires matching negation words and numbers (verdictCache.claim_signature),
+            # but antonyms ("safe" / "unsafe") still get through, so do not lower this casually
+            verdict_cache_threshold=float(os.getenv("VERDICT_CACHE_THRESHOLD", 0.95)),
+            verdict_cache_ttl=float(os.getenv("VERDICT_CACHE_TTL", 24 * 3600)),
+            verdict_cache_max_entries=int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", 50000)),
+
+            checkpoint_enabled=_env_bool("CHECKPOINT_ENABLED", True),
+            checkpoint_path=os.getenv("CHECKPOINT_PATH", os.path.join("data", "cache", "checkpoints.sqlite")),
+            checkpoint_ttl=float(os.getenv("CHECKPOINT_TTL", 7 * 24 * 3600)),
+
+            router_enabled=_env_bool("ROUTER_ENABLED", True),
+            router_stats_path=os.getenv("ROUTER_STATS_PATH", os.path.join("data", "cache", "tool_outcomes.sqlite")),
+            router_min_samples=int(os.getenv("ROUTER_MIN_SAMPLES", 20)),
+            router_min_yield=float(os.getenv("ROUTER_MIN_YIELD", 0.2)),
+            router_explore_rate=float(os.getenv("ROUTER_EXPLORE_RATE", 0.05)),
+            router_max_cost=float(os.getenv("ROUTER_MAX_COST", 0.05)),
+
+            http_connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", 3.05)),
+            http_read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", 10)),
+            http_max_retries=int(os.getenv("HTTP_MAX_RETRIES", 3)),
+            http_pool_size=int(os.getenv("HTTP_POOL_SIZE", 32)),
+
+            embedding_runtime=os.getenv("EMBEDDING_RUNTIME", "torch"),
+            embedding_threads=int(os.getenv("EMBEDDING_THREADS", 0)),
+            embedding_batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", 64)),
+            embedding_verify=_env_bool("EMBEDDING_VERIFY", True),
+            embedding_min_cosine=float(os.getenv("EMBEDDING_MIN_COSINE", 0.99)),
+
+            vector_backend=os.getenv("VECTOR_BACKEND", "chroma"),
+            vector_quantization=os.getenv("VECTOR_QUANTIZATION", "none"),
+            vector_rescore_factor=int(os.getenv("VECTOR_RESCORE_FACTOR", 0)) or None,
+            query_embedding_cache_size=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", 4096)),
+            query_result_cache_size=int(os.getenv("QUERY_RESULT_CACHE_SIZE", 1024)),
+            # "dense" keeps result distances as cosine distances; the other modes
+            # report a rank-fusion distance instead (see rag/lexicalIndex.rank_fusion)
+            retrieval_mode=os.getenv("RETRIEVAL_MODE", "dense"),
+
+            trace_enabled=_env_bool("TRACE_ENABLED", False),
+            trace_path=os.getenv("TRACE_PATH", os.path.join("data", "traces", "trace.jsonl")),
+            metrics_path=os.getenv("METRICS_PATH", os.path.join("data", "traces", "metrics.prom")),
+        )
+
+
+_SETTINGS: Optional[Settings] = None
+_SETTINGS_LOCK = threading.Lock()
+
+
+def get_settings() -> Settings:
+    """Load .env once and return the shared Settings."""
+    global _SETTINGS
+    with _SETTINGS_LOCK:
+        if _SETTINGS is None:
+            try:
+                from dotenv import load_dotenv
+                load_dotenv()
+            except ImportError:
+                pass  # plain environment variables still work
+            _SETTINGS = Settings.from_env()
+    return _SETTINGS
+
+
+def reload_settings() -> Settings:
+    """Re-read the environment (e.g. after changing os.environ in a script)."""
+    global _SETTINGS
+    with _SETTINGS_LOCK:
+        _SETTINGS = None
+    return get_settings()
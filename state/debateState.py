@@ -1,4 +1,9 @@
-from typing import TypedDict, Optional, Dict, List, Any
+from typing import TypedDict, Optional, Dict, List, Any, Annotated
+
+
+def merge_dicts(left: Optional[Dict[str, Any]], right: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reducer for dict fields written by parallel graph branches."""
+    return {**(left or {}), **(right or {})}
 
 
 class DebateState(TypedDict, total=False):
@@ -11,13 +16,24 @@ class DebateState(TypedDict, total=False):
     claim: str      
     context: Optional[str]
 
+    # Shared tool results {tool_name: result}, gathered once per debate.
+    # Written by parallel branches, so updates are merged instead of replaced.
+    evidence: Annotated[Dict[str, Any], merge_dicts]
+
+    # Router output: topic, evidence tools to run and skipped tools (tools/toolRouter.py).
+    # None means every registry tool runs.
+    tool_plan: Optional[Dict[str, Any]]
+
     # Node outputs
     supporter_output: Dict[str, Any]
     critic_output: Dict[str, Any]
 
-    # RAG documents retrieved for Judge
+    # Evidence / RAG documents used by the last agent that ran
     retrieved_docs: List[Dict[str, Any]]
 
+    # Rule chunks retrieved for the claim, prefetched in parallel for the Judge
+    rule_docs: List[Dict[str, Any]]
+
     # Judge writes final output to this
     final_verdict: Dict[str, Any]
 
@@ -30,8 +46,11 @@ def initialize_state(claim: str, context: Optional[str] = None) -> DebateState:
     return {
         "claim": claim,
         "context": context,
+        "evidence": {},
+        "tool_plan": None,
         "supporter_output": {},
         "critic_output": {},
         "retrieved_docs": [],
+        "rule_docs": [],
         "final_verdict": {},
     }
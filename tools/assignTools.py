@@ -3,8 +3,8 @@
 toolsRegistry.py
 ----------------
 Central registry of all tools available to each agent.
-Supporter and Critic automatically loop through this registry
-to gather evidence from multiple tools in a modular way.
+The evidence node runs the union of the Supporter and Critic tools
+once per debate, and each agent reads the results for its own tools.
 """
 
 TOOLS = {
@@ -27,3 +27,56 @@ TOOLS = {
         "rag_rules"
     ]
 }
+
+
+# Tools whose input is another tool's output.
+# Everything not listed here only needs the claim and can run in parallel.
+TOOL_DEPENDENCIES = {
+    "news_summary": ["tavily"]
+}
+
+# Per-tool deadline in seconds, measured from the moment the tool starts
+TOOL_TIMEOUTS = {
+    "tavily": 15.0,
+    "wikipedia": 8.0,
+    "news_summary": 20.0,
+    "topic_classifier": 10.0
+}
+
+DEFAULT_TOOL_TIMEOUT = 15.0
+
+# Result used when a tool times out or raises (same shape as its own error value)
+TOOL_PLACEHOLDERS = {
+    "tavily": [],
+    "wikipedia": {},
+    "news_summary": "Summary unavailable.",
+    "topic_classifier": "unknown"
+}
+
+
+# ----------------------------------------------------------------------
+# Cost-aware routing (see tools/toolRouter.py)
+
+# Topic labels returned by the topic classifier
+TOPICS = ["technology", "science", "economics", "politics", "environment", "ethics", "education", "health"]
+
+# Estimated cost (USD) and typical latency (seconds) of one call
+TOOL_COSTS = {
+    "tavily": {"usd": 0.008, "latency": 1.5},
+    "wikipedia": {"usd": 0.0, "latency": 0.4},
+    "news_summary": {"usd": 0.0003, "latency": 2.5},
+    "topic_classifier": {"usd": 0.00002, "latency": 0.5}
+}
+
+# Evidence tools worth trying per topic; news only helps where events move fast.
+# Topics missing here (and "unknown") get every tool.
+TOPIC_TOOL_PLANS = {
+    "technology": ["tavily", "news_summary", "wikipedia"],
+    "science": ["tavily", "wikipedia"],
+    "economics": ["tavily", "news_summary", "wikipedia"],
+    "politics": ["tavily", "news_summary", "wikipedia"],
+    "environment": ["tavily", "news_summary", "wikipedia"],
+    "ethics": ["tavily", "wikipedia"],
+    "education": ["tavily", "wikipedia"],
+    "health": ["tavily", "news_summary", "wikipedia"]
+}
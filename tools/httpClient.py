@@ -0,0 +1,186 @@
+"""
+HTTP Client
+-----------
+Shared HTTP layer for the web tools (Tavily, Wikipedia).
+
+- One pooled keep-alive requests.Session for every tool and thread
+- Connect and read timeouts on every request
+- Retries with jittered exponential backoff on 429 and 5xx
+  (a Retry-After header, when present, is honoured)
+- Single-flight deduplication: concurrent identical requests share
+  one network call and its result
+
+Settings (environment variables, read through settings.py):
+    HTTP_CONNECT_TIMEOUT  seconds to establish a connection (default 3.05)
+    HTTP_READ_TIMEOUT     seconds to wait for response data (default 10)
+    HTTP_MAX_RETRIES      retries after the first attempt (default 3)
+    HTTP_POOL_SIZE        keep-alive connections per host (default 32)
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from settings import get_settings
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.5   # seconds
+BACKOFF_MAX = 8.0    # seconds
+
+USER_AGENT = "MultiAgentDebateAdvisor/1.0 (debate research tool)"
+
+
+# ----------------------------------------------------------------------
+# Session
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Create (once) and return the shared pooled session."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            pool_size = get_settings().http_pool_size
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT})
+            _SESSION = session
+    return _SESSION
+
+
+def default_timeout() -> Tuple[float, float]:
+    settings = get_settings()
+    return (settings.http_connect_timeout, settings.http_read_timeout)
+
+
+# ----------------------------------------------------------------------
+# Single-flight
+
+class _Call:
+    """One in-flight request that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_INFLIGHT: Dict[str, _Call] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+def _single_flight(key: str, fn):
+    with _INFLIGHT_LOCK:
+        call = _INFLIGHT.get(key)
+        leader = call is None
+        if leader:
+            call = _Call()
+            _INFLIGHT[key] = call
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = fn()
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+        call.done.set()
+
+
+def _request_key(method: str, url: str, params, payload) -> str:
+    raw = json.dumps([method, url, params, payload], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Retries
+
+def _retry_delay(attempt: int, response: Optional[requests.Response]) -> float:
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(float(retry_after), BACKOFF_MAX)
+            except ValueError:
+                pass  # HTTP-date form; fall back to backoff
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+def _send(method: str, url: str, params, payload, timeout, max_retries: int) -> Tuple[int, Any]:
+    session = get_session()
+
+    for attempt in range(max_retries + 1):
+        response = None
+        try:
+            response = session.request(method, url, params=params, json=payload, timeout=timeout)
+            if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                try:
+                    data = response.json()
+                except ValueError:
+                    data = None
+                return response.status_code, data
+
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+
+        delay = _retry_delay(attempt, response)
+        if response is not None:
+            response.close()  # return the connection to the pool before retrying
+        time.sleep(delay)
+
+
+def request_json(
+    method: str,
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    payload: Optional[Dict[str, Any]] = None,
+    timeout: Optional[Tuple[float, float]] = None,
+    max_retries: Optional[int] = None,
+) -> Tuple[int, Any]:
+    """
+    Send a request through the shared session and decode the JSON body.
+
+    Identical requests made at the same time share one network call.
+
+    Returns:
+        (status_code, data): data is the decoded JSON, or None if the body is not JSON
+
+    Raises:
+        requests.RequestException after the last retry of a connection error or timeout
+    """
+    timeout = timeout or default_timeout()
+    if max_retries is None:
+        max_retries = get_settings().http_max_retries
+
+    key = _request_key(method, url, params, payload)
+    return _single_flight(
+        key, lambda: _send(method, url, params, payload, timeout, max_retries)
+    )
+
+
+def get_json(url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> Tuple[int, Any]:
+    return request_json("GET", url, params=params, **kwargs)
+
+
+def post_json(url: str, payload: Dict[str, Any], **kwargs) -> Tuple[int, Any]:
+    return request_json("POST", url, payload=payload, **kwargs)
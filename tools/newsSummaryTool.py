@@ -6,12 +6,7 @@ Uses OpenAI to summarize Tavily search results
 into clean, short, factual bullet points.
 """
 
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
-
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from llm.gateway import chat, PRIORITY_TOOL
 
 
 def summarize_news(evidence_list: list) -> str:
@@ -40,13 +35,13 @@ def summarize_news(evidence_list: list) -> str:
     """
 
     try:
-        resp = client.chat.completions.create(
+        return chat(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=300,
             temperature=0.1,
+            priority=PRIORITY_TOOL,
         )
-        return resp.choices[0].message.content.strip()
 
     except Exception as e:
         print("[NEWS SUMMARY ERROR]:", e)
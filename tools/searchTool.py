@@ -5,30 +5,30 @@ Tavily Web Search Tool
 Provides structured web search results for Supporter and Critic.
 """
 
-import os
-import requests
-from dotenv import load_dotenv
+from settings import get_settings
+from tools.httpClient import post_json
 
-load_dotenv()
-
-TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
 TAVILY_ENDPOINT = "https://api.tavily.com/search"
 
 
 def search_tavily(query: str, max_results: int = 5) -> list:
-    if not TAVILY_API_KEY:
+    settings = get_settings()
+    api_key = settings.tavily_api_key
+    if not api_key:
         print("[WARNING] Missing TAVILY_API_KEY")
         return []
 
     payload = {
-        "api_key": TAVILY_API_KEY,
+        "api_key": api_key,
         "query": query,
         "max_results": max_results
     }
 
     try:
-        res = requests.post(TAVILY_ENDPOINT, json=payload)
-        data = res.json()
+        status, data = post_json(settings.tavily_endpoint or TAVILY_ENDPOINT, payload)
+        if status != 200 or not isinstance(data, dict):
+            print(f"[TAVILY ERROR]: HTTP {status}")
+            return []
 
         cleaned = []
         for item in data.get("results", []):
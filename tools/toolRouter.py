@@ -0,0 +1,258 @@
+"""
+Tool Router
+-----------
+Chooses the evidence tools for one debate from the claim's topic.
+
+- The plan starts from TOPIC_TOOL_PLANS (tools/assignTools.py); unknown
+  topics get every evidence tool
+- Tools that have rarely returned anything useful for a topic are skipped
+  once they have enough recorded calls (ROUTER_MIN_SAMPLES,
+  ROUTER_MIN_YIELD); a small share of debates still runs them
+  (ROUTER_EXPLORE_RATE) so their statistics stay current
+- The rest is taken in order of yield per dollar (TOOL_COSTS) while the
+  estimated cost stays within ROUTER_MAX_COST
+- A tool whose dependency was dropped is dropped too
+
+Outcomes (whether each tool returned something useful, and how long it
+took) are recorded per topic in a SQLite file. Print them with:
+
+    python -m tools.toolRouter
+
+Settings (environment variables, read through settings.py):
+    ROUTER_ENABLED       "0" runs every registry tool (default "1")
+    ROUTER_STATS_PATH    SQLite file (default data/cache/tool_outcomes.sqlite)
+    ROUTER_MIN_SAMPLES   calls before a tool can be skipped (default 20)
+    ROUTER_MIN_YIELD     useful fraction below which it is skipped (default 0.2)
+    ROUTER_EXPLORE_RATE  chance of running a skipped tool anyway (default 0.05)
+    ROUTER_MAX_COST      estimated USD per debate for evidence tools (default 0.05)
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from settings import get_settings
+from tools.assignTools import (
+    TOOLS,
+    TOOL_COSTS,
+    TOOL_DEPENDENCIES,
+    TOOL_PLACEHOLDERS,
+    TOPICS,
+    TOPIC_TOOL_PLANS,
+)
+
+DEFAULT_STATS_PATH = os.path.join("data", "cache", "tool_outcomes.sqlite")
+
+# Tool outputs that carry no evidence besides the placeholders
+EMPTY_RESULTS = ["No relevant news found."]
+
+
+def evidence_tools() -> List[str]:
+    """Every registry tool of the debating agents except the classifier itself."""
+    tools = []
+    for agent in ("supporter", "critic"):
+        for tool in TOOLS.get(agent, []):
+            if tool != "topic_classifier" and tool not in tools:
+                tools.append(tool)
+    return tools
+
+
+def normalize_topic(label: Optional[str]) -> str:
+    """Map a classifier answer ("Technology.", " health\\n") to a known topic or "unknown"."""
+    word = "".join(ch for ch in (label or "").lower() if ch.isalpha() or ch.isspace()).strip()
+    word = word.split()[0] if word else ""
+    return word if word in TOPICS else "unknown"
+
+
+def tool_yielded(tool: str, result: Any) -> bool:
+    """Did a tool return usable evidence?"""
+    if result is None or result == TOOL_PLACEHOLDERS.get(tool) or result in EMPTY_RESULTS:
+        return False
+    if tool == "wikipedia":
+        return bool(isinstance(result, dict) and result.get("extract"))
+    return bool(result)
+
+
+class ToolOutcomeStore:
+    """
+    Per (topic, tool) counters of calls, useful results and time spent.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tool_outcomes (
+                topic TEXT NOT NULL,
+                tool TEXT NOT NULL,
+                calls INTEGER NOT NULL,
+                useful INTEGER NOT NULL,
+                seconds REAL NOT NULL,
+                skipped INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (topic, tool)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def _bump(self, topic: str, tool: str, calls: int, useful: int, seconds: float, skipped: int) -> None:
+        self._conn.execute(
+            "INSERT INTO tool_outcomes (topic, tool, calls, useful, seconds, skipped, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(topic, tool) DO UPDATE SET calls = calls + excluded.calls, "
+            "useful = useful + excluded.useful, seconds = seconds + excluded.seconds, "
+            "skipped = skipped + excluded.skipped, updated_at = excluded.updated_at",
+            (topic, tool, calls, useful, seconds, skipped, time.time()),
+        )
+
+    def record(self, topic: str, results: Dict[str, Any], seconds: Dict[str, float],
+               skipped: Optional[List[str]] = None) -> None:
+        """
+        Record one debate's tool outcomes.
+
+        Args:
+            topic: normalized topic
+            results: {tool: result} of the tools that ran
+            seconds: {tool: wall time} of the tools that ran
+            skipped: tools the router left out
+        """
+        with self._lock:
+            for tool, result in results.items():
+                self._bump(topic, tool, 1, int(tool_yielded(tool, result)), seconds.get(tool, 0.0), 0)
+            for tool in skipped or []:
+                self._bump(topic, tool, 0, 0, 0.0, 1)
+            self._conn.commit()
+
+    def stats(self, topic: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """{topic: {tool: {calls, useful, yield, mean_seconds, skipped}}}"""
+        query = "SELECT topic, tool, calls, useful, seconds, skipped FROM tool_outcomes"
+        params = ()
+        if topic is not None:
+            query += " WHERE topic = ?"
+            params = (topic,)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        table: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for row_topic, tool, calls, useful, seconds, skipped in rows:
+            table.setdefault(row_topic, {})[tool] = {
+                "calls": calls,
+                "useful": useful,
+                "yield": useful / calls if calls else None,
+                "mean_seconds": seconds / calls if calls else None,
+                "skipped": skipped,
+            }
+        return table
+
+
+_STORE: Optional[ToolOutcomeStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_outcome_store() -> ToolOutcomeStore:
+    """Create (once) and return the shared ToolOutcomeStore."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ToolOutcomeStore(get_settings().router_stats_path)
+    return _STORE
+
+
+# ----------------------------------------------------------------------
+def plan_tools(topic: str, outcomes: Optional[Dict[str, Dict[str, Any]]] = None,
+               rng: Optional[random.Random] = None) -> Dict[str, Any]:
+    """
+    Pick the evidence tools for a topic.
+
+    Args:
+        topic: normalized topic (see normalize_topic)
+        outcomes: {tool: stats} for this topic; read from the outcome store if not given
+        rng: random source for exploration
+
+    Returns:
+        dict: topic, tools (to run), skipped ({tool: reason}),
+              estimated_cost (USD) and estimated_latency (seconds, critical path)
+    """
+    settings = get_settings()
+    rng = rng or random
+    if outcomes is None:
+        outcomes = get_outcome_store().stats(topic).get(topic, {})
+
+    known = evidence_tools()
+    candidates = [t for t in TOPIC_TOOL_PLANS.get(topic, known) if t in known]
+    skipped = {t: "not in topic plan" for t in known if t not in candidates}
+
+    def expected_yield(tool: str) -> float:
+        stats = outcomes.get(tool) or {}
+        return stats["yield"] if stats.get("yield") is not None else 1.0
+
+    kept = []
+    for tool in candidates:
+        stats = outcomes.get(tool) or {}
+        low = stats.get("calls", 0) >= settings.router_min_samples and expected_yield(tool) < settings.router_min_yield
+        if low and rng.random() >= settings.router_explore_rate:
+            skipped[tool] = f"low yield ({stats['useful']}/{stats['calls']})"
+        else:
+            kept.append(tool)
+
+    # best yield per dollar first, within the cost budget
+    kept.sort(key=lambda t: expected_yield(t) / max(TOOL_COSTS.get(t, {}).get("usd", 0.0), 1e-6), reverse=True)
+    tools, cost = [], 0.0
+    for tool in kept:
+        price = TOOL_COSTS.get(tool, {}).get("usd", 0.0)
+        if cost + price > settings.router_max_cost:
+            skipped[tool] = "over cost budget"
+            continue
+        tools.append(tool)
+        cost += price
+
+    for tool in list(tools):
+        missing = [dep for dep in TOOL_DEPENDENCIES.get(tool, []) if dep not in tools]
+        if missing:
+            tools.remove(tool)
+            cost -= TOOL_COSTS.get(tool, {}).get("usd", 0.0)
+            skipped[tool] = f"needs {', '.join(missing)}"
+
+    def path_latency(tool: str) -> float:
+        deps = [d for d in TOOL_DEPENDENCIES.get(tool, []) if d in tools]
+        return TOOL_COSTS.get(tool, {}).get("latency", 0.0) + max((path_latency(d) for d in deps), default=0.0)
+
+    tools = [t for t in known if t in tools]  # registry order
+    return {
+        "topic": topic,
+        "tools": tools,
+        "skipped": skipped,
+        "estimated_cost": round(cost, 6),
+        "estimated_latency": round(max((path_latency(t) for t in tools), default=0.0), 2),
+    }
+
+
+def main():
+    table = get_outcome_store().stats()
+    if not table:
+        print("No tool outcomes recorded yet.")
+        return
+
+    print(f"{'topic':<12} {'tool':<14} {'calls':>6} {'useful':>6} {'yield':>6} {'mean s':>7} {'skipped':>7}")
+    for topic in sorted(table):
+        for tool, s in sorted(table[topic].items()):
+            yield_text = f"{s['yield']:.2f}" if s["yield"] is not None else "-"
+            seconds_text = f"{s['mean_seconds']:.2f}" if s["mean_seconds"] is not None else "-"
+            print(f"{topic:<12} {tool:<14} {s['calls']:>6} {s['useful']:>6} {yield_text:>6} "
+                  f"{seconds_text:>7} {s['skipped']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Tool Scheduler
+--------------
+Runs a set of tools concurrently as a small dependency graph.
+
+- Tools with no dependencies start immediately in a thread pool.
+- A dependent tool starts as soon as every tool it needs has finished.
+- Every tool has its own deadline. A tool that times out (or raises)
+  gets a placeholder result so it never blocks the caller.
+- Tools run in a copy of the caller's context, so tracing spans opened
+  by a tool nest under the caller's span.
+
+Latency is therefore roughly the longest dependency chain instead of
+the sum of every tool.
+"""
+
+import contextvars
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional
+
+from tools.assignTools import (
+    TOOL_DEPENDENCIES,
+    TOOL_TIMEOUTS,
+    TOOL_PLACEHOLDERS,
+    DEFAULT_TOOL_TIMEOUT,
+)
+
+
+def placeholder_for(tool_name: str) -> Any:
+    """Fresh copy of the placeholder result for a tool."""
+    return copy.deepcopy(TOOL_PLACEHOLDERS.get(tool_name))
+
+
+def run_tool_graph(
+    tool_names: List[str],
+    run_fn: Callable[[str, Dict[str, Any]], Any],
+    dependencies: Optional[Dict[str, List[str]]] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run tools concurrently, respecting dependencies and per-tool deadlines.
+
+    Args:
+        tool_names: tools to run (duplicates are ignored)
+        run_fn: called as run_fn(tool_name, dep_results) where dep_results maps
+                each dependency that was scheduled to its result
+        dependencies: {tool: [tools it needs]}, defaults to TOOL_DEPENDENCIES.
+                      Dependencies that are not in tool_names are ignored.
+        timeouts: {tool: seconds}, defaults to TOOL_TIMEOUTS
+        max_workers: thread pool size, defaults to one thread per tool
+
+    Returns:
+        dict: {tool_name: result}, in the order of tool_names
+    """
+    dependencies = TOOL_DEPENDENCIES if dependencies is None else dependencies
+    timeouts = TOOL_TIMEOUTS if timeouts is None else timeouts
+
+    tools = list(dict.fromkeys(tool_names))
+    if not tools:
+        return {}
+
+    pending = list(tools)
+    results: Dict[str, Any] = {}
+    running = {}  # future -> (tool_name, deadline)
+
+    # Threads of timed-out tools cannot be killed, so the pool is never joined
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers or len(tools),
+        thread_name_prefix="tool",
+    )
+
+    try:
+        while pending or running:
+
+            # start every tool whose dependencies are resolved
+            for tool in list(pending):
+                needs = [dep for dep in dependencies.get(tool, []) if dep in tools]
+                if all(dep in results for dep in needs):
+                    pending.remove(tool)
+                    dep_results = {dep: results[dep] for dep in needs}
+                    deadline = time.monotonic() + timeouts.get(tool, DEFAULT_TOOL_TIMEOUT)
+                    context = contextvars.copy_context()
+                    running[executor.submit(context.run, run_fn, tool, dep_results)] = (tool, deadline)
+
+            if not running:
+                # only a dependency cycle can leave tools unstartable
+                for tool in pending:
+                    print(f"[TOOL SCHEDULER ERROR]: unresolvable dependencies for {tool}")
+                    results[tool] = placeholder_for(tool)
+                break
+
+            nearest = min(deadline for _, deadline in running.values())
+            done, _ = wait(
+                list(running),
+                timeout=max(0.0, nearest - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+
+            for future in done:
+                tool, _ = running.pop(future)
+                try:
+                    results[tool] = future.result()
+                except Exception as e:
+                    print(f"[TOOL ERROR] {tool}:", e)
+                    results[tool] = placeholder_for(tool)
+
+            now = time.monotonic()
+            for future, (tool, deadline) in list(running.items()):
+                if deadline <= now:
+                    running.pop(future)
+                    future.cancel()
+                    print(f"[TOOL TIMEOUT] {tool}: no result after {timeouts.get(tool, DEFAULT_TOOL_TIMEOUT)}s")
+                    results[tool] = placeholder_for(tool)
+
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return {tool: results[tool] for tool in tools}
@@ -6,12 +6,7 @@ Classifies a claim into topic categories like:
 technology, science, economics, politics, environment, ethics, education, health.
 """
 
-import os
-from dotenv import load_dotenv
-from openai import OpenAI
-
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from llm.gateway import chat, PRIORITY_TOOL
 
 
 def classify_topic(text: str) -> str:
@@ -32,13 +27,13 @@ def classify_topic(text: str) -> str:
     """
 
     try:
-        resp = client.chat.completions.create(
+        return chat(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=10,
             temperature=0.0,
+            priority=PRIORITY_TOOL,
         )
-        return resp.choices[0].message.content.strip()
 
     except Exception as e:
         print("[TOPIC CLASSIFIER ERROR]:", e)
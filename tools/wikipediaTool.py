@@ -5,7 +5,8 @@ Wikipedia Summary Tool
 Returns the summary paragraph of a Wikipedia page.
 """
 
-import requests
+from settings import get_settings
+from tools.httpClient import get_json
 
 WIKI_ENDPOINT = "https://en.wikipedia.org/api/rest_v1/page/summary/"
 
@@ -14,12 +15,10 @@ def wikipedia_search(topic: str) -> dict:
     topic = topic.replace(" ", "_")
 
     try:
-        res = requests.get(WIKI_ENDPOINT + topic, timeout=6)
-        if res.status_code != 200:
+        status, data = get_json((get_settings().wikipedia_endpoint or WIKI_ENDPOINT) + topic)
+        if status != 200 or not isinstance(data, dict):
             return {}
 
-        data = res.json()
-
         return {
             "title": data.get("title", ""),
             "extract": data.get("extract", ""),
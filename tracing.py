@@ -0,0 +1,321 @@
+"""
+tracing.py
+
+Lightweight spans and metrics for debates.
+
+Every graph node, tool call, LLM call and vector-store query runs inside
+span(kind, name). A finished span records its wall time plus whatever the
+instrumented code attached (prompt/completion tokens, estimated cost,
+retries, cache hits) and goes to:
+
+  - a JSONL trace file, one span per line, grouped by trace (debate) id
+  - in-process metrics, rendered in Prometheus text format to a file and
+    served by the debate server at GET /metrics
+  - any collector opened with collect() (used by `main.py --profile`)
+
+Spans propagate through contextvars, so child spans find their parent
+across the graph's and the tool scheduler's worker threads.
+
+Settings (environment variables, read through settings.py):
+    TRACE_ENABLED   record spans (default off; --profile turns it on)
+    TRACE_PATH      JSONL trace file (default data/traces/trace.jsonl)
+    METRICS_PATH    Prometheus text file (default data/traces/metrics.prom)
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from settings import get_settings
+
+# Upper bounds (seconds) of the span duration histogram
+DURATION_BUCKETS = [0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+
+_enabled_override: Optional[bool] = None
+_collectors: List[List[Dict[str, Any]]] = []
+_lock = threading.Lock()
+
+
+class Span:
+    """One timed operation; instrumented code adds attributes with set()."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "kind", "name", "attributes", "start", "duration", "error")
+
+    def __init__(self, kind: str, name: str, parent: Optional["Span"], trace_id: Optional[str]):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.kind = kind
+        self.name = name
+        self.attributes: Dict[str, Any] = {}
+        self.start = time.time()
+        self.duration = 0.0
+        self.error = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def add(self, **counts) -> None:
+        """Increment numeric attributes (e.g. retries=1)."""
+        for key, value in counts.items():
+            self.attributes[key] = self.attributes.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "kind": self.kind,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": round(self.duration * 1000, 3),
+            "error": self.error,
+            **self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Returned when tracing is off, so instrumented code never has to check."""
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def add(self, **counts) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+# ----------------------------------------------------------------------
+def enabled() -> bool:
+    if _enabled_override is not None:
+        return _enabled_override
+    return get_settings().trace_enabled
+
+
+def set_enabled(value: Optional[bool]) -> None:
+    """Force tracing on/off for this process (None: back to TRACE_ENABLED)."""
+    global _enabled_override
+    _enabled_override = value
+
+
+def current_span():
+    return _current_span.get() or NOOP_SPAN
+
+
+@contextmanager
+def span(kind: str, name: str, **attributes):
+    """Time the enclosed block as a child of the current span."""
+    if not enabled():
+        yield NOOP_SPAN
+        return
+
+    current = Span(kind, name, _current_span.get(), _current_trace.get())
+    current.set(**attributes)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current_span.reset(token)
+        _finish(current)
+
+
+@contextmanager
+def trace(name: str, trace_id: Optional[str] = None, **attributes):
+    """Root span of one debate; every span inside it shares its trace id."""
+    token = _current_trace.set(trace_id or uuid.uuid4().hex)
+    try:
+        with span("debate", name, **attributes) as root:
+            yield root
+    finally:
+        _current_trace.reset(token)
+        if enabled():
+            write_metrics()
+
+
+def traced(kind: str, name: Optional[str] = None):
+    """Decorator form of span(); used to wrap graph nodes."""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(kind, label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def collect():
+    """Collect every span finished in this process while the block runs."""
+    spans: List[Dict[str, Any]] = []
+    with _lock:
+        _collectors.append(spans)
+    try:
+        yield spans
+    finally:
+        with _lock:
+            _collectors.remove(spans)
+
+
+# ----------------------------------------------------------------------
+# Metrics
+
+class _Metrics:
+    def __init__(self):
+        self.spans: Dict[tuple, Dict[str, Any]] = {}
+        self.llm: Dict[str, Dict[str, float]] = {}
+
+    def record(self, s: Span) -> None:
+        entry = self.spans.setdefault((s.kind, s.name), {
+            "count": 0, "errors": 0, "seconds": 0.0, "cache_hits": 0,
+            "buckets": [0] * len(DURATION_BUCKETS),
+        })
+        entry["count"] += 1
+        entry["seconds"] += s.duration
+        entry["errors"] += 1 if s.error else 0
+        entry["cache_hits"] += int(s.attributes.get("cache_hits", 0)) + (1 if s.attributes.get("cache_hit") else 0)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if s.duration <= bound:
+                entry["buckets"][i] += 1
+
+        if s.kind == "llm":
+            model = s.attributes.get("model", s.name)
+            llm = self.llm.setdefault(model, {"prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0, "retries": 0})
+            for key in llm:
+                llm[key] += s.attributes.get(key, 0) or 0
+
+
+_METRICS = _Metrics()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def render_prometheus() -> str:
+    """Current metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP debate_span_seconds Wall time of debate spans.",
+        "# TYPE debate_span_seconds histogram",
+    ]
+    with _lock:
+        spans = {key: dict(value, buckets=list(value["buckets"])) for key, value in _METRICS.spans.items()}
+        llm = {model: dict(value) for model, value in _METRICS.llm.items()}
+
+    for (kind, name), entry in sorted(spans.items()):
+        labels = f'kind="{_escape(kind)}",name="{_escape(name)}"'
+        for bound, count in zip(DURATION_BUCKETS, entry["buckets"]):
+            lines.append(f'debate_span_seconds_bucket{{{labels},le="{bound}"}} {count}')
+        lines.append(f'debate_span_seconds_bucket{{{labels},le="+Inf"}} {entry["count"]}')
+        lines.append(f"debate_span_seconds_sum{{{labels}}} {entry['seconds']:.6f}")
+        lines.append(f"debate_span_seconds_count{{{labels}}} {entry['count']}")
+
+    lines += ["# HELP debate_span_errors_total Spans that raised.", "# TYPE debate_span_errors_total counter"]
+    for (kind, name), entry in sorted(spans.items()):
+        lines.append(f'debate_span_errors_total{{kind="{_escape(kind)}",name="{_escape(name)}"}} {entry["errors"]}')
+
+    lines += ["# HELP debate_cache_hits_total Cache hits recorded by spans.", "# TYPE debate_cache_hits_total counter"]
+    for (kind, name), entry in sorted(spans.items()):
+        lines.append(f'debate_cache_hits_total{{kind="{_escape(kind)}",name="{_escape(name)}"}} {entry["cache_hits"]}')
+
+    lines += ["# HELP debate_llm_tokens_total LLM tokens by model and type.", "# TYPE debate_llm_tokens_total counter"]
+    for model, entry in sorted(llm.items()):
+        for kind in ("prompt", "completion"):
+            lines.append(f'debate_llm_tokens_total{{model="{_escape(model)}",type="{kind}"}} {int(entry[kind + "_tokens"])}')
+
+    lines += ["# HELP debate_llm_cost_usd_total Estimated LLM cost.", "# TYPE debate_llm_cost_usd_total counter"]
+    for model, entry in sorted(llm.items()):
+        lines.append(f'debate_llm_cost_usd_total{{model="{_escape(model)}"}} {entry["cost_usd"]:.6f}')
+
+    lines += ["# HELP debate_llm_retries_total LLM call retries.", "# TYPE debate_llm_retries_total counter"]
+    for model, entry in sorted(llm.items()):
+        lines.append(f'debate_llm_retries_total{{model="{_escape(model)}"}} {int(entry["retries"])}')
+
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: Optional[str] = None) -> None:
+    """Write the Prometheus text file atomically (for node_exporter's textfile collector)."""
+    path = path or get_settings().metrics_path
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp, path)
+
+
+# ----------------------------------------------------------------------
+def _finish(s: Span) -> None:
+    record = s.to_dict()
+    line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+    path = get_settings().trace_path
+
+    with _lock:
+        _METRICS.record(s)
+        for spans in _collectors:
+            spans.append(record)
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            print("[TRACE ERROR]:", e)
+
+
+# ----------------------------------------------------------------------
+def format_profile(spans: List[Dict[str, Any]]) -> str:
+    """Per-stage breakdown of collected spans, slowest first."""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for s in spans:
+        g = groups.setdefault((s["kind"], s["name"]), {
+            "calls": 0, "ms": 0.0, "max_ms": 0.0, "prompt": 0, "completion": 0,
+            "cost": 0.0, "retries": 0, "cache": 0, "errors": 0,
+        })
+        g["calls"] += 1
+        g["ms"] += s["duration_ms"]
+        g["max_ms"] = max(g["max_ms"], s["duration_ms"])
+        g["prompt"] += s.get("prompt_tokens", 0) or 0
+        g["completion"] += s.get("completion_tokens", 0) or 0
+        g["cost"] += s.get("cost_usd", 0.0) or 0.0
+        g["retries"] += s.get("retries", 0) or 0
+        g["cache"] += (s.get("cache_hits", 0) or 0) + (1 if s.get("cache_hit") else 0)
+        g["errors"] += 1 if s.get("error") else 0
+
+    header = (f"{'stage':<28} {'calls':>5} {'total ms':>10} {'max ms':>9} {'tok in':>7} "
+              f"{'tok out':>7} {'cost $':>9} {'retry':>5} {'cache':>5} {'err':>3}")
+    lines = [header, "-" * len(header)]
+    for (kind, name), g in sorted(groups.items(), key=lambda item: -item[1]["ms"]):
+        lines.append(
+            f"{kind + ':' + name:<28} {g['calls']:>5} {g['ms']:>10.1f} {g['max_ms']:>9.1f} {g['prompt']:>7} "
+            f"{g['completion']:>7} {g['cost']:>9.5f} {g['retries']:>5} {g['cache']:>5} {g['errors']:>3}"
+        )
+
+    llm = [s for s in spans if s["kind"] == "llm"]
+    lines.append("-" * len(header))
+    lines.append(
+        f"LLM: {len(llm)} calls, {sum(s.get('prompt_tokens', 0) or 0 for s in llm)} prompt + "
+        f"{sum(s.get('completion_tokens', 0) or 0 for s in llm)} completion tokens, "
+        f"${sum(s.get('cost_usd', 0.0) or 0.0 for s in llm):.5f}"
+    )
+    return "\n".join(lines)
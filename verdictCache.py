@@ -0,0 +1,290 @@
+"""
+verdictCache.py
+
+Semantic cache of final verdicts, checked by run_debate before the graph
+runs, so paraphrases of an already-debated claim are answered without
+another round of LLM calls and web searches.
+
+- Exact match: the normalized claim text with the same context
+- Semantic match: the claim embedding (same model as the vector store,
+  reusing its loaded model and query-embedding cache) with cosine
+  similarity of at least VERDICT_CACHE_THRESHOLD, again with the same
+  context. Sentence embeddings score a claim and its negation ("X is
+  safe" / "X is not safe") or a changed figure well above 0.95, so a
+  semantic match is only accepted when both claims also carry the same
+  negation words and the same numbers (see claim_signature); antonyms
+  ("safe" / "unsafe") are not caught, which is why the threshold stays high
+- Entries expire after VERDICT_CACHE_TTL seconds; the oldest entries are
+  dropped beyond VERDICT_CACHE_MAX_ENTRIES
+- Storage: a single SQLite file, like the LLM response cache
+
+A cached verdict is returned with a "provenance" field recording how it
+matched, the similarity, the claim it was produced for, its debate id and
+its age.
+
+Settings (environment variables, read through settings.py):
+    VERDICT_CACHE_ENABLED      "0" disables the cache (default "1")
+    VERDICT_CACHE_PATH         SQLite file (default data/cache/verdict_cache.sqlite)
+    VERDICT_CACHE_THRESHOLD    minimum cosine similarity (default 0.95)
+    VERDICT_CACHE_TTL          seconds a verdict stays fresh (default 1 day)
+    VERDICT_CACHE_MAX_ENTRIES  entries kept (default 50000)
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from settings import get_settings
+
+DEFAULT_CACHE_PATH = os.path.join("data", "cache", "verdict_cache.sqlite")
+
+# Syntactic negators; "n't" contractions and "cannot" count as "not"
+NEGATIONS = {"not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "nowhere", "cannot"}
+
+_WORD_RE = re.compile(r"[a-z]+n't|[a-z]+|\d+(?:[.,]\d+)*%?")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def text_hash(text: Optional[str]) -> str:
+    """Hash of the normalized text; no context and empty context hash the same."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def claim_signature(text: Optional[str]) -> tuple:
+    """
+    Negation words and numbers of a claim, which two claims must share
+    before one can be answered with the other's verdict.
+
+    Returns:
+        tuple: (sorted negation words, sorted numbers)
+    """
+    negations, numbers = [], []
+    for token in _WORD_RE.findall(normalize_text(text).replace("\u2019", "'")):
+        if token[0].isdigit():
+            numbers.append(token.replace(",", ""))
+        elif token.endswith("n't") or token == "cannot":
+            negations.append("not")
+        elif token in NEGATIONS:
+            negations.append(token)
+    return tuple(sorted(negations)), tuple(sorted(numbers))
+
+
+def is_cacheable(verdict: Any) -> bool:
+    """Only complete judge verdicts are cached (not the fallback of a failed judge call)."""
+    return isinstance(verdict, dict) and "final_recommendation" in verdict and "explanation" in verdict
+
+
+class VerdictCache:
+    """
+    SQLite-backed verdict store searched by exact claim and by claim embedding.
+
+    Args:
+        embed: maps a claim to its L2-normalized float32 embedding
+        model: name of the embedding model (entries of other models never match)
+        path: SQLite file
+        threshold: minimum cosine similarity of a semantic match
+        ttl_seconds: age after which an entry is no longer returned
+        max_entries: entries kept; the oldest are dropped first
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], np.ndarray],
+        model: str,
+        path: str = DEFAULT_CACHE_PATH,
+        threshold: float = 0.95,
+        ttl_seconds: float = 24 * 3600,
+        max_entries: int = 50000,
+    ):
+        self.embed = embed
+        self.model = model
+        self.path = path
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.rejected = 0  # semantic matches refused by the negation / number check
+
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS verdicts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                claim TEXT NOT NULL,
+                claim_hash TEXT NOT NULL,
+                context_hash TEXT NOT NULL,
+                model TEXT NOT NULL,
+                embedding BLOB NOT NULL,
+                verdict TEXT NOT NULL,
+                debate_id TEXT,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_verdict_claim ON verdicts(claim_hash, context_hash)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_verdict_context ON verdicts(context_hash, model, created_at)")
+        self._conn.commit()
+
+    # ----------------------------------------------------------------------
+    def lookup(self, claim: str, context: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return a fresh cached verdict for this claim (or a paraphrase of it)
+        and the same context, with provenance; None on a miss.
+        """
+        now = time.time()
+        oldest = now - self.ttl_seconds
+        context_hash = text_hash(context)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM verdicts WHERE claim_hash = ? AND context_hash = ? AND created_at >= ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (text_hash(claim), context_hash, oldest),
+            ).fetchone()
+        if row is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return self._load(row[0], "exact", 1.0, now)
+
+        vector = np.asarray(self.embed(claim), dtype=np.float32)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, claim, embedding FROM verdicts WHERE context_hash = ? AND model = ? AND created_at >= ?",
+                (context_hash, self.model, oldest),
+            ).fetchall()
+
+        rows = [row for row in rows if len(row[2]) == vector.nbytes]
+        if rows:
+            matrix = np.frombuffer(b"".join(row[2] for row in rows), dtype=np.float32).reshape(len(rows), -1)
+            similarities = matrix @ vector
+            signature = claim_signature(claim)
+            # most similar first; skip matches that differ in negation or numbers
+            for best in np.argsort(-similarities):
+                if similarities[best] < self.threshold:
+                    break
+                if claim_signature(rows[best][1]) != signature:
+                    with self._lock:
+                        self.rejected += 1
+                    continue
+                with self._lock:
+                    self.semantic_hits += 1
+                return self._load(rows[best][0], "semantic", float(similarities[best]), now)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _load(self, row_id: int, match: str, similarity: float, now: float) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT claim, verdict, debate_id, created_at FROM verdicts WHERE id = ?", (row_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        claim, verdict, debate_id, created_at = row
+        verdict = json.loads(verdict)
+        verdict["provenance"] = {
+            "source": "verdict_cache",
+            "match": match,
+            "similarity": round(similarity, 4),
+            "cached_claim": claim,
+            "debate_id": debate_id,
+            "cached_at": created_at,
+            "age_seconds": round(now - created_at, 1),
+        }
+        return verdict
+
+    # ----------------------------------------------------------------------
+    def put(self, claim: str, context: Optional[str], verdict: Dict[str, Any],
+            debate_id: Optional[str] = None) -> None:
+        """Store a verdict and drop expired / excess entries."""
+        vector = np.asarray(self.embed(claim), dtype=np.float32)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO verdicts (claim, claim_hash, context_hash, model, embedding, verdict, debate_id, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (claim, text_hash(claim), text_hash(context), self.model, vector.tobytes(),
+                 json.dumps(verdict, ensure_ascii=False), debate_id, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM verdicts WHERE created_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM verdicts WHERE id NOT IN (SELECT id FROM verdicts ORDER BY created_at DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+
+    # ----------------------------------------------------------------------
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM verdicts")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the number of stored verdicts."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+        hits = self.exact_hits + self.semantic_hits
+        lookups = hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+        }
+
+
+# Module-level cache so every debate shares one connection
+_CACHE: Optional[VerdictCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    return get_settings().verdict_cache_enabled
+
+
+def get_verdict_cache() -> VerdictCache:
+    """Create (once) and return the shared VerdictCache, embedding with the vector store's model."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            from rag.retrieval import init_or_get_store
+
+            settings = get_settings()
+            store = init_or_get_store()
+            _CACHE = VerdictCache(
+                embed=lambda claim: store.embed_queries([claim])[0],
+                model=store.embedding_model,
+                path=settings.verdict_cache_path,
+                threshold=settings.verdict_cache_threshold,
+                ttl_seconds=settings.verdict_cache_ttl,
+                max_entries=settings.verdict_cache_max_entries,
+            )
+    return _CACHE